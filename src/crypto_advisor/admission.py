@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+"""Admission control for the API server.
+
+Every request that reaches the LLM (or, for the analytics routes, the upstream
+providers) occupies a worker thread and an upstream connection for seconds.
+:class:`AdmissionController` bounds that work:
+
+* at most ``max_in_flight`` requests execute concurrently,
+* at most ``max_queue`` further requests wait for a slot, each for at most
+  ``queue_timeout`` seconds,
+* anything beyond that is rejected immediately with
+  :class:`AdmissionRejected` – ``429`` when the queue is full, ``503`` when
+  the wait timed out – carrying a ``Retry-After`` estimate.
+
+Background work that was already accepted (jobs, precomputation) acquires
+with ``background=True``: it waits for a slot as long as it takes, outside
+the bounded queue, so it neither fails nor crowds out interactive requests.
+
+Two process-wide controllers are configured from the environment:
+
+* ``llm`` – ``CRYPTO_ADVISOR_LLM_MAX_IN_FLIGHT`` (4), ``CRYPTO_ADVISOR_LLM_MAX_QUEUE``
+  (16), ``CRYPTO_ADVISOR_LLM_QUEUE_TIMEOUT`` (30 s).
+* ``provider`` – ``CRYPTO_ADVISOR_PROVIDER_MAX_IN_FLIGHT`` (16),
+  ``CRYPTO_ADVISOR_PROVIDER_MAX_QUEUE`` (256),
+  ``CRYPTO_ADVISOR_PROVIDER_QUEUE_TIMEOUT`` (10 s); admits upstream calls
+  rather than requests.
+"""
+
+import asyncio
+import math
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+
+from crypto_advisor.metrics import Counter, Gauge, Histogram
+
+# Smoothing factor of the service-time moving average used for Retry-After.
+_EWMA_ALPHA = 0.2
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request cannot be admitted.
+
+    Attributes:
+        status_code: ``429`` (queue full) or ``503`` (queue wait timed out).
+        retry_after: Suggested client back-off in whole seconds.
+    """
+
+    def __init__(self, controller: str, status_code: int, retry_after: int, reason: str) -> None:
+        super().__init__(f"{controller} capacity exhausted: {reason}")
+        self.controller = controller
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    @property
+    def headers(self) -> dict[str, str]:  # noqa: D102
+        return {"Retry-After": str(self.retry_after)}
+
+
+@dataclass
+class AdmissionStats:
+    """Snapshot of a controller's counters."""
+
+    name: str
+    max_in_flight: int
+    max_queue: int
+    in_flight: int
+    queue_depth: int
+    background_waiting: int
+    admitted: int
+    rejected_queue_full: int
+    rejected_timeout: int
+    avg_wait_seconds: float
+    max_wait_seconds: float
+    avg_service_seconds: float
+
+
+ADMISSION_WAIT_SECONDS = Histogram(
+    "crypto_advisor_admission_wait_seconds",
+    "Time admitted requests spent in the admission queue.",
+    ("controller",),
+)
+ADMISSION_REJECTIONS = Counter(
+    "crypto_advisor_admission_rejections",
+    "Requests rejected by admission control.",
+    ("controller", "reason"),
+)
+
+
+class AdmissionController:
+    """Bounded concurrency with a bounded, time-limited wait queue."""
+
+    def __init__(self, name: str, max_in_flight: int, max_queue: int, queue_timeout: float) -> None:
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore: asyncio.Semaphore | None = None
+        self._in_flight = 0
+        self._waiting = 0
+        self._background_waiting = 0
+        self._admitted = 0
+        self._rejected_full = 0
+        self._rejected_timeout = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._service_ewma = 0.0
+
+    def _sem(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the server's event loop.
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._semaphore
+
+    def _retry_after(self) -> int:
+        """Estimate when a slot frees up from queue depth and service time."""
+
+        service = self._service_ewma or 1.0
+        return max(1, math.ceil(service * (self._waiting + 1) / self.max_in_flight))
+
+    async def acquire(self, background: bool = False) -> float:
+        """Wait for a slot and return the time spent queueing.
+
+        Args:
+            background: Wait without queue limit or timeout.
+
+        Raises:
+            AdmissionRejected: If the queue is full or the wait timed out
+                (never for ``background``).
+        """
+
+        semaphore = self._sem()
+        if self._in_flight < self.max_in_flight and not self._waiting:
+            await semaphore.acquire()
+            return self._admit(0.0)
+
+        if background:
+            started = time.perf_counter()
+            self._background_waiting += 1
+            try:
+                await semaphore.acquire()
+            finally:
+                self._background_waiting -= 1
+            return self._admit(time.perf_counter() - started)
+
+        if self._waiting >= self.max_queue:
+            self._rejected_full += 1
+            ADMISSION_REJECTIONS.inc(controller=self.name, reason="queue_full")
+            raise AdmissionRejected(self.name, 429, self._retry_after(), "queue full")
+
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._rejected_timeout += 1
+            ADMISSION_REJECTIONS.inc(controller=self.name, reason="timeout")
+            raise AdmissionRejected(self.name, 503, self._retry_after(), "queue wait timed out") from None
+        finally:
+            self._waiting -= 1
+        return self._admit(time.perf_counter() - started)
+
+    def _admit(self, waited: float) -> float:
+        ADMISSION_WAIT_SECONDS.observe(waited, controller=self.name)
+        self._in_flight += 1
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        return waited
+
+    def release(self, service_seconds: float | None = None) -> None:
+        """Free a slot, optionally recording how long the work took."""
+
+        self._in_flight -= 1
+        if service_seconds is not None:
+            if self._service_ewma:
+                self._service_ewma += _EWMA_ALPHA * (service_seconds - self._service_ewma)
+            else:
+                self._service_ewma = service_seconds
+        self._sem().release()
+
+    @asynccontextmanager
+    async def slot(self, background: bool = False) -> AsyncIterator[float]:
+        """``async with`` helper around :meth:`acquire`/:meth:`release`."""
+
+        waited = await self.acquire(background)
+        started = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def stats(self) -> AdmissionStats:
+        """Return the current counters."""
+
+        return AdmissionStats(
+            name=self.name,
+            max_in_flight=self.max_in_flight,
+            max_queue=self.max_queue,
+            in_flight=self._in_flight,
+            queue_depth=self._waiting,
+            background_waiting=self._background_waiting,
+            admitted=self._admitted,
+            rejected_queue_full=self._rejected_full,
+            rejected_timeout=self._rejected_timeout,
+            avg_wait_seconds=self._total_wait / self._admitted if self._admitted else 0.0,
+            max_wait_seconds=self._max_wait,
+            avg_service_seconds=self._service_ewma,
+        )
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """Streaming response holding an already acquired slot of ``controller``.
+
+    The slot is released once the response has been sent, failed or was
+    cancelled – also when the body iterator never started, e.g. because the
+    client disconnected before the headers went out.
+    """
+
+    def __init__(self, controller: AdmissionController, content: Any, **kwargs: Any) -> None:
+        super().__init__(content, **kwargs)
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        started = time.perf_counter()
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.controller.release(time.perf_counter() - started)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide controllers
+# ---------------------------------------------------------------------------
+
+
+def _from_env(name: str, max_in_flight: int, max_queue: int, queue_timeout: float) -> AdmissionController:
+    prefix = f"CRYPTO_ADVISOR_{name.upper()}_"
+    return AdmissionController(
+        name,
+        max_in_flight=int(os.getenv(f"{prefix}MAX_IN_FLIGHT", max_in_flight)),
+        max_queue=int(os.getenv(f"{prefix}MAX_QUEUE", max_queue)),
+        queue_timeout=float(os.getenv(f"{prefix}QUEUE_TIMEOUT", queue_timeout)),
+    )
+
+
+llm_admission = _from_env("llm", max_in_flight=4, max_queue=16, queue_timeout=30.0)
+provider_admission = _from_env("provider", max_in_flight=16, max_queue=256, queue_timeout=10.0)
+
+
+def admission_stats() -> list[AdmissionStats]:
+    """Stats of all process-wide controllers."""
+
+    return [llm_admission.stats(), provider_admission.stats()]
+
+
+Gauge(
+    "crypto_advisor_admission_in_flight",
+    "Requests currently holding an admission slot.",
+    ("controller",),
+    collect=lambda: {(stats.name,): stats.in_flight for stats in admission_stats()},
+)
+Gauge(
+    "crypto_advisor_admission_queue_depth",
+    "Requests currently waiting for an admission slot.",
+    ("controller",),
+    collect=lambda: {(stats.name,): stats.queue_depth for stats in admission_stats()},
+)
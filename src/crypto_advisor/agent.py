@@ -9,7 +9,9 @@ from langchain.agents import initialize_agent, AgentType
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 
-from crypto_advisor.tools import get_all_tools
+from crypto_advisor.metrics import llm_metrics_handler
+from crypto_advisor.tracing import llm_tracing_handler
+from crypto_advisor.tools import get_agent_tools
 
 def load_environment():
     """Load environment variables from .env file."""
@@ -19,23 +21,42 @@ def load_environment():
     os.environ["OPENAI_API_KEY"] = os.getenv('OPENAI_API_KEY')
     os.environ["SERPER_API_KEY"] = os.getenv('SERPER_API_KEY')
 
-def create_llm():
-    """Create and configure the language model."""
+def create_llm(streaming: bool = False):
+    """Create and configure the language model.
+
+    Setting ``CRYPTO_ADVISOR_FAKE_LLM`` replaces the OpenAI model with the
+    deterministic offline model from :mod:`crypto_advisor.harness.fake_llm`.
+
+    Args:
+        streaming: Emit ``on_llm_new_token`` callbacks while generating.
+    """
+    if os.getenv("CRYPTO_ADVISOR_FAKE_LLM"):
+        from crypto_advisor.harness.fake_llm import FakeAdvisorChatModel
+
+        latency = float(os.getenv("CRYPTO_ADVISOR_FAKE_LLM_LATENCY", "0"))
+        return FakeAdvisorChatModel(latency=latency, streaming=streaming, callbacks=[llm_metrics_handler, llm_tracing_handler])
+
     return ChatOpenAI(
         model="o3-mini",
         temperature=0,
         max_tokens=None,
         timeout=None,
-        max_retries=2
+        max_retries=2,
+        streaming=streaming,
+        callbacks=[llm_metrics_handler, llm_tracing_handler],
     )
 
-def create_agent():
-    """Create and configure the LangChain agent."""
+def create_agent(streaming: bool = False):
+    """Create and configure the LangChain agent.
+
+    Args:
+        streaming: Build the LLM in streaming mode so token callbacks fire.
+    """
     # Initialize the LLM
-    llm = create_llm()
+    llm = create_llm(streaming=streaming)
     
     # Get all tools
-    tools = get_all_tools()
+    tools = get_agent_tools()
     
     # Initialize the agent
     agent = initialize_agent(
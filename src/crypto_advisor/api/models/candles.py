@@ -0,0 +1,105 @@
+"""
+Columnar OHLCV candle data for request models.
+
+Candles arrive either as a list of dicts (one per candle) or as columnar arrays
+(``{"time": [...], "open": [...], ...}``).  Instead of letting Pydantic walk and
+copy every dict of every candle, :data:`CandlestickData` validates the series in
+bulk and stores it as one numpy array per column, which ``ta_service`` turns
+into a DataFrame without per-candle object churn.
+"""
+
+from typing import Annotated, Any, Dict, Mapping
+
+import numpy as np
+import pandas as pd
+from pydantic import PlainValidator, WithJsonSchema
+
+OHLCV_COLUMNS = ("time", "open", "high", "low", "close", "volume")
+NUMERIC_COLUMNS = OHLCV_COLUMNS[1:]
+
+
+def _columns(data: Any) -> Dict[str, Any]:
+    """Return the raw columns of row-wise or columnar candle data."""
+
+    if isinstance(data, Mapping):
+        missing = [column for column in OHLCV_COLUMNS if column not in data]
+        if missing:
+            raise ValueError(f"candlestick_data is missing columns: {', '.join(missing)}")
+        columns = {column: data[column] for column in OHLCV_COLUMNS}
+        for column, values in columns.items():
+            if not isinstance(values, (list, tuple, np.ndarray)) or np.ndim(values) == 0:
+                raise ValueError(f"candlestick_data column {column!r} must be an array")
+        return columns
+    if isinstance(data, (list, tuple)):
+        if not all(isinstance(row, Mapping) for row in data):
+            raise ValueError("candlestick_data rows must be objects")
+        frame = pd.DataFrame.from_records(data)
+        missing = [column for column in OHLCV_COLUMNS if column not in frame.columns]
+        if missing:
+            raise ValueError(f"candlestick_data is missing columns: {', '.join(missing)}")
+        return {column: frame[column].to_numpy() for column in OHLCV_COLUMNS}
+    raise ValueError("candlestick_data must be a list of candles or a mapping of columns")
+
+
+def validate_ohlcv(data: Any) -> Dict[str, np.ndarray]:
+    """Validate OHLCV candles in vectorized form.
+
+    Checks that all columns are present and of equal, non-zero length, that
+    prices and volumes are finite numbers and that times parse and strictly
+    increase.
+
+    Args:
+        data: Row-wise or columnar candle data.
+
+    Returns:
+        Columnar data: ``time`` as ``datetime64[ns]``, all other columns as
+        ``float64`` arrays.
+
+    Raises:
+        ValueError: If any check fails.
+    """
+
+    raw = _columns(data)
+    lengths = {column: len(values) for column, values in raw.items()}
+    if len(set(lengths.values())) != 1:
+        raise ValueError(f"candlestick_data columns differ in length: {lengths}")
+    if not lengths["time"]:
+        raise ValueError("candlestick_data is empty")
+
+    columns: Dict[str, np.ndarray] = {}
+    for column in NUMERIC_COLUMNS:
+        try:
+            values = np.asarray(raw[column], dtype=np.float64)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"candlestick_data column {column!r} must be numeric") from exc
+        if not np.isfinite(values).all():
+            raise ValueError(f"candlestick_data column {column!r} contains non-finite values")
+        columns[column] = values
+
+    try:
+        times = pd.to_datetime(pd.Series(raw["time"]))
+    except (TypeError, ValueError) as exc:
+        raise ValueError("candlestick_data column 'time' must contain timestamps") from exc
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert(None)
+    times = times.to_numpy()
+    if np.isnat(times).any() or (np.diff(times) <= np.timedelta64(0)).any():
+        raise ValueError("candlestick_data times must be strictly increasing")
+    columns["time"] = times
+
+    return {column: columns[column] for column in OHLCV_COLUMNS}
+
+
+CandlestickData = Annotated[
+    Dict[str, Any],
+    PlainValidator(validate_ohlcv),
+    WithJsonSchema(
+        {
+            "anyOf": [
+                {"type": "array", "items": {"type": "object"}},
+                {"type": "object", "additionalProperties": {"type": "array"}},
+            ]
+        }
+    ),
+]
+"""Candle series validated by :func:`validate_ohlcv`."""
@@ -4,7 +4,7 @@ Chart data request models.
 This module provides Pydantic models for chart data requests.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 class ChartRequest(BaseModel):
     """Model for chart data requests."""
@@ -13,9 +13,5 @@ class ChartRequest(BaseModel):
     interval: str = Field(description="Timeframe for the chart, e.g., 1m, 5m, 1h, 4h, 1d, 1w.")
     limit: int = Field(alias="num_candles", description="Number of candles to fetch, e.g., 10, 50, 100.")
 
-    class Config:
-        """Configuration for the ChartRequest model."""
-        # Allow the model to accept input data using the alias "num_candles"
-        allow_population_by_alias = True
-        # Also allow population by the field name if needed
-        allow_population_by_field_name = True 
\ No newline at end of file
+    # Accept both the alias "num_candles" and the field name "limit".
+    model_config = ConfigDict(populate_by_name=True)
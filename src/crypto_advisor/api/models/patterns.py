@@ -5,12 +5,17 @@ This module provides Pydantic models for pattern recognition requests.
 """
 
 from pydantic import BaseModel, Field
-from typing import List, Dict
+
+from crypto_advisor.api.models.candles import CandlestickData
 
 class PatternRecognitionRequest(BaseModel):
     """Model for pattern recognition requests."""
     
-    candlestick_data: List[Dict] = Field(
+    candlestick_data: CandlestickData = Field(
         ..., 
-        description="List of OHLCV candlestick data."
+        description=(
+            "List of OHLCV candlestick data, or the same data as columnar arrays "
+            "(`{\"time\": [...], \"open\": [...], ...}`). Validated in bulk and stored "
+            "as one array per column."
+        )
     ) 
\ No newline at end of file
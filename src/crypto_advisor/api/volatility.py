@@ -5,7 +5,7 @@ This module handles requests for volatility analysis of candlestick data.
 """
 
 from crypto_advisor.api.models.technical import TechnicalAnalysisRequest
-from crypto_advisor.services.ta_service import calculate_volatility_index
+from crypto_advisor.services.ta_pool import calculate_volatility_index
 
 def analyze_volatility_tool(request: TechnicalAnalysisRequest):
     """
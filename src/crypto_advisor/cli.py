@@ -1,9 +1,19 @@
 from __future__ import annotations
 
-"""Command-line interface for Crypto Advisor workflows."""
+"""Command-line interface for Crypto Advisor workflows.
+
+Without a subcommand a single workflow is run (``--query-type``).  The
+``scan`` subcommand ranks a watchlist without the agent, see
+:mod:`crypto_advisor.scan`.  ``--cassette-mode``/``--cassette-dir`` record or
+replay provider traffic, see :mod:`crypto_advisor.providers.cassette`.
+``trace`` renders request timelines recorded with ``CRYPTO_ADVISOR_TRACE_FILE``,
+see :mod:`crypto_advisor.tracing`.
+"""
 
 import argparse
+import os
 import sys
+import time
 
 from crypto_advisor.main import run_agent
 
@@ -27,9 +37,83 @@ def _build_parser() -> argparse.ArgumentParser:  # noqa: D401
         default=60,
         help="Number of days for market overview (market_overview only).",
     )
+    parser.add_argument(
+        "--cassette-mode",
+        choices=["off", "record", "replay"],
+        default=None,
+        help="Record provider responses to cassettes or replay them without network access.",
+    )
+    parser.add_argument("--cassette-dir", default=None, help="Cassette directory (default: cassettes).")
+    parser.add_argument(
+        "--cassette-latency",
+        type=float,
+        default=None,
+        metavar="FACTOR",
+        help="Replay recorded latency scaled by FACTOR (default: 0, instant).",
+    )
+
+    subcommands = parser.add_subparsers(dest="command")
+    scan_parser = subcommands.add_parser("scan", help="Rank a watchlist by volatility, RSI extremes and patterns.")
+    scan_parser.add_argument(
+        "watchlist",
+        help="File with one symbol per line, or a comma-separated list of symbols.",
+    )
+    scan_parser.add_argument("--interval", default="4h", help="Candlestick interval.")
+    scan_parser.add_argument("--limit", type=int, default=100, help="Candles per symbol.")
+    scan_parser.add_argument("--workers", type=int, default=None, help="Analysis processes (default: CPU count).")
+    scan_parser.add_argument("--fetch-concurrency", type=int, default=16, help="Concurrent candle downloads.")
+    scan_parser.add_argument(
+        "--summarize",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Ask the LLM to summarise the top N symbols (default: no LLM call).",
+    )
+
+    trace_parser = subcommands.add_parser("trace", help="Show request timelines from a trace file.")
+    trace_parser.add_argument("file", help="Trace file written via CRYPTO_ADVISOR_TRACE_FILE.")
+    trace_parser.add_argument("--trace-id", default=None, help="Trace to show (default: the slowest ones).")
+    trace_parser.add_argument("--slowest", type=int, default=1, metavar="N", help="Number of slowest traces to show.")
     return parser
 
 
+def _run_scan(args: argparse.Namespace) -> None:  # pragma: no cover
+    from crypto_advisor.scan import format_table, load_watchlist, scan, summarize_top
+
+    symbols = load_watchlist(args.watchlist)
+    started = time.perf_counter()
+    results = scan(
+        symbols,
+        interval=args.interval,
+        limit=args.limit,
+        workers=args.workers,
+        fetch_concurrency=args.fetch_concurrency,
+    )
+    print(format_table(results))
+    print(f"\nScanned {len(symbols)} symbols in {time.perf_counter() - started:.1f}s")
+
+    if args.summarize > 0:
+        print()
+        print(summarize_top(results, args.summarize))
+
+
+def _run_trace(args: argparse.Namespace) -> None:  # pragma: no cover
+    from crypto_advisor.tracing import format_timeline, load_spans
+
+    traces = load_spans(args.file)
+    if args.trace_id is not None:
+        selected = [args.trace_id] if args.trace_id in traces else []
+    else:
+        by_duration = sorted(traces, key=lambda trace_id: max(s.duration_ms for s in traces[trace_id]), reverse=True)
+        selected = by_duration[: args.slowest]
+    if not selected:
+        sys.exit(f"No matching trace in {args.file}")
+    for trace_id in selected:
+        print(f"trace {trace_id}")
+        print(format_timeline(traces[trace_id]))
+        print()
+
+
 def main(argv: list[str] | None = None) -> None:  # pragma: no cover
     """Parse CLI arguments and invoke the requested workflow."""
 
@@ -37,6 +121,23 @@ def main(argv: list[str] | None = None) -> None:  # pragma: no cover
     parser = _build_parser()
     args = parser.parse_args(argv)
 
+    # Exported rather than passed on, so scan worker processes inherit them.
+    for option, variable in (
+        ("cassette_mode", "CRYPTO_ADVISOR_CASSETTE_MODE"),
+        ("cassette_dir", "CRYPTO_ADVISOR_CASSETTE_DIR"),
+        ("cassette_latency", "CRYPTO_ADVISOR_CASSETTE_LATENCY"),
+    ):
+        value = getattr(args, option)
+        if value is not None:
+            os.environ[variable] = str(value)
+
+    if args.command == "scan":
+        _run_scan(args)
+        return
+    if args.command == "trace":
+        _run_trace(args)
+        return
+
     response = run_agent(
         query_type=args.query_type,
         symbol=args.symbol,
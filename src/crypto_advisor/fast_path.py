@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+"""Rule-based fast path for the analysis endpoints.
+
+``/technical-analysis`` and ``/market-overview`` accept ``mode=fast``, which
+answers from :mod:`crypto_advisor.services.narrative` instead of the agent:
+the same provider data and indicators, rendered by fixed rules in
+milliseconds (or the time of the upstream fetches on a provider cache miss).
+
+In the default ``mode=llm`` the rule-based narrative also stands in when the
+LLM cannot answer, unless ``CRYPTO_ADVISOR_FAST_FALLBACK=0``:
+
+* ``saturated`` – the LLM admission queue already holds
+  ``CRYPTO_ADVISOR_FAST_FALLBACK_QUEUE`` requests (default: the queue size),
+  or admission rejected the request;
+* ``llm_error`` – the workflow failed.
+
+Such responses carry ``X-Report-Source: rules`` and are not cacheable, since
+the same URL normally yields the LLM analysis.
+"""
+
+import os
+from typing import Any, Awaitable, Callable, Mapping
+
+from crypto_advisor import profiling
+from crypto_advisor.admission import AdmissionRejected, llm_admission
+from crypto_advisor.metrics import FAST_PATH_RESPONSES
+from crypto_advisor.providers.binance import fetch_binance_chart
+from crypto_advisor.providers.coinmarketcap import (
+    fetch_altcoin_dominance,
+    fetch_coinmarketcap_global_data,
+    fetch_fear_greed_index,
+)
+from crypto_advisor.run_context import candle_summary
+from crypto_advisor.services import ta_pool
+from crypto_advisor.services.narrative import market_narrative, technical_narrative
+from crypto_advisor.workflows import TA_CANDLE_LIMIT, TA_INTERVAL
+
+LLM = "llm"
+FAST = "fast"
+
+# Value of the ``X-Report-Source`` header for rule-based answers.
+SOURCE = "rules"
+
+
+def fallback_enabled() -> bool:
+    """Whether ``CRYPTO_ADVISOR_FAST_FALLBACK`` lets the rules stand in for the LLM."""
+
+    return os.getenv("CRYPTO_ADVISOR_FAST_FALLBACK", "1").lower() not in {"0", "false", "off", "no"}
+
+
+def fallback_queue_depth() -> int:
+    """LLM queue depth from which requests skip the queue for the fast path."""
+
+    return int(os.getenv("CRYPTO_ADVISOR_FAST_FALLBACK_QUEUE", str(llm_admission.max_queue)))
+
+
+def saturated() -> bool:
+    """Whether a new LLM request would queue behind too many others."""
+
+    stats = llm_admission.stats()
+    return stats.in_flight >= stats.max_in_flight and stats.queue_depth >= fallback_queue_depth()
+
+
+# ---------------------------------------------------------------------------
+# Narratives
+# ---------------------------------------------------------------------------
+
+
+def technical_analysis_narrative(symbol: str = "ETHUSDT") -> str:
+    """Fetch candles for ``symbol`` and describe them with the rules."""
+
+    symbol = symbol.strip().upper()
+    candles = fetch_binance_chart(symbol, TA_INTERVAL, TA_CANDLE_LIMIT)
+    return technical_narrative(
+        symbol,
+        candle_summary(candles),
+        ta_pool.perform_technical_analysis(candles)["latest_indicators"],
+        ta_pool.calculate_volatility_index(candles),
+        ta_pool.detect_selected_patterns(candles)["detected_patterns"],
+        interval=TA_INTERVAL,
+    )
+
+
+def market_overview_narrative(days: int = 60) -> str:
+    """Fetch the market metrics and describe them with the rules."""
+
+    return market_narrative(
+        fetch_coinmarketcap_global_data(),
+        fetch_altcoin_dominance(days),
+        fetch_fear_greed_index(days),
+    )
+
+
+NARRATIVES: dict[str, Callable[..., str]] = {
+    "market_overview": market_overview_narrative,
+    "technical_analysis": technical_analysis_narrative,
+}
+
+
+async def narrate(workflow: str, params: Mapping[str, Any], reason: str) -> str:
+    """Render the rule-based answer of ``workflow`` in a worker thread."""
+
+    message = await profiling.to_thread(NARRATIVES[workflow], **params)
+    FAST_PATH_RESPONSES.inc(workflow=workflow, reason=reason)
+    return message
+
+
+async def answer(
+    workflow: str,
+    params: Mapping[str, Any],
+    mode: str,
+    run_llm: Callable[[], Awaitable[str]],
+) -> tuple[str, str]:
+    """Answer a request in ``mode``, falling back to the rules when allowed.
+
+    Args:
+        workflow: ``market_overview`` or ``technical_analysis``.
+        params: Keyword arguments of the workflow's narrative function.
+        mode: :data:`LLM` or :data:`FAST`.
+        run_llm: Coroutine function running the LLM workflow; called while
+            holding an LLM admission slot.
+
+    Returns:
+        The message and its source, ``llm`` or :data:`SOURCE`.
+
+    Raises:
+        AdmissionRejected: If the LLM is saturated and fallback is disabled.
+    """
+
+    if mode == FAST:
+        return await narrate(workflow, params, "requested"), SOURCE
+    if not fallback_enabled():
+        async with llm_admission.slot():
+            return await run_llm(), LLM
+    if saturated():
+        return await narrate(workflow, params, "saturated"), SOURCE
+
+    try:
+        async with llm_admission.slot():
+            return await run_llm(), LLM
+    except AdmissionRejected:
+        reason = "saturated"
+    except Exception as exc:  # noqa: BLE001 – answered by the rules instead
+        print(f"{workflow} LLM run failed, answering with the rules: {exc}")
+        reason = "llm_error"
+    return await narrate(workflow, params, reason), SOURCE
@@ -0,0 +1,7 @@
+"""
+Offline performance harness.
+
+This package contains local stand-ins for the upstream market-data APIs, a
+deterministic fake chat model and a concurrent HTTP load generator, so the
+service can be benchmarked without OpenAI, CoinMarketCap or Binance access.
+"""
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+"""Deterministic fake chat model for offline runs of the ``agent`` node.
+
+:class:`FakeAdvisorChatModel` answers immediately (or after a configurable
+delay) with text derived from a digest of the prompt, so identical inputs
+always yield identical output.  It never requests tool calls, which keeps the
+OpenAI-functions agent to a single model round trip, and it reports estimated
+token usage like the real client.  Batch prompts of
+:mod:`crypto_advisor.services.batch_analysis` are answered with a JSON
+object covering every requested symbol.
+
+:func:`crypto_advisor.agent.create_llm` returns this model when the
+``CRYPTO_ADVISOR_FAKE_LLM`` environment variable is set; the delay is read
+from ``CRYPTO_ADVISOR_FAKE_LLM_LATENCY`` (seconds).
+"""
+
+import hashlib
+import json
+import time
+from typing import Any, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from crypto_advisor.services.batch_analysis import SYMBOLS_PREFIX
+from crypto_advisor.utils.compact import estimate_tokens
+
+_TEMPLATE = (
+    "Offline analysis {digest}. Momentum is {bias} on the provided data, "
+    "volatility is contained and no decisive breakout is confirmed. "
+    "Recommendation: {action} and reassess after the next candle close."
+)
+
+
+class FakeAdvisorChatModel(BaseChatModel):
+    """Chat model returning prompt-derived canned analyses."""
+
+    latency: float = 0.0
+    streaming: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-advisor"
+
+    def _combine_llm_outputs(self, llm_outputs: List[Optional[dict]]) -> dict:
+        usage: dict[str, int] = {}
+        for output in llm_outputs:
+            for key, value in (output or {}).get("token_usage", {}).items():
+                usage[key] = usage.get(key, 0) + value
+        return {"token_usage": usage}
+
+    def _respond(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(message.content) for message in messages)
+        digest = hashlib.sha256(prompt.encode()).hexdigest()[:8]
+        last_line = prompt.rsplit("\n", 1)[-1]
+        if last_line.startswith(SYMBOLS_PREFIX):
+            return self._respond_batch(digest, last_line[len(SYMBOLS_PREFIX) :].split(","))
+        bullish = int(digest, 16) % 2 == 0
+        return _TEMPLATE.format(
+            digest=digest,
+            bias="constructive" if bullish else "fading",
+            action="accumulate on dips" if bullish else "reduce exposure",
+        )
+
+    def _respond_batch(self, digest: str, symbols: List[str]) -> str:
+        answers = {}
+        for symbol in (symbol.strip() for symbol in symbols):
+            bullish = int(hashlib.sha256(f"{digest}{symbol}".encode()).hexdigest()[:8], 16) % 2 == 0
+            answers[symbol] = {
+                "outlook": "bullish" if bullish else "bearish",
+                "summary": _TEMPLATE.format(
+                    digest=digest,
+                    bias="constructive" if bullish else "fading",
+                    action="accumulate on dips" if bullish else "reduce exposure",
+                ).rsplit(" Recommendation:", 1)[0],
+                "recommendation": "Accumulate on dips." if bullish else "Reduce exposure.",
+            }
+        return json.dumps(answers)
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = self._respond(messages)
+        words = text.split(" ")
+
+        if self.streaming and run_manager is not None:
+            for i, word in enumerate(words):
+                time.sleep(self.latency / len(words))
+                run_manager.on_llm_new_token(word if i == 0 else f" {word}")
+        elif self.latency:
+            time.sleep(self.latency)
+
+        prompt_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+        completion_tokens = estimate_tokens(text)
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=text))],
+            llm_output={
+                "token_usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+"""Concurrent HTTP load generator for the Crypto Advisor API.
+
+:func:`run_load` fires requests at a running server with a fixed number of
+concurrent workers and reports throughput and p50/p95/p99 latency per
+endpoint.  :func:`main` (``crypto-advisor-loadtest``) wires up a fully
+offline benchmark: the upstream simulator, the fake chat model and an
+in-process Uvicorn server running :mod:`crypto_advisor.server`::
+
+    poetry run crypto-advisor-loadtest --concurrency 16 --requests 200 \\
+        --upstream-latency 0.05 --llm-latency 0.5
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Sequence
+
+import aiohttp
+
+from crypto_advisor.harness.upstream import UpstreamConfig, UpstreamSimulator
+
+DEFAULT_PATHS = ("/technical-analysis?symbol=ETHUSDT", "/market-overview?days=60")
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (``0.0`` when empty)."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class EndpointStats:
+    """Latency samples and outcomes collected for one endpoint."""
+
+    path: str
+    latencies: list[float] = field(default_factory=list)
+    statuses: Counter[int] = field(default_factory=Counter)
+    errors: int = 0
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+        """Aggregate the samples; latencies are reported in milliseconds."""
+
+        count = len(self.latencies)
+        return {
+            "path": self.path,
+            "requests": count,
+            "errors": self.errors,
+            "throughput_rps": count / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(self.latencies, 50) * 1000,
+            "p95_ms": percentile(self.latencies, 95) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000,
+            "statuses": dict(self.statuses),
+        }
+
+
+@dataclass
+class LoadReport:
+    """Result of a :func:`run_load` run."""
+
+    elapsed: float
+    endpoints: dict[str, EndpointStats]
+
+    def summaries(self) -> list[dict[str, Any]]:  # noqa: D102
+        return [stats.summary(self.elapsed) for stats in self.endpoints.values()]
+
+    def format_table(self) -> str:
+        """Render the per-endpoint summary as a fixed-width text table."""
+
+        header = f"{'endpoint':<45} {'reqs':>6} {'errs':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+        lines = [header, "-" * len(header)]
+        for row in self.summaries():
+            lines.append(
+                f"{row['path']:<45} {row['requests']:>6} {row['errors']:>5} {row['throughput_rps']:>8.2f} "
+                f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f}",
+            )
+        lines.append(f"elapsed: {self.elapsed:.2f}s")
+        return "\n".join(lines)
+
+
+async def run_load(
+    base_url: str,
+    paths: Sequence[str] = DEFAULT_PATHS,
+    concurrency: int = 8,
+    requests_per_endpoint: int = 50,
+    timeout: float = 120.0,
+) -> LoadReport:
+    """Send ``requests_per_endpoint`` GETs to each path with bounded concurrency.
+
+    Requests for different endpoints are interleaved so every endpoint sees
+    the same background load.  Non-2xx responses and transport errors count
+    as errors; their latency is still recorded.
+    """
+
+    stats = {path: EndpointStats(path) for path in paths}
+    jobs: asyncio.Queue[str] = asyncio.Queue()
+    for _ in range(requests_per_endpoint):
+        for path in paths:
+            jobs.put_nowait(path)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(base_url.rstrip("/"), connector=connector, timeout=client_timeout) as session:
+
+        async def _worker() -> None:
+            while not jobs.empty():
+                path = jobs.get_nowait()
+                endpoint = stats[path]
+                started = time.perf_counter()
+                try:
+                    async with session.get(path) as response:
+                        await response.read()
+                        endpoint.statuses[response.status] += 1
+                        if response.status >= 400:
+                            endpoint.errors += 1
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    endpoint.errors += 1
+                endpoint.latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return LoadReport(elapsed=elapsed, endpoints=stats)
+
+
+# ---------------------------------------------------------------------------
+# Offline benchmark entry point
+# ---------------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve_in_thread(app: Any = "crypto_advisor.server:app", port: int | None = None) -> Iterator[str]:
+    """Run a Uvicorn server in a background thread and yield its base URL.
+
+    Args:
+        app: ASGI application or ``"module:attribute"`` import string.
+        port: Port to bind; a free port is chosen when omitted.
+    """
+
+    import uvicorn  # local import to avoid mandatory dependency in pure-lib mode
+
+    port = port or _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Uvicorn server failed to start")
+        time.sleep(0.05)
+    try:
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def _build_parser() -> argparse.ArgumentParser:  # noqa: D401
+    parser = argparse.ArgumentParser(description="Offline load test of the Crypto Advisor API.")
+    parser.add_argument("--paths", nargs="+", default=list(DEFAULT_PATHS), help="Endpoint paths to exercise.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent client connections.")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint.")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="Simulated upstream latency (s).")
+    parser.add_argument("--upstream-jitter", type=float, default=0.02, help="Additional random latency (s).")
+    parser.add_argument("--upstream-error-rate", type=float, default=0.0, help="Injected upstream error rate.")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Fake LLM response time (s).")
+    parser.add_argument(
+        "--no-response-cache",
+        action="store_true",
+        help="Disable the LLM response cache so every request reaches the model.",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:  # pragma: no cover
+    """Run the upstream simulator, the API server and the load generator."""
+
+    args = _build_parser().parse_args(argv if argv is not None else sys.argv[1:])
+    config = UpstreamConfig(
+        latency=args.upstream_latency,
+        jitter=args.upstream_jitter,
+        error_rate=args.upstream_error_rate,
+    )
+
+    with UpstreamSimulator(config) as upstream:
+        os.environ.update(upstream.env())
+        os.environ.update({
+            "CRYPTO_ADVISOR_FAKE_LLM": "1",
+            "CRYPTO_ADVISOR_FAKE_LLM_LATENCY": str(args.llm_latency),
+        })
+        for key in ("OPENAI_API_KEY", "SERPER_API_KEY", "COINMARKETCAP_API_KEY"):
+            os.environ.setdefault(key, "offline")
+        if args.no_response_cache:
+            os.environ["CRYPTO_ADVISOR_RESPONSE_CACHE"] = "off"
+
+        with serve_in_thread() as base_url:
+            report = asyncio.run(run_load(base_url, args.paths, args.concurrency, args.requests))
+
+        print(report.format_table())
+        print(f"upstream requests served: {upstream.requests_served}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,315 @@
+from __future__ import annotations
+
+"""Local stand-in servers for the Binance, CoinMarketCap and alternative.me APIs.
+
+:class:`UpstreamSimulator` serves the exact endpoints and response shapes the
+providers consume, backed by deterministic synthetic data:
+
+* ``GET /api/v3/klines`` – Binance candlesticks (seeded random walk per symbol).
+* ``GET /api/v3/depth`` – Binance order-book snapshot; :func:`depth_diff_events`
+  generates the matching ``depthUpdate`` diff feed.
+* ``GET /v1/global-metrics/quotes/latest`` – CoinMarketCap global metrics.
+* ``GET /v1/global-metrics/quotes/historical`` – daily CoinMarketCap history.
+* ``GET /fng/`` – Fear & Greed Index history.
+
+Latency (with jitter) and error injection are configurable through
+:class:`UpstreamConfig`.  Point the providers at the simulator with
+:meth:`UpstreamSimulator.env`::
+
+    with UpstreamSimulator(UpstreamConfig(latency=0.05)) as upstream:
+        os.environ.update(upstream.env())
+        fetch_binance_chart("ETHUSDT", "4h", 100)
+"""
+
+import json
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlparse
+
+from crypto_advisor.providers.binance import interval_to_seconds
+
+
+@dataclass
+class UpstreamConfig:
+    """Behaviour of the simulated upstream APIs.
+
+    Attributes:
+        latency: Base response delay in seconds.
+        jitter: Maximum additional random delay in seconds.
+        error_rate: Probability (0-1) of answering with ``error_status``.
+        error_status: HTTP status used for injected errors.
+        seed: Seed for latency/error randomness.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    seed: int = 0
+
+
+# ---------------------------------------------------------------------------
+# Synthetic payloads
+# ---------------------------------------------------------------------------
+
+
+def _symbol_rng(symbol: str) -> random.Random:
+    return random.Random(zlib.crc32(symbol.upper().encode()))
+
+
+def klines_payload(symbol: str, interval: str, limit: int, now: datetime | None = None) -> list[list[Any]]:
+    """Binance kline rows ending with the candle that contains ``now``."""
+
+    step = interval_to_seconds(interval)
+    now_ts = int((now or datetime.now(timezone.utc)).timestamp())
+    last_open = now_ts - now_ts % step
+    rng = _symbol_rng(symbol)
+    price = 10 + rng.random() * 1_000
+
+    rows = []
+    for i in range(limit):
+        open_time = (last_open - (limit - 1 - i) * step) * 1000
+        open_price = price
+        price = max(0.01, price * (1 + rng.gauss(0, 0.01)))
+        high = max(open_price, price) * (1 + rng.random() * 0.005)
+        low = min(open_price, price) * (1 - rng.random() * 0.005)
+        volume = 1_000 + rng.random() * 5_000
+        rows.append([
+            open_time,
+            f"{open_price:.8f}",
+            f"{high:.8f}",
+            f"{low:.8f}",
+            f"{price:.8f}",
+            f"{volume:.8f}",
+            open_time + step * 1000 - 1,
+        ])
+    return rows
+
+
+# Update ID of every simulated order-book snapshot.
+DEPTH_SNAPSHOT_UPDATE_ID = 1_000
+
+
+def _depth_mid(symbol: str) -> float:
+    return 10 + _symbol_rng(symbol).random() * 1_000
+
+
+def depth_snapshot_payload(symbol: str, limit: int = 100) -> dict[str, Any]:
+    """Binance ``/api/v3/depth`` response: ``limit`` levels per side, 1 bp apart."""
+
+    mid = _depth_mid(symbol)
+    rng = _symbol_rng(symbol + "@depth")
+    tick = mid * 1e-4
+
+    def side(sign: int) -> list[list[str]]:
+        return [
+            [f"{mid + sign * (i + 0.5) * tick:.8f}", f"{0.5 + rng.random() * 5:.8f}"]
+            for i in range(limit)
+        ]
+
+    return {"lastUpdateId": DEPTH_SNAPSHOT_UPDATE_ID, "bids": side(-1), "asks": side(1)}
+
+
+def depth_diff_events(
+    symbol: str,
+    count: int,
+    first_update_id: int = DEPTH_SNAPSHOT_UPDATE_ID + 1,
+    levels: int = 100,
+    updates_per_event: int = 10,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Consecutive ``depthUpdate`` events for the book of :func:`depth_snapshot_payload`.
+
+    Each event changes or removes (quantity ``0``) ``updates_per_event`` random
+    levels within the snapshot's price grid and spans a few update IDs.
+    """
+
+    mid = _depth_mid(symbol)
+    rng = random.Random(zlib.crc32(f"{symbol.upper()}:{seed}".encode()))
+    tick = mid * 1e-4
+    events = []
+    update_id = first_update_id
+    for _ in range(count):
+        span = rng.randint(1, 3)
+        changes: dict[str, list[list[str]]] = {"b": [], "a": []}
+        for _ in range(updates_per_event):
+            key, sign = rng.choice((("b", -1), ("a", 1)))
+            price = mid + sign * (rng.randrange(levels) + 0.5) * tick
+            quantity = 0.0 if rng.random() < 0.2 else 0.5 + rng.random() * 5
+            changes[key].append([f"{price:.8f}", f"{quantity:.8f}"])
+        events.append({
+            "e": "depthUpdate",
+            "E": int(time.time() * 1000),
+            "s": symbol.upper(),
+            "U": update_id,
+            "u": update_id + span - 1,
+            **changes,
+        })
+        update_id += span
+    return events
+
+
+def _cmc_quote(day: int) -> dict[str, Any]:
+    btc = 52 + 3 * ((day % 14) / 14)
+    return {
+        "btc_dominance": btc,
+        "eth_dominance": 17 - (btc - 52) / 2,
+        "quote": {"USD": {"total_market_cap": 2.4e12 + day * 1e10, "total_volume_24h": 9e10 + day * 1e9}},
+    }
+
+
+def cmc_latest_payload() -> dict[str, Any]:
+    """CoinMarketCap ``quotes/latest`` response."""
+
+    now = datetime.now(timezone.utc).isoformat()
+    return {"status": {"timestamp": now}, "data": _cmc_quote(0)}
+
+
+def cmc_historical_payload(time_start: str, time_end: str) -> dict[str, Any]:
+    """CoinMarketCap ``quotes/historical`` response with one quote per day."""
+
+    start = datetime.fromisoformat(time_start)
+    days = max(1, (datetime.fromisoformat(time_end) - start).days)
+    quotes = []
+    for day in range(days + 1):
+        quote = _cmc_quote(day)
+        quote["timestamp"] = (start + timedelta(days=day)).strftime("%Y-%m-%dT00:00:00.000Z")
+        quotes.append(quote)
+    return {"data": {"quotes": quotes}}
+
+
+def fear_greed_payload(limit: int) -> dict[str, Any]:
+    """alternative.me ``/fng/`` response in ``date_format=world`` style."""
+
+    today = datetime.now(timezone.utc).date()
+    labels = [(25, "Extreme Fear"), (45, "Fear"), (55, "Neutral"), (75, "Greed"), (101, "Extreme Greed")]
+    data = []
+    for day in range(limit):
+        value = 50 + int(30 * ((day % 20) / 20 - 0.5))
+        classification = next(label for bound, label in labels if value < bound)
+        data.append({
+            "value": str(value),
+            "value_classification": classification,
+            "timestamp": (today - timedelta(days=day)).strftime("%d-%m-%Y"),
+            "time_until_update": "3600",
+        })
+    return {"name": "Fear and Greed Index", "data": data}
+
+
+# ---------------------------------------------------------------------------
+# HTTP server
+# ---------------------------------------------------------------------------
+
+
+def _route(path: str, query: dict[str, str]) -> Callable[[], Any] | None:
+    if path == "/api/v3/klines":
+        return lambda: klines_payload(query["symbol"], query.get("interval", "1h"), int(query.get("limit", 500)))
+    if path == "/api/v3/depth":
+        return lambda: depth_snapshot_payload(query["symbol"], int(query.get("limit", 100)))
+    if path == "/v1/global-metrics/quotes/latest":
+        return cmc_latest_payload
+    if path == "/v1/global-metrics/quotes/historical":
+        return lambda: cmc_historical_payload(query["time_start"], query["time_end"])
+    if path.rstrip("/") == "/fng":
+        return lambda: fear_greed_payload(int(query.get("limit", 1)))
+    return None
+
+
+class UpstreamSimulator:
+    """Threaded HTTP server emulating every upstream API used by the providers."""
+
+    def __init__(self, config: UpstreamConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.config = config or UpstreamConfig()
+        self.requests_served = 0
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Root URL of the running simulator."""
+
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict[str, str]:
+        """Environment variables redirecting all providers to the simulator."""
+
+        return {
+            "BINANCE_KLINES_URL": f"{self.base_url}/api/v3/klines",
+            "BINANCE_DEPTH_URL": f"{self.base_url}/api/v3/depth",
+            "COINMARKETCAP_API_URL": self.base_url,
+            "FEAR_GREED_API_URL": f"{self.base_url}/fng/",
+        }
+
+    def _delay_and_fail(self) -> bool:
+        """Sleep for the configured latency and decide whether to fail."""
+
+        with self._lock:
+            self.requests_served += 1
+            delay = self.config.latency + self._rng.random() * self.config.jitter
+            fail = self._rng.random() < self.config.error_rate
+        if delay > 0:
+            time.sleep(delay)
+        return fail
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        simulator = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                parsed = urlparse(self.path)
+                query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+                route = _route(parsed.path, query)
+                if route is None:
+                    self._send(404, {"error": "not found"})
+                    return
+                if simulator._delay_and_fail():
+                    self._send(simulator.config.error_status, {"error": "injected failure"})
+                    return
+                try:
+                    self._send(200, route())
+                except (KeyError, ValueError) as exc:
+                    self._send(400, {"error": str(exc)})
+
+            def _send(self, status: int, payload: Any) -> None:
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass  # keep benchmark output clean
+
+        return _Handler
+
+    def start(self) -> UpstreamSimulator:
+        """Start serving in a background thread."""
+
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down and wait for the serving thread."""
+
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> UpstreamSimulator:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
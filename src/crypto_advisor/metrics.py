@@ -0,0 +1,378 @@
+from __future__ import annotations
+
+"""Lightweight Prometheus metrics.
+
+A small, dependency-free implementation of counters, gauges and histograms
+rendered in the Prometheus text exposition format (``GET /metrics``).  Each
+observation costs one lock acquisition and a bisect over the bucket bounds,
+so instrumentation can stay enabled in production.
+
+The metric families of the service are defined at the bottom of this module
+and updated from the layer that owns the measured work:
+
+* graph nodes – :func:`timed_node` in :mod:`crypto_advisor.workflows`,
+* provider HTTP calls – :mod:`crypto_advisor.providers.http`,
+* ``ta_service`` functions – :func:`timed` decorators,
+* LLM calls – :class:`LLMMetricsHandler` attached to the chat model,
+* response cache and tool-call memoization – lookup counters,
+* admission control – gauges registered by :mod:`crypto_advisor.admission`.
+"""
+
+import abc
+import functools
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _format_sample(name: str, labels: Mapping[str, str], value: float) -> str:
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    rendered = ",".join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+    return f"{name}{{{rendered}}} {_format_value(value)}"
+
+
+class Registry:
+    """Ordered collection of metric families."""
+
+    def __init__(self) -> None:
+        self._metrics: List[_Metric] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:  # noqa: D102
+        with self._lock:
+            if any(existing.name == metric.name for existing in self._metrics):
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Return all metrics in the Prometheus text format."""
+
+        lines: List[str] = []
+        for metric in list(self._metrics):
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(_format_sample(name, labels, value) for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric(abc.ABC):
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[Registry] = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: Mapping[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[Sample]:  # noqa: D102
+        ...
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set."""
+
+    type = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:  # noqa: D102
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:  # noqa: D102
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Sample]:  # noqa: D102
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            yield f"{self.name}_total", self._labels(key), value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down.
+
+    Args:
+        collect: Optional callable returning ``{label_values_tuple: value}``;
+            evaluated at render time for gauges mirroring external state.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        *args: Any,
+        collect: Optional[Callable[[], Mapping[Tuple[str, ...], float]]] = None,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: Any) -> None:  # noqa: D102
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:  # noqa: D102
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:  # noqa: D102
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: Any) -> float:  # noqa: D102
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Sample]:  # noqa: D102
+        with self._lock:
+            items = list(self._values.items())
+        if self._collect is not None:
+            items.extend(self._collect().items())
+        for key, value in items:
+            yield self.name, self._labels(key), value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(self, *args: Any, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (last = +Inf), sum, count].
+        self._series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:  # noqa: D102
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the wall-clock duration of the ``with`` block."""
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:  # noqa: D102
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def samples(self) -> Iterator[Sample]:  # noqa: D102
+        with self._lock:
+            items = [(key, (list(series[0]), series[1], series[2])) for key, series in self._series.items()]
+        for key, (counts, total, count) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+
+def timed(histogram: Histogram, **labels: Any) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator observing the duration of every call of the wrapped function."""
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Service metrics
+# ---------------------------------------------------------------------------
+
+
+NODE_SECONDS = Histogram(
+    "crypto_advisor_node_duration_seconds",
+    "Duration of LangGraph node executions.",
+    ("workflow", "node"),
+)
+NODES_IN_FLIGHT = Gauge(
+    "crypto_advisor_nodes_in_flight",
+    "LangGraph nodes currently executing.",
+    ("workflow", "node"),
+)
+PROVIDER_SECONDS = Histogram(
+    "crypto_advisor_provider_request_duration_seconds",
+    "Duration of upstream provider HTTP requests.",
+    ("function", "host", "status"),
+)
+TA_SECONDS = Histogram(
+    "crypto_advisor_ta_function_duration_seconds",
+    "Duration of ta_service computations.",
+    ("function",),
+)
+LLM_SECONDS = Histogram(
+    "crypto_advisor_llm_request_duration_seconds",
+    "Duration of chat model calls.",
+    ("model", "status"),
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120),
+)
+LLM_TOKENS = Counter(
+    "crypto_advisor_llm_tokens",
+    "Tokens consumed by chat model calls.",
+    ("model", "kind"),
+)
+TOOL_CALLS = Counter(
+    "crypto_advisor_agent_tool_calls",
+    "Agent tool calls, split into executed and served from the per-run memo.",
+    ("workflow", "outcome"),
+)
+FAST_PATH_RESPONSES = Counter(
+    "crypto_advisor_fast_path_responses",
+    "Responses rendered by the rule-based narrative instead of the LLM, by reason.",
+    ("workflow", "reason"),
+)
+CACHE_LOOKUPS = Counter(
+    "crypto_advisor_cache_lookups",
+    "Cache lookups by cache and result (hit or miss).",
+    ("cache", "result"),
+)
+
+
+def _hit_ratios() -> Dict[Tuple[str, ...], float]:
+    lookups: Dict[str, Dict[str, float]] = {}
+    for _, labels, value in CACHE_LOOKUPS.samples():
+        lookups.setdefault(labels["cache"], {})[labels["result"]] = value
+    return {
+        (cache,): results.get("hit", 0.0) / total
+        for cache, results in lookups.items()
+        if (total := sum(results.values()))
+    }
+
+
+CACHE_HIT_RATIO = Gauge(
+    "crypto_advisor_cache_hit_ratio",
+    "Share of cache lookups served from the cache since start-up.",
+    ("cache",),
+    collect=_hit_ratios,
+)
+
+
+@contextmanager
+def timed_call(histogram: Histogram, gauge: Gauge, **labels: Any) -> Iterator[None]:
+    """Time a block while tracking it in an in-flight gauge."""
+
+    gauge.inc(**labels)
+    try:
+        with histogram.time(**labels):
+            yield
+    finally:
+        gauge.dec(**labels)
+
+
+def timed_node(workflow: str, node: str, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a graph node so its executions are timed.
+
+    ``functools.wraps`` keeps the original signature visible, so LangGraph
+    still passes ``config`` to nodes that accept it.
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with timed_call(NODE_SECONDS, NODES_IN_FLIGHT, workflow=workflow, node=node):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class LLMMetricsHandler(BaseCallbackHandler):
+    """Callback handler recording chat model latency and token usage."""
+
+    def __init__(self) -> None:
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: D102
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:  # noqa: D102
+        self._started[run_id] = time.perf_counter()
+
+    def _finish(self, run_id: UUID, model: str, status: str) -> None:
+        started = self._started.pop(run_id, None)
+        if started is not None:
+            LLM_SECONDS.observe(time.perf_counter() - started, model=model, status=status)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: D102
+        output = response.llm_output or {}
+        model = str(output.get("model_name") or "unknown")
+        self._finish(run_id, model, "ok")
+        usage = output.get("token_usage") or {}
+        for kind in ("prompt_tokens", "completion_tokens"):
+            if usage.get(kind):
+                LLM_TOKENS.inc(usage[kind], model=model, kind=kind.split("_")[0])
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: D102
+        self._finish(run_id, "unknown", "error")
+
+
+llm_metrics_handler = LLMMetricsHandler()
@@ -0,0 +1,444 @@
+from __future__ import annotations
+
+"""Opt-in per-request profiling of the API server.
+
+A slow ``/technical-analysis`` call may spend its time in the indicator code,
+in Binance or OpenAI round trips or in agent loops.  This module captures a
+profile of individual requests so the culprit shows up by function.
+
+A request is profiled when
+
+* it carries ``X-Profile-Token`` equal to ``CRYPTO_ADVISOR_PROFILE_TOKEN``
+  (optionally with ``X-Profile-Mode: cprofile`` or ``sample``), or
+* it is picked at random with probability ``CRYPTO_ADVISOR_PROFILE_SAMPLE_RATE``, or
+* ``CRYPTO_ADVISOR_PROFILE_SLOW_MS`` is set: every request is then sampled
+  statistically and the profile kept only if the request took at least that
+  long.
+
+Request handlers run their blocking work in worker threads (graph nodes,
+``asyncio.to_thread``).  Those threads join the request's capture through
+:func:`attached` / :func:`to_thread`, which consult a
+:class:`contextvars.ContextVar` set by the middleware.  Two capture modes
+exist:
+
+* ``cprofile`` – deterministic: a :class:`cProfile.Profile` per attached
+  thread, merged and written as ``<id>.prof`` (``pstats`` format, readable
+  with ``python -m pstats`` or snakeviz).  Python 3.12+ allows only one
+  active profiler per process, so there ``cprofile`` falls back to
+  ``sample``;
+* ``sample`` – statistical: a shared sampler thread reads the stacks of the
+  attached threads every ``CRYPTO_ADVISOR_PROFILE_INTERVAL_MS`` and writes
+  ``<id>.folded`` (collapsed stacks for flamegraph.pl or speedscope).
+
+Profiles land in ``CRYPTO_ADVISOR_PROFILE_DIR``; ``index.json`` lists the
+``CRYPTO_ADVISOR_PROFILE_KEEP`` slowest captures, and files that drop out of
+it are deleted.  Without ``CRYPTO_ADVISOR_PROFILE_DIR`` profiling is
+disabled: no middleware is installed and :func:`attached` returns functions
+unchanged.  Work done inside the TA process pool is not captured.
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+CPROFILE = "cprofile"
+SAMPLE = "sample"
+
+TOKEN_HEADER = "X-Profile-Token"
+MODE_HEADER = "X-Profile-Mode"
+ID_HEADER = "X-Profile-Id"
+
+INDEX_FILE = "index.json"
+
+# From 3.12 cProfile hooks into the process-wide ``sys.monitoring``, and a
+# second concurrently enabled profile raises ``ValueError``.
+CPROFILE_PER_THREAD = sys.version_info < (3, 12)
+
+
+@dataclass(frozen=True)
+class ProfileSettings:
+    """Profiling configuration read from the environment."""
+
+    directory: Path | None = None
+    token: str = ""
+    sample_rate: float = 0.0
+    slow_ms: float = 0.0
+    mode: str = SAMPLE
+    interval: float = 0.005
+    keep: int = 50
+
+    @property
+    def enabled(self) -> bool:  # noqa: D102
+        return self.directory is not None
+
+    @classmethod
+    def from_env(cls) -> ProfileSettings:  # noqa: D102
+        directory = os.getenv("CRYPTO_ADVISOR_PROFILE_DIR")
+        mode = os.getenv("CRYPTO_ADVISOR_PROFILE_MODE", SAMPLE).lower()
+        if mode not in (CPROFILE, SAMPLE):
+            raise ValueError(f"Unknown CRYPTO_ADVISOR_PROFILE_MODE: {mode}")
+        return cls(
+            directory=Path(directory) if directory else None,
+            token=os.getenv("CRYPTO_ADVISOR_PROFILE_TOKEN", ""),
+            sample_rate=float(os.getenv("CRYPTO_ADVISOR_PROFILE_SAMPLE_RATE", "0")),
+            slow_ms=float(os.getenv("CRYPTO_ADVISOR_PROFILE_SLOW_MS", "0")),
+            mode=mode,
+            interval=float(os.getenv("CRYPTO_ADVISOR_PROFILE_INTERVAL_MS", "5")) / 1000,
+            keep=int(os.getenv("CRYPTO_ADVISOR_PROFILE_KEEP", "50")),
+        )
+
+
+@lru_cache(maxsize=1)
+def settings() -> ProfileSettings:
+    """Process-wide settings (read once)."""
+
+    return ProfileSettings.from_env()
+
+
+def enabled() -> bool:
+    """Whether ``CRYPTO_ADVISOR_PROFILE_DIR`` enables profiling."""
+
+    return settings().enabled
+
+
+# ---------------------------------------------------------------------------
+# Captures
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ProfileEntry:
+    """Index entry describing one stored profile."""
+
+    id: str
+    file: str
+    mode: str
+    trigger: str
+    method: str
+    path: str
+    status: int
+    duration_ms: float
+    captured_at: str
+    samples: int | None = None
+
+
+@dataclass
+class Capture:
+    """Profile of one request, collected from every attached thread."""
+
+    mode: str
+    trigger: str
+    interval: float = 0.005
+    started: float = field(default_factory=time.perf_counter)
+    threads: dict[int, int] = field(default_factory=dict)
+    profiles: list[cProfile.Profile] = field(default_factory=list)
+    stacks: Counter = field(default_factory=Counter)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.mode == CPROFILE and not CPROFILE_PER_THREAD:
+            self.mode = SAMPLE
+
+    @contextmanager
+    def attach(self) -> Iterator[None]:
+        """Include the calling thread in the capture while the block runs."""
+
+        ident = threading.get_ident()
+        with self.lock:
+            depth = self.threads.get(ident, 0)
+            self.threads[ident] = depth + 1
+        if depth:  # already attached further up this thread's stack
+            try:
+                yield
+            finally:
+                with self.lock:
+                    self.threads[ident] -= 1
+            return
+
+        profile = None
+        if self.mode == CPROFILE:
+            try:
+                profile = cProfile.Profile()
+                profile.enable()
+            except Exception as exc:  # noqa: BLE001 – profiling must never fail the request
+                print(f"Could not profile thread {ident}: {exc}")
+                profile = None
+        else:
+            _SAMPLER.add(self)
+        try:
+            yield
+        finally:
+            if self.mode != CPROFILE:
+                _SAMPLER.discard(self)
+            elif profile is not None:
+                profile.disable()
+            with self.lock:
+                if profile is not None:
+                    self.profiles.append(profile)
+                del self.threads[ident]
+
+    def sample(self, frames: dict[int, Any]) -> None:
+        """Record the current stack of every attached thread."""
+
+        with self.lock:
+            idents = list(self.threads)
+        for ident in idents:
+            frame = frames.get(ident)
+            if frame is not None:
+                self.stacks[_fold(frame)] += 1
+
+    def write(self, path: Path) -> int | None:
+        """Write the profile to ``path``; returns the sample count in ``sample`` mode."""
+
+        if self.mode == CPROFILE:
+            if not self.profiles:
+                path.write_bytes(b"")
+                return None
+            stats = pstats.Stats(self.profiles[0])
+            for profile in self.profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(str(path))
+            return None
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        path.write_text("\n".join(lines) + "\n" if lines else "", encoding="utf-8")
+        return sum(self.stacks.values())
+
+
+def _frame_label(frame: Any) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _fold(frame: Any) -> str:
+    """Collapsed stack (root first, ``;``-separated) of ``frame``."""
+
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class _Sampler:
+    """Background thread sampling the threads of all ``sample`` captures."""
+
+    def __init__(self) -> None:
+        self._captures: dict[int, tuple[Capture, int]] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._thread: threading.Thread | None = None
+
+    def add(self, capture: Capture) -> None:  # noqa: D102
+        with self._lock:
+            _, count = self._captures.get(id(capture), (capture, 0))
+            self._captures[id(capture)] = (capture, count + 1)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="crypto-advisor-profiler", daemon=True)
+                self._thread.start()
+            self._wakeup.notify()
+
+    def discard(self, capture: Capture) -> None:  # noqa: D102
+        with self._lock:
+            _, count = self._captures.get(id(capture), (capture, 1))
+            if count > 1:
+                self._captures[id(capture)] = (capture, count - 1)
+            else:
+                self._captures.pop(id(capture), None)
+
+    def _loop(self) -> None:
+        own = threading.get_ident()
+        while True:
+            with self._lock:
+                while not self._captures:
+                    self._wakeup.wait()
+                captures = [capture for capture, _ in self._captures.values()]
+                interval = min(capture.interval for capture in captures)
+            frames = sys._current_frames()  # noqa: SLF001
+            frames.pop(own, None)
+            for capture in captures:
+                capture.sample(frames)
+            del frames
+            time.sleep(interval)
+
+
+_SAMPLER = _Sampler()
+_current: contextvars.ContextVar[Capture | None] = contextvars.ContextVar("crypto_advisor_profile", default=None)
+
+
+def current_capture() -> Capture | None:
+    """Capture of the request being handled, if it is profiled."""
+
+    return _current.get()
+
+
+@contextmanager
+def capturing(capture: Capture) -> Iterator[Capture]:
+    """Make ``capture`` the current capture of the calling context.
+
+    The calling thread itself is not attached: in the server it is the event
+    loop thread, which interleaves every request.
+    """
+
+    token = _current.set(capture)
+    try:
+        yield capture
+    finally:
+        _current.reset(token)
+
+
+def attached(func: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``func`` so the thread running it joins the caller's capture.
+
+    Returns ``func`` itself when profiling is disabled.
+    """
+
+    if not enabled():
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        capture = _current.get()
+        if capture is None:
+            return func(*args, **kwargs)
+        with capture.attach():
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+async def to_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """:func:`asyncio.to_thread` whose worker thread joins the current capture."""
+
+    return await asyncio.to_thread(attached(func), *args, **kwargs)
+
+
+# ---------------------------------------------------------------------------
+# Store
+# ---------------------------------------------------------------------------
+
+
+class ProfileStore:
+    """Directory of profiles plus an index of the slowest captures."""
+
+    def __init__(self, directory: Path, keep: int = 50) -> None:
+        self.directory = Path(directory)
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._entries: list[ProfileEntry] | None = None
+
+    def _load(self) -> list[ProfileEntry]:
+        if self._entries is None:
+            try:
+                raw = json.loads((self.directory / INDEX_FILE).read_text(encoding="utf-8"))
+                self._entries = [ProfileEntry(**item) for item in raw]
+            except (OSError, ValueError, TypeError):
+                self._entries = []
+        return self._entries
+
+    def entries(self) -> list[ProfileEntry]:
+        """Indexed profiles, slowest first."""
+
+        with self._lock:
+            return list(self._load())
+
+    def save(self, capture: Capture, method: str, path: str, status: int, duration: float) -> ProfileEntry | None:
+        """Write ``capture`` and index it.
+
+        Returns:
+            The new entry, or ``None`` if it is faster than every indexed
+            profile and the index is full.
+        """
+
+        duration_ms = round(duration * 1000, 3)
+        with self._lock:
+            entries = self._load()
+            if len(entries) >= self.keep and entries and duration_ms <= entries[-1].duration_ms:
+                return None
+            self.directory.mkdir(parents=True, exist_ok=True)
+            now = datetime.now(timezone.utc)
+            profile_id = f"{now:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+            file = f"{profile_id}.{'prof' if capture.mode == CPROFILE else 'folded'}"
+            samples = capture.write(self.directory / file)
+            entry = ProfileEntry(
+                id=profile_id,
+                file=file,
+                mode=capture.mode,
+                trigger=capture.trigger,
+                method=method,
+                path=path,
+                status=status,
+                duration_ms=duration_ms,
+                captured_at=now.isoformat(timespec="seconds"),
+                samples=samples,
+            )
+            entries.append(entry)
+            entries.sort(key=lambda item: item.duration_ms, reverse=True)
+            for evicted in entries[self.keep :]:
+                (self.directory / evicted.file).unlink(missing_ok=True)
+            del entries[self.keep :]
+            index = self.directory / INDEX_FILE
+            tmp = index.with_suffix(".tmp")
+            tmp.write_text(json.dumps([asdict(item) for item in entries], indent=2), encoding="utf-8")
+            os.replace(tmp, index)
+            return entry
+
+
+@lru_cache(maxsize=1)
+def profile_store() -> ProfileStore:
+    """Process-wide store in ``CRYPTO_ADVISOR_PROFILE_DIR``."""
+
+    config = settings()
+    if config.directory is None:
+        raise RuntimeError("Profiling is disabled (CRYPTO_ADVISOR_PROFILE_DIR is not set).")
+    return ProfileStore(config.directory, config.keep)
+
+
+# ---------------------------------------------------------------------------
+# Request selection
+# ---------------------------------------------------------------------------
+
+
+def select(headers: Any, config: ProfileSettings | None = None) -> Capture | None:
+    """Decide whether a request with ``headers`` is profiled.
+
+    Returns:
+        A fresh capture, or ``None`` if the request is not profiled.
+    """
+
+    config = config or settings()
+    if config.token and headers.get(TOKEN_HEADER.lower()) == config.token:
+        mode = (headers.get(MODE_HEADER.lower()) or config.mode).lower()
+        if mode not in (CPROFILE, SAMPLE):
+            mode = config.mode
+        return Capture(mode=mode, trigger="header", interval=config.interval)
+    if config.sample_rate and random.random() < config.sample_rate:
+        return Capture(mode=config.mode, trigger="sampled", interval=config.interval)
+    if config.slow_ms:
+        # Latency is unknown up front, so use the cheap statistical mode.
+        return Capture(mode=SAMPLE, trigger="slow", interval=config.interval)
+    return None
+
+
+def keep(capture: Capture, duration: float, config: ProfileSettings | None = None) -> bool:
+    """Whether a finished capture is worth storing."""
+
+    config = config or settings()
+    return capture.trigger != "slow" or duration * 1000 >= config.slow_ms
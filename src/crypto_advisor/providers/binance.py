@@ -2,18 +2,64 @@
 
 This module provides functions for fetching candlestick data from the Binance
 REST API using the `requests` library.
+
+The endpoint can be redirected (e.g. to a local stand-in server) through the
+``BINANCE_KLINES_URL`` environment variable.
 """
 
 from __future__ import annotations
 
+import os
 from datetime import datetime
 from typing import Final, List, Dict
 
 import requests
 
+from crypto_advisor.providers import http
+from crypto_advisor.services.shared_cache import shared_cached
 
 API_BASE_URL: Final[str] = "https://api.binance.com/api/v3/klines"
 
+# Duration of each supported kline interval in seconds.  ``1M`` is approximated
+# as 30 days; it is only used for cache alignment, never for date arithmetic.
+INTERVAL_SECONDS: Final[dict[str, int]] = {
+    "1s": 1,
+    "1m": 60,
+    "3m": 3 * 60,
+    "5m": 5 * 60,
+    "15m": 15 * 60,
+    "30m": 30 * 60,
+    "1h": 60 * 60,
+    "2h": 2 * 60 * 60,
+    "4h": 4 * 60 * 60,
+    "6h": 6 * 60 * 60,
+    "8h": 8 * 60 * 60,
+    "12h": 12 * 60 * 60,
+    "1d": 24 * 60 * 60,
+    "3d": 3 * 24 * 60 * 60,
+    "1w": 7 * 24 * 60 * 60,
+    "1M": 30 * 24 * 60 * 60,
+}
+
+
+def interval_to_seconds(interval: str) -> int:
+    """Return the length of a Binance kline interval in seconds.
+
+    Args:
+        interval: Candlestick interval (e.g. ``"1h"``, ``"4h"``, ``"1d"``).
+
+    Returns:
+        The interval duration in seconds.
+
+    Raises:
+        ValueError: If the interval is not a known Binance interval.
+    """
+
+    try:
+        return INTERVAL_SECONDS[interval]
+    except KeyError as exc:
+        raise ValueError(f"Unsupported Binance interval: {interval}") from exc
+
 
 def _parse_candle(raw_candle: list) -> Dict[str, float | datetime]:
     """Convert a single raw kline entry to the internal dict representation.
@@ -43,6 +89,12 @@ def _parse_candle(raw_candle: list) -> Dict[str, float | datetime]:
     }
 
 
+# How long fetched klines are shared between workers.  Only the still-forming
+# last candle can change within this window.
+KLINES_CACHE_TTL: Final[float] = 15.0
+
+
+@shared_cached("binance_klines", ttl=KLINES_CACHE_TTL)
 def fetch_binance_chart(symbol: str, interval: str = "1h", limit: int = 50) -> List[dict]:
     """Fetch candlestick (kline) data from Binance via the public REST API.
 
@@ -69,7 +121,12 @@ def fetch_binance_chart(symbol: str, interval: str = "1h", limit: int = 50) -> L
     }
 
     try:
-        response = requests.get(API_BASE_URL, params=params, timeout=10)
+        response = http.get(
+            os.getenv("BINANCE_KLINES_URL", API_BASE_URL),
+            function="fetch_binance_chart",
+            params=params,
+            timeout=10,
+        )
         response.raise_for_status()
     except requests.RequestException as exc:  # pragma: no cover – network I/O
         raise RuntimeError(f"Failed to fetch data from Binance: {exc}") from exc
@@ -0,0 +1,159 @@
+"""Record/replay of provider HTTP traffic.
+
+Cassettes make provider calls deterministic and network-free, e.g. to profile
+or regression-test whole workflows.  They hook into
+:func:`crypto_advisor.providers.http.get`, so every provider is covered:
+
+* **record** – requests go to the network as usual; each request/response
+  pair is additionally written to a gzip-compressed JSON cassette file.
+* **replay** – responses are served from cassettes only.  A request without a
+  cassette fails with :class:`CassetteMissError` (a
+  :class:`requests.RequestException`).  The recorded latency can be
+  re-enacted, scaled by a factor.
+
+Cassettes are keyed by provider function, URL (without query string) and the
+query parameters; parameters that change on every call (the request-time
+window of the CoinMarketCap history) are ignored.  Request headers – and thus
+API keys – are never written.
+
+Configuration (honoured by the server and the CLI alike):
+
+* ``CRYPTO_ADVISOR_CASSETTE_MODE`` – ``off`` (default), ``record`` or ``replay``.
+* ``CRYPTO_ADVISOR_CASSETTE_DIR`` – cassette directory (``cassettes``).
+* ``CRYPTO_ADVISOR_CASSETTE_LATENCY`` – replay latency factor; ``0``
+  (default) replays instantly, ``1`` sleeps for the recorded duration.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Mapping
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_CASSETTE_DIR = "cassettes"
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+
+# Query parameters derived from the current time rather than the request intent.
+_VOLATILE_PARAMS = frozenset({"time_start", "time_end"})
+# Response headers worth keeping; the rest is transport noise.
+_KEPT_HEADERS = ("Content-Type", "Content-Encoding", "Date")
+
+
+class CassetteMissError(requests.RequestException):
+    """Raised in replay mode when no cassette matches a request."""
+
+
+class Cassette:
+    """Directory of recorded provider responses.
+
+    Args:
+        directory: Where cassette files live.
+        mode: :data:`RECORD` or :data:`REPLAY`.
+        latency_factor: Multiplier applied to the recorded latency on replay.
+    """
+
+    def __init__(self, directory: str | os.PathLike[str], mode: str, latency_factor: float = 0.0) -> None:
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.latency_factor = latency_factor
+
+    @staticmethod
+    def request_id(url: str, params: Mapping[str, Any] | None) -> dict[str, Any]:
+        """Normalised description of a request used for matching."""
+
+        parts = urlsplit(url)
+        return {
+            "url": urlunsplit((parts.scheme, parts.netloc, parts.path, "", "")),
+            "params": {
+                key: str(value) for key, value in sorted((params or {}).items()) if key not in _VOLATILE_PARAMS
+            },
+        }
+
+    def path(self, function: str, url: str, params: Mapping[str, Any] | None) -> Path:
+        """Cassette file for a request."""
+
+        encoded = json.dumps(self.request_id(url, params), sort_keys=True)
+        digest = hashlib.sha256(encoded.encode()).hexdigest()[:20]
+        return self.directory / function / f"{digest}.json.gz"
+
+    def record(
+        self,
+        function: str,
+        url: str,
+        params: Mapping[str, Any] | None,
+        response: requests.Response,
+        elapsed: float,
+    ) -> None:
+        """Write ``response`` to the cassette of the request."""
+
+        path = self.path(function, url, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "function": function,
+            "request": self.request_id(url, params),
+            "response": {
+                "status": response.status_code,
+                "headers": {name: response.headers[name] for name in _KEPT_HEADERS if name in response.headers},
+                "body": response.text,
+                "elapsed": round(elapsed, 6),
+            },
+            "recorded_at": time.time(),
+        }
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(gzip.compress(json.dumps(payload).encode()))
+        os.replace(tmp_path, path)  # atomic on POSIX and Windows
+
+    def replay(self, function: str, url: str, params: Mapping[str, Any] | None) -> requests.Response:
+        """Build the recorded response of the request.
+
+        Raises:
+            CassetteMissError: If the request was never recorded.
+        """
+
+        path = self.path(function, url, params)
+        try:
+            payload = json.loads(gzip.decompress(path.read_bytes()))
+        except OSError as exc:
+            raise CassetteMissError(f"No cassette for {function} {self.request_id(url, params)}") from exc
+
+        recorded = payload["response"]
+        if self.latency_factor > 0:
+            time.sleep(recorded["elapsed"] * self.latency_factor)
+
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response._content = recorded["body"].encode()  # noqa: SLF001 – requests has no public setter
+        response.encoding = "utf-8"
+        response.url = url
+        return response
+
+
+@lru_cache(maxsize=8)
+def _build(directory: str, mode: str, latency_factor: float) -> Cassette:
+    return Cassette(directory, mode, latency_factor)
+
+
+def active_cassette() -> Cassette | None:
+    """Return the cassette configured through the environment, if any."""
+
+    mode = os.getenv("CRYPTO_ADVISOR_CASSETTE_MODE", OFF).lower()
+    if mode in (OFF, ""):
+        return None
+    directory = os.getenv("CRYPTO_ADVISOR_CASSETTE_DIR", DEFAULT_CASSETTE_DIR)
+    latency_factor = float(os.getenv("CRYPTO_ADVISOR_CASSETTE_LATENCY", "0"))
+    return _build(directory, mode, latency_factor)
@@ -2,12 +2,29 @@
 CoinMarketCap API provider.
 
 This module provides functions for fetching data from the CoinMarketCap API.
+
+Base URLs can be redirected (e.g. to local stand-in servers) through the
+``COINMARKETCAP_API_URL`` and ``FEAR_GREED_API_URL`` environment variables.
 """
 
 import os
-import requests
 from datetime import datetime, timedelta
 
+from crypto_advisor.providers import http
+from crypto_advisor.services.shared_cache import shared_cached
+
+CMC_API_URL = "https://pro-api.coinmarketcap.com"
+FEAR_GREED_API_URL = "https://api.alternative.me/fng/"
+
+# Seconds responses are shared between workers (see ``CRYPTO_ADVISOR_SHARED_CACHE``).
+GLOBAL_CACHE_TTL = 60
+DAILY_CACHE_TTL = 600
+
+def _cmc_url(path: str) -> str:
+    """Build a CoinMarketCap endpoint URL honouring ``COINMARKETCAP_API_URL``."""
+    return os.getenv("COINMARKETCAP_API_URL", CMC_API_URL).rstrip("/") + path
+
+@shared_cached("cmc_global", ttl=GLOBAL_CACHE_TTL)
 def fetch_coinmarketcap_global_data() -> dict:
     """
     Fetches global market data from CoinMarketCap.
@@ -16,14 +33,14 @@ def fetch_coinmarketcap_global_data() -> dict:
         Dictionary with total market cap, 24h volume, and BTC dominance.
     """
     print("Fetching global market data from CoinMarketCap...")
-    url = "https://pro-api.coinmarketcap.com/v1/global-metrics/quotes/latest"
+    url = _cmc_url("/v1/global-metrics/quotes/latest")
 
     headers = {
         "Accepts": "application/json",
         "X-CMC_PRO_API_KEY": os.getenv("COINMARKETCAP_API_KEY")
     }
 
-    response = requests.get(url, headers=headers)
+    response = http.get(url, function="fetch_coinmarketcap_global_data", headers=headers)
     response.raise_for_status()
     data = response.json()
 
@@ -35,6 +52,7 @@ def fetch_coinmarketcap_global_data() -> dict:
         "timestamp": data["status"]["timestamp"]
     }
 
+@shared_cached("cmc_historical", ttl=DAILY_CACHE_TTL)
 def fetch_coinmarketcap_historical_data(days: int = 30) -> dict:
     """
     Fetches historical global market data from CoinMarketCap.
@@ -50,7 +68,7 @@ def fetch_coinmarketcap_historical_data(days: int = 30) -> dict:
     end_date = datetime.now()
     _start_date = end_date - timedelta(days=days)  # noqa: WPS122 – local debug variable
     
-    url = "https://pro-api.coinmarketcap.com/v1/global-metrics/quotes/historical"
+    url = _cmc_url("/v1/global-metrics/quotes/historical")
     
     params = {
         "time_start": _start_date.isoformat(),
@@ -63,7 +81,7 @@ def fetch_coinmarketcap_historical_data(days: int = 30) -> dict:
         "X-CMC_PRO_API_KEY": os.getenv("COINMARKETCAP_API_KEY")
     }
     
-    response = requests.get(url, headers=headers, params=params)
+    response = http.get(url, function="fetch_coinmarketcap_historical_data", headers=headers, params=params)
     response.raise_for_status()  # Raises an error if request fails
     data = response.json()
     
@@ -100,6 +118,7 @@ def fetch_coinmarketcap_historical_data(days: int = 30) -> dict:
         }
     }
 
+@shared_cached("fear_greed", ttl=DAILY_CACHE_TTL)
 def fetch_fear_greed_index(days: int = 30) -> dict:
     """
     Fetches historical Fear and Greed Index data.
@@ -112,7 +131,7 @@ def fetch_fear_greed_index(days: int = 30) -> dict:
     """
     print("Fetching Fear & Greed Index data...")
     
-    url = "https://api.alternative.me/fng/"
+    url = os.getenv("FEAR_GREED_API_URL", FEAR_GREED_API_URL)
     
     params = {
         "limit": days,
@@ -120,7 +139,7 @@ def fetch_fear_greed_index(days: int = 30) -> dict:
         "date_format": "world"
     }
     
-    response = requests.get(url, params=params)
+    response = http.get(url, function="fetch_fear_greed_index", params=params)
     response.raise_for_status()
     data = response.json()
     
@@ -0,0 +1,472 @@
+"""Binance order-book depth provider.
+
+:func:`fetch_depth_snapshot` loads a REST snapshot into an :class:`OrderBook`,
+which keeps each side as sorted NumPy price and quantity arrays.  Diff events
+of the ``<symbol>@depth`` stream are applied in bulk: all levels of a batch
+are de-duplicated (last update wins) and merged into the arrays with one
+vectorized pass per side, so many books can be maintained in one process
+(see :class:`OrderBookSet` and :func:`maintain_books`).
+
+Metrics are vectorized over the arrays: best bid/ask, spread, notional depth
+within ±x % of the mid price, depth imbalance and the slippage of a market
+order of a given quote notional.
+
+Event sequencing follows the Binance rules for local books: events whose
+final update ID ``u`` is not newer than the book are dropped, and an event
+whose first update ID ``U`` skips past the next expected ID raises
+:class:`OrderBookGap`; the book must then be reloaded from a snapshot.
+
+The endpoints can be redirected (e.g. to the local stand-in server) through
+``BINANCE_DEPTH_URL`` and ``BINANCE_DEPTH_STREAM_URL``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Final, Iterable, Sequence
+
+import numpy as np
+import requests
+
+from crypto_advisor.providers import http
+
+DEPTH_URL: Final[str] = "https://api.binance.com/api/v3/depth"
+DEPTH_STREAM_URL: Final[str] = "wss://stream.binance.com:9443/stream"
+
+DEFAULT_DEPTH_PCTS: Final[tuple[float, ...]] = (0.1, 0.5, 1.0, 2.0)
+DEFAULT_NOTIONALS: Final[tuple[float, ...]] = (10_000.0, 100_000.0, 1_000_000.0)
+
+
+class OrderBookGap(RuntimeError):
+    """Raised when diff events skip update IDs; the book needs a new snapshot."""
+
+
+def _levels(levels: Sequence[Sequence[Any]]) -> tuple[np.ndarray, np.ndarray]:
+    """Convert ``[[price, qty], …]`` (strings or numbers) to two float arrays."""
+
+    if not len(levels):
+        return np.empty(0), np.empty(0)
+    array = np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+    return array[:, 0], array[:, 1]
+
+
+def _last_wins(prices: np.ndarray, quantities: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Drop all but the last update of every price level."""
+
+    reversed_prices = prices[::-1]
+    unique, first = np.unique(reversed_prices, return_index=True)
+    return unique, quantities[::-1][first]
+
+
+def _merge(
+    prices: np.ndarray,
+    quantities: np.ndarray,
+    update_prices: np.ndarray,
+    update_quantities: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Apply level updates to an ascending side; a zero quantity removes the level."""
+
+    update_prices, update_quantities = _last_wins(update_prices, update_quantities)
+    keep = ~np.isin(prices, update_prices, assume_unique=True)
+    add = update_quantities > 0
+    merged_prices = np.concatenate((prices[keep], update_prices[add]))
+    merged_quantities = np.concatenate((quantities[keep], update_quantities[add]))
+    order = np.argsort(merged_prices, kind="stable")
+    return merged_prices[order], merged_quantities[order]
+
+
+class OrderBook:
+    """Local order book of one symbol.
+
+    Both sides are stored in ascending price order: the best bid is the last
+    bid level, the best ask the first ask level.
+
+    Args:
+        symbol: Trading pair, e.g. ``BTCUSDT``.
+        last_update_id: Update ID the book reflects.
+        bids: ``[[price, qty], …]`` bid levels in any order.
+        asks: ``[[price, qty], …]`` ask levels in any order.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        last_update_id: int,
+        bids: Sequence[Sequence[Any]] = (),
+        asks: Sequence[Sequence[Any]] = (),
+    ) -> None:
+        self.symbol = symbol.upper()
+        self.last_update_id = last_update_id
+        empty = np.empty(0)
+        self.bid_prices, self.bid_quantities = _merge(empty, empty, *_levels(bids))
+        self.ask_prices, self.ask_quantities = _merge(empty, empty, *_levels(asks))
+
+    @classmethod
+    def from_snapshot(cls, symbol: str, snapshot: dict[str, Any]) -> OrderBook:
+        """Build a book from a ``/api/v3/depth`` response."""
+
+        return cls(symbol, int(snapshot["lastUpdateId"]), snapshot["bids"], snapshot["asks"])
+
+    # ------------------------------------------------------------------
+    # Diff events
+    # ------------------------------------------------------------------
+
+    def apply_diffs(self, events: Iterable[dict[str, Any]]) -> int:
+        """Apply depth diff events in bulk.
+
+        Args:
+            events: Events in stream order with keys ``U``, ``u``, ``b`` and
+                ``a`` (Binance ``depthUpdate`` payloads).
+
+        Returns:
+            Number of events applied (stale events are skipped).
+
+        Raises:
+            OrderBookGap: If an event does not continue the book's update
+                sequence.  The book is left unchanged.
+        """
+
+        expected = self.last_update_id + 1
+        bids: list[Sequence[Any]] = []
+        asks: list[Sequence[Any]] = []
+        applied = 0
+        for event in events:
+            first, final = int(event["U"]), int(event["u"])
+            if final < expected:
+                continue
+            if first > expected:
+                raise OrderBookGap(f"{self.symbol}: expected update {expected}, got {first}-{final}")
+            bids.extend(event["b"])
+            asks.extend(event["a"])
+            expected = final + 1
+            applied += 1
+
+        if applied:
+            if bids:
+                self.bid_prices, self.bid_quantities = _merge(self.bid_prices, self.bid_quantities, *_levels(bids))
+            if asks:
+                self.ask_prices, self.ask_quantities = _merge(self.ask_prices, self.ask_quantities, *_levels(asks))
+            self.last_update_id = expected - 1
+        return applied
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    @property
+    def best_bid(self) -> float | None:  # noqa: D102
+        return float(self.bid_prices[-1]) if self.bid_prices.size else None
+
+    @property
+    def best_ask(self) -> float | None:  # noqa: D102
+        return float(self.ask_prices[0]) if self.ask_prices.size else None
+
+    @property
+    def mid(self) -> float | None:  # noqa: D102
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return (self.best_bid + self.best_ask) / 2
+
+    def depth_within(self, pcts: Sequence[float]) -> tuple[np.ndarray, np.ndarray]:
+        """Quote notional resting within ``±pct`` % of the mid price.
+
+        Returns:
+            Bid and ask notional, one entry per ``pct``.
+        """
+
+        pcts = np.asarray(pcts, dtype=np.float64)
+        mid = self.mid
+        if mid is None:
+            return np.zeros(len(pcts)), np.zeros(len(pcts))
+        bid_notional = np.concatenate(([0.0], np.cumsum((self.bid_prices * self.bid_quantities)[::-1])))
+        ask_notional = np.concatenate(([0.0], np.cumsum(self.ask_prices * self.ask_quantities)))
+        # Levels at or above the lower bound (bids) / at or below the upper bound (asks).
+        bid_levels = self.bid_prices.size - np.searchsorted(self.bid_prices, mid * (1 - pcts / 100), side="left")
+        ask_levels = np.searchsorted(self.ask_prices, mid * (1 + pcts / 100), side="right")
+        return bid_notional[bid_levels], ask_notional[ask_levels]
+
+    def slippage(self, notionals: Sequence[float], side: str = "buy") -> np.ndarray:
+        """Slippage in basis points vs. the mid of market orders of ``notionals``.
+
+        Args:
+            notionals: Quote amounts (e.g. USDT) to buy or sell.
+            side: ``buy`` walks the asks, ``sell`` the bids.
+
+        Returns:
+            Slippage per notional; ``NaN`` where the book is too thin.
+        """
+
+        notionals = np.asarray(notionals, dtype=np.float64)
+        mid = self.mid
+        if side == "buy":
+            prices, quantities = self.ask_prices, self.ask_quantities
+        elif side == "sell":
+            prices, quantities = self.bid_prices[::-1], self.bid_quantities[::-1]
+        else:
+            raise ValueError(f"Unknown side: {side}")
+        if mid is None or not prices.size:
+            return np.full(len(notionals), np.nan)
+
+        cumulative_notional = np.cumsum(prices * quantities)
+        cumulative_quantity = np.cumsum(quantities)
+        level = np.searchsorted(cumulative_notional, notionals, side="left")
+        filled = level < prices.size
+        level = np.minimum(level, prices.size - 1)
+        before_notional = np.where(level > 0, cumulative_notional[level - 1], 0.0)
+        before_quantity = np.where(level > 0, cumulative_quantity[level - 1], 0.0)
+        quantity = before_quantity + (notionals - before_notional) / prices[level]
+        average_price = notionals / quantity
+        bps = (average_price / mid - 1) * 1e4 if side == "buy" else (1 - average_price / mid) * 1e4
+        return np.where(filled, bps, np.nan)
+
+    def metrics(
+        self,
+        pcts: Sequence[float] = DEFAULT_DEPTH_PCTS,
+        notionals: Sequence[float] = DEFAULT_NOTIONALS,
+    ) -> dict[str, Any]:
+        """Spread, depth, imbalance and slippage summary of the book."""
+
+        def _num(value: float) -> float | None:
+            return None if value is None or not np.isfinite(value) else round(float(value), 6)
+
+        bid_depth, ask_depth = self.depth_within(pcts)
+        total = bid_depth + ask_depth
+        with np.errstate(invalid="ignore", divide="ignore"):
+            imbalance = np.where(total > 0, (bid_depth - ask_depth) / total, np.nan)
+        buy, sell = self.slippage(notionals, "buy"), self.slippage(notionals, "sell")
+        mid = self.mid
+        spread = self.best_ask - self.best_bid if mid is not None else None
+        return {
+            "symbol": self.symbol,
+            "last_update_id": self.last_update_id,
+            "best_bid": self.best_bid,
+            "best_ask": self.best_ask,
+            "mid": _num(mid),
+            "spread": _num(spread),
+            "spread_bps": _num(spread / mid * 1e4) if mid else None,
+            "depth": {
+                f"{pct:g}%": {"bid": _num(b), "ask": _num(a), "imbalance": _num(i)}
+                for pct, b, a, i in zip(pcts, bid_depth, ask_depth, imbalance)
+            },
+            "slippage_bps": {
+                f"{notional:.0f}": {"buy": _num(b), "sell": _num(s)} for notional, b, s in zip(notionals, buy, sell)
+            },
+        }
+
+
+# ---------------------------------------------------------------------------
+# REST snapshot
+# ---------------------------------------------------------------------------
+
+
+def fetch_depth_snapshot(symbol: str, limit: int = 1000) -> OrderBook:
+    """Fetch an order-book snapshot from Binance.
+
+    Args:
+        symbol: Trading pair, e.g. ``BTCUSDT``.
+        limit: Levels per side (5, 10, 20, 50, 100, 500, 1000 or 5000).
+
+    Raises:
+        RuntimeError: If the REST request fails or returns an error response.
+    """
+
+    try:
+        response = http.get(
+            os.getenv("BINANCE_DEPTH_URL", DEPTH_URL),
+            function="fetch_depth_snapshot",
+            params={"symbol": symbol.upper(), "limit": limit},
+            timeout=10,
+        )
+        response.raise_for_status()
+    except requests.RequestException as exc:  # pragma: no cover – network I/O
+        raise RuntimeError(f"Failed to fetch order book from Binance: {exc}") from exc
+    return OrderBook.from_snapshot(symbol, response.json())
+
+
+# ---------------------------------------------------------------------------
+# Many books
+# ---------------------------------------------------------------------------
+
+
+class OrderBookSet:
+    """Order books of many symbols fed from one (combined) diff stream.
+
+    Events of symbols without a current book (not loaded yet, or stale after
+    a gap) are buffered, up to ``buffer_limit`` per symbol, and replayed onto
+    the next snapshot by :meth:`install`, following the Binance procedure for
+    local books.
+
+    Args:
+        snapshot_limit: Levels per side requested when (re)loading a book.
+        buffer_limit: Events kept per symbol while it waits for a snapshot.
+    """
+
+    def __init__(self, snapshot_limit: int = 1000, buffer_limit: int = 10_000) -> None:
+        self.snapshot_limit = snapshot_limit
+        self.books: dict[str, OrderBook] = {}
+        self.stale: set[str] = set()
+        self.buffers: defaultdict[str, deque[dict[str, Any]]] = defaultdict(lambda: deque(maxlen=buffer_limit))
+
+    def load(self, symbol: str) -> bool:
+        """(Re)load ``symbol`` from a REST snapshot; see :meth:`install`.
+
+        Not thread-safe with :meth:`apply`: while events are being applied,
+        fetch the snapshot in a worker thread and install it from the applying
+        thread (as :func:`maintain_books` does).
+        """
+
+        return self.install(fetch_depth_snapshot(symbol, self.snapshot_limit))
+
+    def install(self, book: OrderBook) -> bool:
+        """Make a snapshot current by replaying the events buffered for its symbol.
+
+        Buffered events the snapshot already covers are dropped; the first
+        remaining one must continue it (``U <= lastUpdateId + 1 <= u``).
+
+        Returns:
+            Whether the book is current.  ``False`` means events between the
+            snapshot and the buffer are missing (the snapshot is too old); the
+            symbol stays stale and keeps buffering until the next snapshot.
+        """
+
+        symbol = book.symbol
+        buffered = list(self.buffers.pop(symbol, ()))
+        try:
+            book.apply_diffs(buffered)
+        except OrderBookGap:
+            self.buffers[symbol].extend(buffered)
+            self.stale.add(symbol)
+            return False
+        self.books[symbol] = book
+        self.stale.discard(symbol)
+        return True
+
+    def apply(self, events: Iterable[dict[str, Any]]) -> set[str]:
+        """Apply a batch of events of any symbols, grouped into one merge per book.
+
+        Events of symbols without a current book are buffered; books hit by
+        a gap are marked stale, and the batch's events of them buffered, until
+        a new snapshot is installed.
+
+        Returns:
+            Symbols that became stale in this batch.
+        """
+
+        grouped: dict[str, list[dict[str, Any]]] = defaultdict(list)
+        for event in events:
+            grouped[str(event["s"]).upper()].append(event)
+
+        gaps: set[str] = set()
+        for symbol, symbol_events in grouped.items():
+            book = self.books.get(symbol)
+            if book is None or symbol in self.stale:
+                self.buffers[symbol].extend(symbol_events)
+                continue
+            try:
+                book.apply_diffs(symbol_events)
+            except OrderBookGap:
+                gaps.add(symbol)
+                self.buffers[symbol].extend(symbol_events)
+        self.stale |= gaps
+        return gaps
+
+    def metrics(self, **kwargs: Any) -> dict[str, dict[str, Any]]:
+        """:meth:`OrderBook.metrics` of every up-to-date book."""
+
+        return {symbol: book.metrics(**kwargs) for symbol, book in self.books.items() if symbol not in self.stale}
+
+
+async def binance_depth_stream(symbols: Iterable[str], speed: str = "100ms") -> AsyncIterator[dict[str, Any]]:
+    """Yield ``depthUpdate`` events of ``symbols`` from the combined websocket stream."""
+
+    import aiohttp  # only needed for live streaming
+
+    streams = "/".join(f"{symbol.lower()}@depth@{speed}" for symbol in symbols)
+    url = f"{os.getenv('BINANCE_DEPTH_STREAM_URL', DEPTH_STREAM_URL)}?streams={streams}"
+    async with aiohttp.ClientSession() as session, session.ws_connect(url, heartbeat=30) as socket:
+        async for message in socket:
+            if message.type == aiohttp.WSMsgType.TEXT:
+                yield json.loads(message.data)["data"]
+            elif message.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                break
+
+
+async def maintain_books(
+    books: OrderBookSet,
+    events: AsyncIterator[dict[str, Any]],
+    symbols: Iterable[str] = (),
+    max_batch: int = 5000,
+    reload_backoff: float = 1.0,
+    max_reload_backoff: float = 60.0,
+) -> None:
+    """Keep ``books`` up to date from an event source until it is exhausted.
+
+    Events are buffered while a batch is applied and then applied together,
+    so the per-event cost shrinks as the event rate grows.  The books of
+    ``symbols`` are loaded once the first events arrived, as Binance requires;
+    books that hit a gap are reloaded.  Snapshots are fetched in worker threads
+    by separate tasks, so the stream keeps being applied to the other books,
+    and installed with :meth:`OrderBookSet.install`.
+
+    A failed reload – the request failed, or the snapshot is older than the
+    buffered events – leaves the book stale; it is retried after
+    ``reload_backoff`` seconds, doubling per consecutive failure up to
+    ``max_reload_backoff``.  Reloads still running when the stream ends are
+    awaited.
+    """
+
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    loop = asyncio.get_running_loop()
+    failures: defaultdict[str, int] = defaultdict(int)
+    retry_at: dict[str, float] = {}
+    reloading: dict[str, asyncio.Task] = {}
+    books.stale.update(symbol.upper() for symbol in symbols if symbol.upper() not in books.books)
+
+    async def _pump() -> None:
+        try:
+            async for event in events:
+                queue.put_nowait(event)
+        finally:
+            queue.put_nowait(done)
+
+    async def _reload(symbol: str) -> None:
+        try:
+            book = await asyncio.to_thread(fetch_depth_snapshot, symbol, books.snapshot_limit)
+            error = None if books.install(book) else "the snapshot is older than the buffered events"
+        except Exception as exc:  # noqa: BLE001 – the book stays stale until a retry succeeds
+            error = str(exc)
+        finally:
+            reloading.pop(symbol, None)
+        if error is None:
+            failures.pop(symbol, None)
+            retry_at.pop(symbol, None)
+            return
+        failures[symbol] += 1
+        delay = min(max_reload_backoff, reload_backoff * 2 ** (failures[symbol] - 1))
+        retry_at[symbol] = loop.time() + delay
+        print(f"Reloading the {symbol} order book failed, retrying in {delay:g}s: {error}")
+
+    pump = asyncio.create_task(_pump())
+    try:
+        finished = False
+        while not finished:
+            batch = [await queue.get()]
+            while not queue.empty() and len(batch) < max_batch:
+                batch.append(queue.get_nowait())
+            if batch[-1] is done:
+                batch.pop()
+                finished = True
+            books.apply(batch)
+            for symbol in books.stale - reloading.keys():
+                if loop.time() >= retry_at.get(symbol, 0.0):
+                    reloading[symbol] = asyncio.create_task(_reload(symbol))
+        if reloading:
+            await asyncio.gather(*reloading.values())
+    finally:
+        pump.cancel()
+        for task in list(reloading.values()):
+            task.cancel()
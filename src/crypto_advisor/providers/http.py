@@ -0,0 +1,82 @@
+"""Instrumented HTTP access shared by all providers.
+
+Every upstream request goes through :func:`get`, which records its latency in
+the ``crypto_advisor_provider_request_duration_seconds`` histogram labelled by
+provider function, upstream host and HTTP status (``error`` when no response
+was received), and as an ``http`` span of the current request trace.
+
+Requests share one pooled :class:`requests.Session`, so TCP and TLS
+connections to each upstream host are reused; :func:`prime` opens them ahead
+of the first real request.
+
+When a cassette is configured (see :mod:`crypto_advisor.providers.cassette`),
+responses are recorded to or replayed from it here.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from crypto_advisor import tracing
+from crypto_advisor.metrics import PROVIDER_SECONDS
+from crypto_advisor.providers.cassette import REPLAY, active_cassette
+
+# Connections kept per upstream host; matches the provider admission limit.
+POOL_SIZE = 16
+
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+_session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE))
+
+
+def get(url: str, *, function: str, **kwargs: Any) -> requests.Response:
+    """Perform a pooled ``GET`` request and record its duration.
+
+    Args:
+        url: Upstream URL.
+        function: Name of the calling provider function, used as a label.
+        **kwargs: Passed through to :meth:`requests.Session.get`.
+    """
+
+    host = urlsplit(url).hostname or "unknown"
+    cassette = active_cassette()
+    status = "error"
+    started = time.perf_counter()
+    with tracing.span(f"http:{function}", "http", host=host) as attributes:
+        try:
+            if cassette is not None and cassette.mode == REPLAY:
+                response = cassette.replay(function, url, kwargs.get("params"))
+            else:
+                response = _session.get(url, **kwargs)
+                if cassette is not None:
+                    cassette.record(function, url, kwargs.get("params"), response, time.perf_counter() - started)
+            status = str(response.status_code)
+            return response
+        finally:
+            attributes["status"] = status
+            PROVIDER_SECONDS.observe(time.perf_counter() - started, function=function, host=host, status=status)
+
+
+def prime(url: str, timeout: float = 5.0) -> bool:
+    """Open a pooled connection to the host of ``url``.
+
+    Any response, including an error status, leaves a warm connection behind.
+    Nothing is opened while replaying from a cassette.
+
+    Returns:
+        ``False`` if the host could not be reached.
+    """
+
+    cassette = active_cassette()
+    if cassette is not None and cassette.mode == REPLAY:
+        return True
+    try:
+        _session.head(url, timeout=timeout, allow_redirects=False)
+    except requests.RequestException:
+        return False
+    return True
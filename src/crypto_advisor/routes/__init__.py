@@ -0,0 +1,5 @@
+"""
+HTTP route modules.
+
+This package contains FastAPI routers mounted by ``crypto_advisor.server``.
+"""
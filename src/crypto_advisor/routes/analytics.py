@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+"""LLM-free analytics endpoints.
+
+These routes expose the raw numbers behind the advisor workflows – indicators,
+volatility index, candlestick patterns, dominance, sentiment, global market
+metrics, cross-asset correlation and order-book liquidity – without involving
+the LLM.  Candle-based endpoints accept several symbols at once
+(``?symbols=ETHUSDT,BTCUSDT``); symbols are processed concurrently and
+per-symbol failures are reported under ``errors`` instead of failing the whole
+request.  Every upstream call holds its own slot of the provider
+:mod:`admission <crypto_advisor.admission>` controller, so its limit counts
+upstream calls (and worker threads), not requests; if any call of a request
+is rejected, the request is answered with the rejection.  Responses are
+encoded with :class:`~crypto_advisor.utils.fastjson.FastJSONResponse`.
+"""
+
+import asyncio
+from typing import Any, Callable
+
+from fastapi import APIRouter, HTTPException, Query
+
+from crypto_advisor import profiling
+from crypto_advisor.admission import AdmissionRejected, provider_admission
+from crypto_advisor.providers.binance import INTERVAL_SECONDS, fetch_binance_chart
+from crypto_advisor.providers.coinmarketcap import (
+    fetch_altcoin_dominance,
+    fetch_coinmarketcap_global_data,
+    fetch_fear_greed_index,
+)
+from crypto_advisor.providers.depth import fetch_depth_snapshot
+from crypto_advisor.services import ta_pool
+from crypto_advisor.services.correlation import DEFAULT_WINDOW, MAX_HISTORY, correlation_report
+from crypto_advisor.utils.fastjson import FastJSONResponse
+
+MAX_SYMBOLS = 50
+MAX_CORRELATION_SYMBOLS = 300
+
+router = APIRouter(prefix="/analytics", tags=["analytics"], default_response_class=FastJSONResponse)
+
+_SYMBOLS_QUERY = Query("ETHUSDT", description="Comma-separated trading pairs, e.g. ETHUSDT,BTCUSDT.")
+_INTERVAL_QUERY = Query("4h", description="Candlestick interval, e.g. 1h, 4h, 1d.")
+_LIMIT_QUERY = Query(100, ge=30, le=1000, description="Number of candles to analyse.")
+
+
+def parse_symbols(symbols: str, max_symbols: int = MAX_SYMBOLS) -> list[str]:
+    """Split, normalise and de-duplicate a comma-separated symbol list.
+
+    Raises:
+        HTTPException: If the list is empty or exceeds ``max_symbols``.
+    """
+
+    parsed = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not parsed:
+        raise HTTPException(status_code=400, detail="At least one symbol is required.")
+    if len(parsed) > max_symbols:
+        raise HTTPException(status_code=400, detail=f"At most {max_symbols} symbols per request.")
+    return parsed
+
+
+def _check_interval(interval: str) -> None:
+    if interval not in INTERVAL_SECONDS:
+        raise HTTPException(status_code=400, detail=f"Unsupported interval: {interval}")
+
+
+async def _admitted(func: Callable[..., Any], *args: Any) -> Any:
+    """Run ``func`` in a worker thread while holding a provider slot."""
+
+    async with provider_admission.slot():
+        return await profiling.to_thread(func, *args)
+
+
+async def _gather_admitted(func: Callable[..., Any], symbols: list[str], *args: Any) -> list[Any]:
+    """``func(symbol, *args)`` for every symbol, each admitted on its own.
+
+    Raises:
+        AdmissionRejected: If any call was rejected.
+    """
+
+    outcomes = await asyncio.gather(*(_admitted(func, symbol, *args) for symbol in symbols), return_exceptions=True)
+    for outcome in outcomes:
+        if isinstance(outcome, AdmissionRejected):
+            raise outcome
+    return outcomes
+
+
+async def _per_symbol(
+    symbols: list[str],
+    interval: str,
+    limit: int,
+    compute: Callable[[list[dict]], Any],
+) -> dict[str, Any]:
+    """Fetch candles and run ``compute`` for every symbol concurrently."""
+
+    def _one(symbol: str) -> Any:
+        return compute(fetch_binance_chart(symbol, interval, limit))
+
+    outcomes = await _gather_admitted(_one, symbols)
+    results: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    for symbol, outcome in zip(symbols, outcomes):
+        if isinstance(outcome, Exception):
+            errors[symbol] = str(outcome)
+        else:
+            results[symbol] = outcome
+    return {"interval": interval, "limit": limit, "results": results, "errors": errors}
+
+
+# ---------------------------------------------------------------------------
+# Candle-based analytics
+# ---------------------------------------------------------------------------
+
+
+@router.get("/indicators")
+async def indicators_endpoint(
+    symbols: str = _SYMBOLS_QUERY,
+    interval: str = _INTERVAL_QUERY,
+    limit: int = _LIMIT_QUERY,
+) -> FastJSONResponse:
+    """Latest trend, momentum, volatility and volume indicators per symbol."""
+
+    _check_interval(interval)
+    payload = await _per_symbol(
+        parse_symbols(symbols),
+        interval,
+        limit,
+        lambda candles: ta_pool.perform_technical_analysis(candles)["latest_indicators"],
+    )
+    return FastJSONResponse(payload)
+
+
+@router.get("/volatility")
+async def volatility_endpoint(
+    symbols: str = _SYMBOLS_QUERY,
+    interval: str = _INTERVAL_QUERY,
+    limit: int = _LIMIT_QUERY,
+) -> FastJSONResponse:
+    """Volatility index (0-5) with component scores per symbol."""
+
+    _check_interval(interval)
+    payload = await _per_symbol(parse_symbols(symbols), interval, limit, ta_pool.calculate_volatility_index)
+    return FastJSONResponse(payload)
+
+
+@router.get("/patterns")
+async def patterns_endpoint(
+    symbols: str = _SYMBOLS_QUERY,
+    interval: str = _INTERVAL_QUERY,
+    limit: int = _LIMIT_QUERY,
+) -> FastJSONResponse:
+    """Candlestick patterns detected in the last three candles per symbol."""
+
+    _check_interval(interval)
+    payload = await _per_symbol(
+        parse_symbols(symbols),
+        interval,
+        limit,
+        lambda candles: ta_pool.detect_selected_patterns(candles)["detected_patterns"],
+    )
+    return FastJSONResponse(payload)
+
+
+@router.get("/correlation")
+async def correlation_endpoint(
+    symbols: str = Query(
+        "BTCUSDT,ETHUSDT,SOLUSDT,BNBUSDT",
+        description=f"Comma-separated trading pairs (at most {MAX_CORRELATION_SYMBOLS}); BTCUSDT is always included.",
+    ),
+    interval: str = Query("1h", description="Candlestick interval, e.g. 1h, 4h, 1d."),
+    limit: int = Query(200, ge=30, le=1000, description="Candles fetched per symbol."),
+    window: int = Query(DEFAULT_WINDOW, ge=10, le=720, description="Returns per rolling window."),
+    history: int = Query(0, ge=0, le=MAX_HISTORY, description="Past beta vectors to include."),
+    matrix: bool = Query(True, description="Include the full N×N correlation matrix."),
+) -> FastJSONResponse:
+    """Rolling correlation matrix and beta to BTC of closed-candle log returns."""
+
+    _check_interval(interval)
+    if limit <= window:
+        raise HTTPException(status_code=400, detail=f"limit ({limit}) must exceed window ({window}).")
+    parsed = parse_symbols(symbols, MAX_CORRELATION_SYMBOLS)
+    async with provider_admission.slot():
+        try:
+            report = await profiling.to_thread(
+                correlation_report, parsed, interval, limit, window, history=history, matrix=matrix
+            )
+        except ValueError as exc:  # too little data for the requested window
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        except Exception as exc:  # upstream failure
+            raise HTTPException(status_code=502, detail=str(exc)) from exc
+    return FastJSONResponse({"interval": interval, "limit": limit, **report})
+
+
+@router.get("/depth")
+async def depth_endpoint(
+    symbols: str = _SYMBOLS_QUERY,
+    limit: int = Query(1000, ge=5, le=5000, description="Order-book levels per side."),
+) -> FastJSONResponse:
+    """Spread, depth within ±x %, imbalance and slippage estimates per symbol."""
+
+    parsed = parse_symbols(symbols)
+    outcomes = await _gather_admitted(fetch_depth_snapshot, parsed, limit)
+    results: dict[str, Any] = {}
+    errors: dict[str, str] = {}
+    for symbol, outcome in zip(parsed, outcomes):
+        if isinstance(outcome, Exception):
+            errors[symbol] = str(outcome)
+        else:
+            results[symbol] = outcome.metrics()
+    return FastJSONResponse({"limit": limit, "results": results, "errors": errors})
+
+
+# ---------------------------------------------------------------------------
+# Market-wide analytics
+# ---------------------------------------------------------------------------
+
+
+async def _market(fetch: Callable[..., dict], *args: Any) -> FastJSONResponse:
+    async with provider_admission.slot():
+        try:
+            return FastJSONResponse(await profiling.to_thread(fetch, *args))
+        except Exception as exc:  # pragma: no cover – upstream failure
+            raise HTTPException(status_code=502, detail=str(exc)) from exc
+
+
+@router.get("/dominance")
+async def dominance_endpoint(days: int = Query(30, ge=1, le=365)) -> FastJSONResponse:
+    """Bitcoin vs altcoin dominance history and capital-flow analysis."""
+
+    return await _market(fetch_altcoin_dominance, days)
+
+
+@router.get("/sentiment")
+async def sentiment_endpoint(days: int = Query(30, ge=1, le=365)) -> FastJSONResponse:
+    """Fear & Greed Index history and trend."""
+
+    return await _market(fetch_fear_greed_index, days)
+
+
+@router.get("/global")
+async def global_metrics_endpoint() -> FastJSONResponse:
+    """Latest total market cap, volume and BTC/ETH dominance."""
+
+    return await _market(fetch_coinmarketcap_global_data)
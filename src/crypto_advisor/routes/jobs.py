@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+"""Asynchronous job endpoints for the LLM workflows.
+
+``POST /jobs/market-overview`` and ``POST /jobs/technical-analysis`` start an
+analysis in the background and answer ``202 Accepted`` with a job ID at once.
+``GET /jobs/{job_id}`` returns the job state; with ``?wait=N`` it long-polls
+for up to ``N`` seconds until the result is ready.  Identical submissions
+while a job is in progress share that job (see
+:mod:`crypto_advisor.services.jobs`).
+"""
+
+import asyncio
+from typing import Any, Callable, Mapping, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Response
+from pydantic import BaseModel
+
+from crypto_advisor.admission import llm_admission
+from crypto_advisor.services.jobs import Job, JobManager, build_job_store, job_ttl
+from crypto_advisor.workflows import get_market_overview_app, get_technical_analysis_app
+
+MAX_WAIT_SECONDS = 60
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+_WORKFLOWS: dict[str, Callable[..., Any]] = {
+    "market_overview": get_market_overview_app,
+    "technical_analysis": get_technical_analysis_app,
+}
+
+
+class JobResponse(BaseModel):
+    """Public view of a background analysis job."""
+
+    job_id: str
+    workflow: str
+    params: dict[str, Any]
+    status: str
+    deduplicated: bool = False
+    message: Optional[str] = None
+    error: Optional[str] = None
+    created_at: float
+    finished_at: Optional[float] = None
+
+
+def _to_response(job: Job, deduplicated: bool = False) -> JobResponse:
+    return JobResponse(
+        job_id=job.job_id,
+        workflow=job.workflow,
+        params=job.params,
+        status=job.status,
+        deduplicated=deduplicated,
+        message=job.message,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def run_workflow(workflow: str, params: Mapping[str, Any]) -> str:
+    """Execute a workflow in a worker thread once an LLM admission slot is free.
+
+    Accepted jobs wait for capacity instead of failing when the queue is full.
+    """
+
+    app_callable = _WORKFLOWS[workflow](**params)
+    async with llm_admission.slot(background=True):
+        result = await asyncio.to_thread(app_callable.invoke, {})
+    return result["messages"][-1].content
+
+
+_manager: JobManager | None = None
+
+
+def get_job_manager() -> JobManager:
+    """Return the lazily created process-wide job manager."""
+
+    global _manager  # noqa: PLW0603
+    if _manager is None:
+        _manager = JobManager(build_job_store(), run_workflow, ttl=job_ttl())
+    return _manager
+
+
+def _submit(workflow: str, params: dict[str, Any], response: Response) -> JobResponse:
+    job, created = get_job_manager().submit(workflow, params)
+    response.status_code = 202
+    response.headers["Location"] = f"{router.prefix}/{job.job_id}"
+    return _to_response(job, deduplicated=not created)
+
+
+@router.post("/market-overview", response_model=JobResponse, status_code=202)
+async def submit_market_overview(response: Response, days: int = 60) -> JobResponse:
+    """Start a market overview job."""
+
+    return _submit("market_overview", {"days": days}, response)
+
+
+@router.post("/technical-analysis", response_model=JobResponse, status_code=202)
+async def submit_technical_analysis(response: Response, symbol: str = "ETHUSDT") -> JobResponse:
+    """Start a technical analysis job."""
+
+    return _submit("technical_analysis", {"symbol": symbol.strip().upper()}, response)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    wait: float = Query(0, ge=0, le=MAX_WAIT_SECONDS, description="Seconds to long-poll for the result."),
+) -> JobResponse:
+    """Return the state of a job, optionally waiting for it to finish."""
+
+    job = await get_job_manager().wait(job_id, wait)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown or expired job: {job_id}")
+    return _to_response(job)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+"""Precomputed advisor reports for the watchlist.
+
+The server's lifespan handler runs :func:`get_precomputer` in the background
+when ``CRYPTO_ADVISOR_PRECOMPUTE_SYMBOLS`` or ``CRYPTO_ADVISOR_PRECOMPUTE_MARKET``
+is set (see :mod:`crypto_advisor.services.precompute`).  Technical analyses
+are refreshed after every ``TA_INTERVAL`` close, the market overview after
+every ``MARKET_SNAPSHOT_INTERVAL`` close; runs go through
+:func:`~crypto_advisor.routes.jobs.run_workflow` and so hold an LLM
+admission slot.  ``GET /precompute`` shows the schedule.
+
+With several uvicorn workers each runs its own scheduler; with
+``CRYPTO_ADVISOR_RESPONSE_CACHE=shared`` only the first of them per close
+calls the LLM.
+"""
+
+from typing import Any, Mapping
+
+from fastapi import APIRouter
+
+from crypto_advisor.metrics import CACHE_LOOKUPS
+from crypto_advisor.routes.jobs import run_workflow
+from crypto_advisor.services.precompute import (
+    MARKET_OVERVIEW,
+    TECHNICAL_ANALYSIS,
+    PrecomputedReport,
+    Precomputer,
+    ScheduledReport,
+    build_precomputer,
+    precompute_market,
+    precompute_symbols,
+)
+from crypto_advisor.workflows import MARKET_SNAPSHOT_INTERVAL, TA_INTERVAL
+
+router = APIRouter(tags=["ops"])
+
+_INTERVALS = {MARKET_OVERVIEW: MARKET_SNAPSHOT_INTERVAL, TECHNICAL_ANALYSIS: TA_INTERVAL}
+
+
+def report_params(workflow: str, *, symbol: str = "ETHUSDT", days: int = 60) -> dict[str, Any]:
+    """Parameters identifying a report, as submitted by the endpoints."""
+
+    if workflow == TECHNICAL_ANALYSIS:
+        return {"symbol": symbol.strip().upper()}
+    return {"days": days}
+
+
+def watchlist_schedule() -> list[ScheduledReport]:
+    """Reports configured through the environment."""
+
+    schedule = []
+    if precompute_market():
+        schedule.append(ScheduledReport(MARKET_OVERVIEW, report_params(MARKET_OVERVIEW), MARKET_SNAPSHOT_INTERVAL))
+    for symbol in precompute_symbols():
+        params = report_params(TECHNICAL_ANALYSIS, symbol=symbol)
+        schedule.append(ScheduledReport(TECHNICAL_ANALYSIS, params, TA_INTERVAL))
+    return schedule
+
+
+_precomputer: Precomputer | None = None
+
+
+def get_precomputer() -> Precomputer:
+    """Return the lazily created process-wide precomputer."""
+
+    global _precomputer  # noqa: PLW0603
+    if _precomputer is None:
+        _precomputer = build_precomputer(watchlist_schedule(), run_workflow)
+    return _precomputer
+
+
+def fresh_report(workflow: str, params: Mapping[str, Any]) -> PrecomputedReport | None:
+    """Fresh precomputed report answering a request, if there is one."""
+
+    precomputer = get_precomputer()
+    if not precomputer.scheduled(workflow, params):
+        return None
+    report = precomputer.fresh(workflow, params, _INTERVALS[workflow])
+    CACHE_LOOKUPS.inc(cache="precomputed", result="hit" if report is not None else "miss")
+    return report
+
+
+@router.get("/precompute")
+async def precompute_endpoint() -> list[dict[str, Any]]:
+    """Scheduled reports with their freshness, last run and next run."""
+
+    return get_precomputer().status()
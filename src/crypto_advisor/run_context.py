@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+"""Per-run context shared between the ``agent`` node and the agent tools.
+
+The workflow graphs fetch candles and compute indicators, volatility, market
+metrics and sentiment *before* the agent runs.  The agent node publishes that
+state through :func:`run_scope`; tools consult :func:`current_run` and answer
+from it when the requested data is already available, instead of hitting the
+network or recomputing technical analysis a second time.
+
+The context also memoizes agent tool calls: a tool invoked twice with the
+same (normalised) arguments within one run returns the first result.
+
+Candle series are kept server-side as *datasets*: the chart tool registers
+its candles and hands the model a short handle (``ETHUSDT:4h:100``) plus a
+:func:`candle_summary`; the analysis tools resolve the handle again.  The
+model therefore never has to echo thousands of OHLCV values back as tool
+arguments.
+
+The context lives in a :class:`contextvars.ContextVar`, so concurrent graph
+invocations (threads or tasks) never observe each other's data.
+"""
+
+import contextvars
+import hashlib
+import json
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Iterator, Mapping
+
+from crypto_advisor.metrics import CACHE_LOOKUPS
+
+_current_run: contextvars.ContextVar[RunContext | None] = contextvars.ContextVar("crypto_advisor_run", default=None)
+
+
+def _time_key(value: Any) -> str:
+    """Normalise candle times that may come back from the LLM as strings."""
+
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value))
+        except ValueError:
+            return str(value)
+    return value.isoformat()
+
+
+def _normalise_argument(value: Any) -> Any:
+    """Map equivalent tool arguments onto the same JSON-able value."""
+
+    if hasattr(value, "model_dump"):
+        value = value.model_dump()
+    elif hasattr(value, "dict") and not isinstance(value, Mapping):
+        value = value.dict()
+    if isinstance(value, Mapping):
+        return {
+            str(k): str(v).strip().upper() if k == "symbol" else _normalise_argument(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalise_argument(v) for v in value]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def tool_call_key(name: str, args: tuple[Any, ...], kwargs: Mapping[str, Any]) -> str:
+    """Return a stable memoization key for a tool call."""
+
+    payload = json.dumps(
+        [name, _normalise_argument(list(args)), _normalise_argument(kwargs)],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def candle_summary(candles: list[dict]) -> dict[str, Any]:
+    """Small overview of a candle series for the LLM."""
+
+    first_close = float(candles[0]["close"])
+    last_close = float(candles[-1]["close"])
+    return {
+        "count": len(candles),
+        "first_time": candles[0]["time"],
+        "last_time": candles[-1]["time"],
+        "last_close": candles[-1]["close"],
+        "period_high": max(candle["high"] for candle in candles),
+        "period_low": min(candle["low"] for candle in candles),
+        "change_pct": round((last_close / first_close - 1) * 100, 2) if first_close else None,
+    }
+
+
+@dataclass
+class RunContext:
+    """Precomputed data available to tools during a single graph invocation.
+
+    Attributes:
+        state: Snapshot of the ``GraphState`` produced by the data nodes.
+        params: Workflow parameters (``symbol``, ``interval``, ``limit``,
+            ``days``) describing what ``state`` was fetched for.
+        tool_results: Memoized tool results keyed by :func:`tool_call_key`.
+        tool_calls: Number of tool invocations during the run.
+        deduplicated_calls: Invocations answered from ``tool_results``.
+        datasets: Candle series registered during the run, keyed by handle.
+    """
+
+    state: Mapping[str, Any] = field(default_factory=dict)
+    params: Mapping[str, Any] = field(default_factory=dict)
+    tool_results: dict[str, Any] = field(default_factory=dict)
+    tool_calls: int = 0
+    deduplicated_calls: int = 0
+    datasets: dict[str, list[dict]] = field(default_factory=dict)
+
+    def memoized(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the result stored under ``key``, computing it on first use."""
+
+        self.tool_calls += 1
+        if key in self.tool_results:
+            self.deduplicated_calls += 1
+            CACHE_LOOKUPS.inc(cache="tool_memo", result="hit")
+            return self.tool_results[key]
+        CACHE_LOOKUPS.inc(cache="tool_memo", result="miss")
+        result = compute()
+        self.tool_results[key] = result
+        return result
+
+    def candles_for(self, symbol: str, interval: str, limit: int) -> list[dict] | None:
+        """Return precomputed candles if they cover the requested chart."""
+
+        candles = self.state.get("candles")
+        if not candles:
+            return None
+        if str(self.params.get("symbol", "")).upper() != symbol.upper():
+            return None
+        if self.params.get("interval") != interval or limit > len(candles):
+            return None
+        return candles[-limit:]
+
+    def matches_candles(self, candles: list[dict]) -> bool:
+        """Whether ``candles`` are the precomputed candles (possibly re-serialised)."""
+
+        own = self.state.get("candles")
+        if not own or not candles or len(own) != len(candles):
+            return False
+        for ours, theirs in ((own[0], candles[0]), (own[-1], candles[-1])):
+            if _time_key(ours["time"]) != _time_key(theirs.get("time")):
+                return False
+            try:
+                if abs(float(ours["close"]) - float(theirs.get("close"))) > 1e-9 * max(1.0, abs(ours["close"])):
+                    return False
+            except (TypeError, ValueError):
+                return False
+        return True
+
+    def register_dataset(self, symbol: str, interval: str, candles: list[dict]) -> str:
+        """Store ``candles`` for the rest of the run and return their handle."""
+
+        handle = f"{symbol.strip().upper()}:{interval}:{len(candles)}"
+        self.datasets[handle] = candles
+        return handle
+
+    def dataset(self, handle: str) -> list[dict] | None:
+        """Return the candles registered under ``handle``, if any."""
+
+        return self.datasets.get(handle.strip())
+
+    def state_dataset(self) -> str | None:
+        """Register the precomputed candles (if any) and return their handle."""
+
+        candles = self.state.get("candles")
+        if not candles or not self.params.get("symbol") or not self.params.get("interval"):
+            return None
+        return self.register_dataset(str(self.params["symbol"]), str(self.params["interval"]), candles)
+
+    def for_days(self, key: str, days: int) -> Any | None:
+        """Return ``state[key]`` if it was fetched for the same look-back window."""
+
+        if self.params.get("days") != days:
+            return None
+        return self.state.get(key)
+
+
+@contextmanager
+def run_scope(state: Mapping[str, Any], params: Mapping[str, Any]) -> Iterator[RunContext]:
+    """Publish ``state`` to tools for the duration of the ``with`` block."""
+
+    run = RunContext(state=state, params=params)
+    token = _current_run.set(run)
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+
+
+def current_run() -> RunContext | None:
+    """Return the active :class:`RunContext`, if any."""
+
+    return _current_run.get()
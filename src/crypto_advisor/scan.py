@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+"""Watchlist scanning without the agent.
+
+``crypto-advisor scan`` ranks a whole watchlist in seconds instead of running
+one agent per pair:
+
+1. candles for all symbols are fetched concurrently in a thread pool (I/O);
+2. indicators, volatility index and candlestick patterns are computed per
+   symbol in a process pool (CPU bound, pandas/TA code holds the GIL);
+3. symbols are ranked by :func:`score` and printed as a table;
+4. optionally, a single LLM call summarises only the top ``N`` rows.
+"""
+
+import contextlib
+import io
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+from crypto_advisor.providers.binance import fetch_binance_chart
+from crypto_advisor.services import ta_service
+from crypto_advisor.utils.compact import serialize_for_llm
+
+DEFAULT_FETCH_CONCURRENCY = 16
+
+
+@dataclass
+class ScanResult:
+    """Scan outcome for one symbol."""
+
+    symbol: str
+    close: float | None = None
+    rsi: float | None = None
+    volatility_index: float | None = None
+    volatility_category: str | None = None
+    # Pattern name -> signal of the most recent detection (+ bullish, - bearish).
+    patterns: dict[str, float] = field(default_factory=dict)
+    score: float = 0.0
+    error: str | None = None
+
+
+def load_watchlist(source: str) -> list[str]:
+    """Read symbols from a file (one per line, ``#`` comments) or a comma list."""
+
+    try:
+        text = Path(source).read_text()
+    except OSError:  # not a readable file (or a name too long to be one)
+        text = source
+    symbols: list[str] = []
+    for line in text.splitlines():
+        line = line.split("#", 1)[0]
+        symbols.extend(part.strip().upper() for part in line.split(",") if part.strip())
+    return list(dict.fromkeys(symbols))
+
+
+def _finite(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def score(result: ScanResult) -> float:
+    """Rank score: volatility index (0-5) + RSI extremity (0-5) + one per pattern.
+
+    RSI extremity is ``|RSI - 50| / 10``, i.e. 2 at 30/70 and 5 at 0/100.
+    """
+
+    rsi_extremity = abs(result.rsi - 50) / 10 if result.rsi is not None else 0.0
+    return round((result.volatility_index or 0.0) + rsi_extremity + len(result.patterns), 2)
+
+
+def analyse_symbol(symbol: str, candles: list[dict]) -> ScanResult:
+    """Compute indicators, volatility and patterns for one symbol.
+
+    Runs in a worker process; progress prints of ``ta_service`` are
+    suppressed.
+    """
+
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            indicators = ta_service.perform_technical_analysis(candles)["latest_indicators"]
+            volatility = ta_service.calculate_volatility_index(candles)
+            detected = ta_service.detect_selected_patterns(candles)["detected_patterns"]
+    except Exception as exc:  # noqa: BLE001 – reported per symbol
+        return ScanResult(symbol=symbol, error=str(exc))
+
+    patterns = {name: float(list(signals.values())[-1]) for name, signals in detected.items() if signals}
+    result = ScanResult(
+        symbol=symbol,
+        close=_finite(candles[-1]["close"]),
+        rsi=_finite(indicators.get("RSI")),
+        volatility_index=_finite(volatility.get("volatility_index")),
+        volatility_category=volatility.get("volatility_category"),
+        patterns=patterns,
+    )
+    result.score = score(result)
+    return result
+
+
+def _analyse(item: tuple[str, list[dict]]) -> ScanResult:
+    return analyse_symbol(*item)
+
+
+def fetch_watchlist(
+    symbols: Iterable[str],
+    interval: str,
+    limit: int,
+    concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+) -> tuple[dict[str, list[dict]], dict[str, str]]:
+    """Fetch candles for all symbols concurrently.
+
+    Returns:
+        Candles per symbol and fetch errors per symbol.
+    """
+
+    symbols = list(symbols)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {symbol: pool.submit(fetch_binance_chart, symbol, interval, limit) for symbol in symbols}
+    candles: dict[str, list[dict]] = {}
+    errors: dict[str, str] = {}
+    for symbol, future in futures.items():
+        try:
+            candles[symbol] = future.result()
+        except Exception as exc:  # noqa: BLE001 – reported per symbol
+            errors[symbol] = str(exc)
+    return candles, errors
+
+
+def scan(
+    symbols: Iterable[str],
+    interval: str = "4h",
+    limit: int = 100,
+    workers: int | None = None,
+    fetch_concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+) -> list[ScanResult]:
+    """Fetch, analyse and rank ``symbols``; failed symbols sort last."""
+
+    candles, fetch_errors = fetch_watchlist(symbols, interval, limit, fetch_concurrency)
+    results = [ScanResult(symbol=symbol, error=error) for symbol, error in fetch_errors.items()]
+    if candles:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(candles) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results.extend(pool.map(_analyse, candles.items(), chunksize=chunksize))
+    return rank(results)
+
+
+def rank(results: Iterable[ScanResult]) -> list[ScanResult]:
+    """Sort by descending score; errors last, ties by symbol."""
+
+    return sorted(results, key=lambda r: (r.error is not None, -r.score, r.symbol))
+
+
+def _fmt(value: float | None, digits: int = 2) -> str:
+    return "-" if value is None else f"{value:.{digits}f}"
+
+
+def format_table(results: list[ScanResult]) -> str:
+    """Render ranked results as a fixed-width text table."""
+
+    header = f"{'#':>3}  {'symbol':<12} {'close':>12} {'RSI':>6} {'vol':>4} {'category':<10} {'score':>6}  patterns"
+    lines = [header, "-" * len(header)]
+    for position, result in enumerate(results, start=1):
+        if result.error is not None:
+            lines.append(f"{position:>3}  {result.symbol:<12} error: {result.error}")
+            continue
+        patterns = " ".join(f"{name}({'+' if signal > 0 else '-'})" for name, signal in result.patterns.items())
+        lines.append(
+            f"{position:>3}  {result.symbol:<12} {_fmt(result.close, 4):>12} {_fmt(result.rsi, 1):>6} "
+            f"{_fmt(result.volatility_index, 1):>4} {result.volatility_category or '-':<10} "
+            f"{result.score:>6.2f}  {patterns}"
+        )
+    return "\n".join(lines)
+
+
+def summarize_top(results: list[ScanResult], top: int) -> str:
+    """Ask the LLM for a short commentary on the ``top`` ranked symbols."""
+
+    from crypto_advisor.agent import create_llm  # only needed when summarising
+
+    rows = [asdict(result) for result in results if result.error is None][:top]
+    prompt = (
+        "You are a cryptocurrency market analyst. The following pairs ranked highest in a "
+        "watchlist scan by volatility index, RSI extremes and recent candlestick patterns "
+        "(positive pattern signal = bullish, negative = bearish). For each pair give one or two "
+        "sentences on what stands out and what to watch, then a one-line overall takeaway.\n"
+        f"{serialize_for_llm(rows, 'scan_results').text}"
+    )
+    return str(create_llm().invoke(prompt).content)
@@ -3,15 +3,30 @@ from __future__ import annotations
 """FastAPI application exposing Crypto Advisor workflows via HTTP endpoints."""
 
 import asyncio
-from typing import Any
+import time
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal, Union
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 
+from crypto_advisor.admission import AdmissionRejected, AdmittedStreamingResponse, admission_stats, llm_admission
+from crypto_advisor import fast_path, profiling, tracing
 from crypto_advisor.agent import load_environment
+from crypto_advisor.metrics import CONTENT_TYPE, REGISTRY
+from crypto_advisor.routes import analytics, jobs, precompute
+from crypto_advisor.services import ta_pool
+from crypto_advisor.streaming import stream_workflow_events
+from crypto_advisor.utils.http_cache import CacheValidators, candle_validators, not_modified
+from crypto_advisor.warmup import READY, WarmupReport, warm_up, warmup_enabled
 from crypto_advisor.workflows import (
-    build_market_overview_app,
-    build_technical_analysis_app,
+    MARKET_SNAPSHOT_INTERVAL,
+    TA_INTERVAL,
+    get_batch_technical_analysis_app,
+    get_market_overview_app,
+    get_technical_analysis_app,
 )
 
 # ---------------------------------------------------------------------------
@@ -25,39 +40,309 @@ class AdvisorResponse(BaseModel):
     message: str
 
 
+class SymbolAnalysisResponse(BaseModel):
+    """Analysis of one pair in a batch; ``source`` is ``llm`` or ``fallback``."""
+
+    symbol: str
+    outlook: str
+    summary: str
+    recommendation: str
+    source: str
+
+
+class BatchAnalysisResponse(BaseModel):
+    """Per-symbol analyses, symbols that failed and the model calls spent."""
+
+    analyses: list[SymbolAnalysisResponse]
+    errors: dict[str, str]
+    llm_calls: int
+
+
 # ---------------------------------------------------------------------------
 # FastAPI application
 # ---------------------------------------------------------------------------
 
 
 load_environment()
-app = FastAPI(title="Crypto Advisor API", version="0.1.0")
+
+warmup_report = WarmupReport()
+_background: set[asyncio.Task] = set()
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Start warm-up in the background; ``/ready`` reports when it is done.
+
+    The report precomputation scheduler is started as well when a watchlist
+    is configured.  On shutdown it is cancelled and the TA process pool (if
+    any) is stopped.
+    """
+
+    if warmup_enabled():
+        task = asyncio.create_task(asyncio.to_thread(warm_up, warmup_report))
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+    else:
+        warmup_report.status = READY
+    precomputer = precompute.get_precomputer()
+    scheduler = asyncio.create_task(precomputer.run_forever()) if precomputer.schedule else None
+    yield
+    if scheduler is not None:
+        scheduler.cancel()
+    await asyncio.to_thread(ta_pool.shutdown_pool)
+
+
+app = FastAPI(title="Crypto Advisor API", version="0.1.0", lifespan=lifespan)
+app.include_router(analytics.router)
+app.include_router(jobs.router)
+app.include_router(precompute.router)
+
+
+@app.exception_handler(AdmissionRejected)
+async def _admission_rejected(request: Request, exc: AdmissionRejected) -> JSONResponse:
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)}, headers=exc.headers)
+
+
+# Operational endpoints are neither profiled nor traced.
+_OPS_PATHS = frozenset({"/ready", "/admission", "/metrics", "/precompute", "/profiles"})
+
+
+# ---------------------------------------------------------------------------
+# Opt-in request profiling (see crypto_advisor.profiling)
+# ---------------------------------------------------------------------------
+
+
+if profiling.enabled():
+
+    @app.middleware("http")
+    async def _profile_request(request: Request, call_next):
+        if request.url.path in _OPS_PATHS:
+            return await call_next(request)
+        capture = profiling.select(request.headers)
+        if capture is None:
+            return await call_next(request)
+        # For streaming endpoints the capture ends once the response starts.
+        with profiling.capturing(capture):
+            response = await call_next(request)
+        duration = time.perf_counter() - capture.started
+        if profiling.keep(capture, duration):
+            store = profiling.profile_store()
+            entry = await asyncio.to_thread(
+                store.save, capture, request.method, request.url.path, response.status_code, duration
+            )
+            if entry is not None:
+                response.headers[profiling.ID_HEADER] = entry.id
+        return response
+
+
+# ---------------------------------------------------------------------------
+# Request tracing (see crypto_advisor.tracing)
+# ---------------------------------------------------------------------------
+
+
+if tracing.enabled():
+
+    @app.middleware("http")
+    async def _trace_request(request: Request, call_next):
+        if request.url.path in _OPS_PATHS:
+            return await call_next(request)
+        started = time.perf_counter()
+        query = {"query": request.url.query} if request.url.query else {}
+        with tracing.start_trace(f"{request.method} {request.url.path}", **query) as trace:
+            response = await call_next(request)
+        config = tracing.settings()
+        if config.server_timing:
+            total_ms = (time.perf_counter() - started) * 1000
+            response.headers["Server-Timing"] = tracing.server_timing(trace, total_ms)
+            response.headers[tracing.TRACE_ID_HEADER] = trace.trace_id
+        if config.file is not None:
+            await asyncio.to_thread(tracing.export, trace)
+        return response
 
 
 async def _invoke_sync(app_callable, payload: dict[str, Any] | None = None) -> str:  # noqa: E501
     """Run blocking LangGraph invocation in a thread."""
 
     payload = payload or {}
-    result = await asyncio.to_thread(app_callable.invoke, payload)
+    result = await profiling.to_thread(app_callable.invoke, payload)
     return result["messages"][-1].content
 
 
-@app.get("/market-overview", response_model=AdvisorResponse, tags=["analysis"])
-async def market_overview_endpoint(days: int = 60) -> AdvisorResponse:  # noqa: D103
+# ``precomputed`` when a scheduled report answered the request, ``rules`` for
+# the rule-based narrative (see crypto_advisor.fast_path).
+_REPORT_SOURCE_HEADER = "X-Report-Source"
+
+
+def _revalidate(request: Request, response: Response, validators: CacheValidators) -> Response | None:
+    """Return a ``304`` if the client's copy is current, else tag ``response``."""
+
+    if not_modified(request.headers.get("if-none-match"), validators.etag):
+        return Response(status_code=304, headers=validators.headers)
+    response.headers.update(validators.headers)
+    return None
+
+
+# ``llm`` runs the agent; ``fast`` answers with the rule-based narrative.
+Mode = Literal["llm", "fast"]
+
+
+def _validator_params(params: dict[str, Any], mode: str) -> dict[str, Any]:
+    # Rule-based and LLM answers to the same request are different representations.
+    return {**params, "mode": mode} if mode != fast_path.LLM else params
+
+
+async def _answer(
+    response: Response,
+    workflow: str,
+    params: dict[str, Any],
+    mode: str,
+    run_llm: Callable[[], Awaitable[str]],
+) -> AdvisorResponse:
+    """Answer through :func:`fast_path.answer`, tagging rule-based responses."""
+
     try:
-        message = await _invoke_sync(build_market_overview_app(days))
-        return AdvisorResponse(message=message)
+        message, source = await fast_path.answer(workflow, params, mode, run_llm)
+    except AdmissionRejected:
+        raise
     except Exception as exc:  # pragma: no cover – runtime safeguard
         raise HTTPException(status_code=500, detail=str(exc)) from exc
+    if source == fast_path.SOURCE:
+        response.headers[_REPORT_SOURCE_HEADER] = fast_path.SOURCE
+        if mode != fast_path.FAST:
+            # A stand-in for the LLM answer must not be cached under its URL.
+            del response.headers["ETag"]
+            response.headers["Cache-Control"] = "no-store"
+    return AdvisorResponse(message=message)
+
+
+@app.get("/market-overview", response_model=AdvisorResponse, tags=["analysis"])
+async def market_overview_endpoint(  # noqa: D103
+    request: Request, response: Response, days: int = 60, mode: Mode = fast_path.LLM
+) -> Union[AdvisorResponse, Response]:
+    validators = candle_validators("market_overview", _validator_params({"days": days}, mode), MARKET_SNAPSHOT_INTERVAL)
+    if (not_modified_response := _revalidate(request, response, validators)) is not None:
+        return not_modified_response
+    params = precompute.report_params("market_overview", days=days)
+    if mode == fast_path.LLM and (report := precompute.fresh_report("market_overview", params)) is not None:
+        response.headers[_REPORT_SOURCE_HEADER] = "precomputed"
+        return AdvisorResponse(message=report.message)
+    return await _answer(response, "market_overview", params, mode, lambda: _invoke_sync(get_market_overview_app(days)))
 
 
 @app.get("/technical-analysis", response_model=AdvisorResponse, tags=["analysis"])
-async def technical_analysis_endpoint(symbol: str = "ETHUSDT") -> AdvisorResponse:  # noqa: D103
+async def technical_analysis_endpoint(  # noqa: D103
+    request: Request, response: Response, symbol: str = "ETHUSDT", mode: Mode = fast_path.LLM
+) -> Union[AdvisorResponse, Response]:
+    representation = _validator_params({"symbol": symbol.upper()}, mode)
+    validators = candle_validators("technical_analysis", representation, TA_INTERVAL)
+    if (not_modified_response := _revalidate(request, response, validators)) is not None:
+        return not_modified_response
+    params = precompute.report_params("technical_analysis", symbol=symbol)
+    if mode == fast_path.LLM and (report := precompute.fresh_report("technical_analysis", params)) is not None:
+        response.headers[_REPORT_SOURCE_HEADER] = "precomputed"
+        return AdvisorResponse(message=report.message)
+    return await _answer(
+        response, "technical_analysis", params, mode, lambda: _invoke_sync(get_technical_analysis_app(symbol))
+    )
+
+
+# Upper bound of ``symbols`` in one batch request.
+MAX_BATCH_SYMBOLS = 100
+
+
+@app.get("/technical-analysis/batch", response_model=BatchAnalysisResponse, tags=["analysis"])
+async def technical_analysis_batch_endpoint(symbols: str) -> BatchAnalysisResponse:
+    """Analyse comma-separated ``symbols`` with one LLM call per batch."""
+
+    requested = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols.split(",") if symbol.strip()))
+    if not requested or len(requested) > MAX_BATCH_SYMBOLS:
+        raise HTTPException(status_code=400, detail=f"Pass 1-{MAX_BATCH_SYMBOLS} comma-separated symbols")
+    async with llm_admission.slot():
+        try:
+            result = await profiling.to_thread(get_batch_technical_analysis_app().invoke, {"symbols": requested})
+        except Exception as exc:  # pragma: no cover
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+    return BatchAnalysisResponse(analyses=result["analyses"], errors=result["errors"], llm_calls=result["llm_calls"])
+
+
+# ---------------------------------------------------------------------------
+# Streaming (SSE) variants
+# ---------------------------------------------------------------------------
+
+
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Disable response buffering in nginx-style reverse proxies.
+    "X-Accel-Buffering": "no",
+}
+
+
+async def _sse_response(app_callable) -> StreamingResponse:
+    # Admit before the response starts so saturation still yields a 429/503;
+    # the response releases the slot once it has been sent or abandoned.
+    await llm_admission.acquire()
     try:
-        message = await _invoke_sync(build_technical_analysis_app(symbol))
-        return AdvisorResponse(message=message)
-    except Exception as exc:  # pragma: no cover
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
+        return AdmittedStreamingResponse(
+            llm_admission,
+            stream_workflow_events(app_callable),
+            media_type="text/event-stream",
+            headers=_SSE_HEADERS,
+        )
+    except BaseException:
+        llm_admission.release()
+        raise
+
+
+@app.get("/market-overview/stream", tags=["analysis"])
+async def market_overview_stream_endpoint(days: int = 60) -> StreamingResponse:
+    """Stream node progress and LLM tokens of the market overview as SSE."""
+
+    return await _sse_response(get_market_overview_app(days, streaming=True))
+
+
+@app.get("/technical-analysis/stream", tags=["analysis"])
+async def technical_analysis_stream_endpoint(symbol: str = "ETHUSDT") -> StreamingResponse:
+    """Stream node progress and LLM tokens of the technical analysis as SSE."""
+
+    return await _sse_response(get_technical_analysis_app(symbol, streaming=True))
+
+
+# ---------------------------------------------------------------------------
+# Operational endpoints
+# ---------------------------------------------------------------------------
+
+
+@app.get("/ready", tags=["ops"])
+async def readiness_endpoint() -> JSONResponse:
+    """``200`` once warm-up completed, ``503`` while warming up or after a failure."""
+
+    return JSONResponse(status_code=200 if warmup_report.ready else 503, content=asdict(warmup_report))
+
+
+@app.get("/admission", tags=["ops"])
+async def admission_endpoint() -> dict[str, Any]:
+    """In-flight requests, queue depth and queue wait times per controller."""
+
+    return {stats.name: asdict(stats) for stats in admission_stats()}
+
+
+@app.get("/profiles", tags=["ops"])
+async def profiles_endpoint(request: Request) -> list[dict[str, Any]]:
+    """Index of the slowest captured request profiles (``404`` when profiling is off)."""
+
+    if not profiling.enabled():
+        raise HTTPException(status_code=404, detail="Profiling is disabled.")
+    token = profiling.settings().token
+    if token and request.headers.get(profiling.TOKEN_HEADER) != token:
+        raise HTTPException(status_code=403, detail=f"{profiling.TOKEN_HEADER} required.")
+    return [asdict(entry) for entry in profiling.profile_store().entries()]
+
+
+@app.get("/metrics", tags=["ops"], response_class=PlainTextResponse)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Prometheus metrics in the text exposition format."""
+
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
 
 
 # ---------------------------------------------------------------------------
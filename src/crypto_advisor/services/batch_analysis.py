@@ -0,0 +1,253 @@
+"""Technical analysis of many symbols with one LLM call per batch.
+
+A per-symbol agent run costs one or more model round trips each, so a
+20-symbol digest means 20+ calls.  Here the indicators of every symbol are
+reduced to a compact :func:`symbol_digest`, up to ``batch_size`` digests are
+packed into one prompt asking for a JSON object keyed by symbol, and the
+reply is parsed per symbol.  Symbols the model omits (or answers with
+something unusable) are asked for once more in one follow-up round; any
+still missing get a :func:`fallback_analysis` derived from the indicators,
+marked ``source="fallback"``.
+
+The model is passed in as a ``prompt -> text`` callable, so this module has
+no LLM or TA dependencies.  ``CRYPTO_ADVISOR_BATCH_SIZE`` (default 25) sets
+the number of symbols per call.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Mapping
+
+from crypto_advisor.utils.compact import compact, serialize_for_llm
+
+DEFAULT_BATCH_SIZE = 25
+
+# Indicators of ``perform_technical_analysis`` that go into a digest.
+DIGEST_INDICATORS = (
+    "SMA_50",
+    "EMA_20",
+    "ADX",
+    "RSI",
+    "MACD",
+    "MACD_Signal",
+    "Bollinger_High",
+    "Bollinger_Low",
+    "ATR",
+    "CMF",
+)
+
+# Digest indicators in price units; kept at full precision like the close,
+# since rounding can flip or erase a close-vs-level comparison.
+PRICE_INDICATORS = frozenset({"SMA_50", "EMA_20", "Bollinger_High", "Bollinger_Low", "ATR"})
+
+OUTLOOKS = ("bullish", "bearish", "neutral")
+
+# Last prompt line; lists the symbols expected in the reply.
+SYMBOLS_PREFIX = "Symbols:"
+
+PromptRunner = Callable[[str], str]
+
+
+@dataclass
+class SymbolAnalysis:
+    """Analysis of one symbol; ``source`` is ``llm`` or ``fallback``."""
+
+    symbol: str
+    outlook: str
+    summary: str
+    recommendation: str
+    source: str = "llm"
+
+
+@dataclass
+class BatchResult:
+    """Analyses in input order and the number of model calls made."""
+
+    analyses: list[SymbolAnalysis]
+    llm_calls: int
+
+
+def batch_size() -> int:
+    """Symbols per model call from ``CRYPTO_ADVISOR_BATCH_SIZE``."""
+
+    return max(1, int(os.getenv("CRYPTO_ADVISOR_BATCH_SIZE", str(DEFAULT_BATCH_SIZE))))
+
+
+def _finite(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+def symbol_digest(
+    symbol: str,
+    summary: Mapping[str, Any],
+    indicators: Mapping[str, Any],
+    volatility: Mapping[str, Any],
+) -> dict[str, Any]:
+    """Compact per-symbol input for the batch prompt.
+
+    Prices keep full precision; oscillators and percentages are rounded to
+    four significant digits.
+
+    Args:
+        symbol: Trading pair.
+        summary: :func:`~crypto_advisor.run_context.candle_summary` of the candles.
+        indicators: ``latest_indicators`` of ``perform_technical_analysis``.
+        volatility: Result of ``calculate_volatility_index``.
+    """
+
+    values = {name: _finite(indicators.get(name)) for name in DIGEST_INDICATORS}
+    return {
+        "symbol": symbol,
+        "close": _finite(summary.get("last_close")),
+        "change_pct": compact(_finite(summary.get("change_pct")), precision=4),
+        "indicators": {
+            name: value if name in PRICE_INDICATORS else compact(value, precision=4) for name, value in values.items()
+        },
+        "volatility_index": compact(_finite(volatility.get("volatility_index")), precision=4),
+        "volatility_category": volatility.get("volatility_category"),
+    }
+
+
+def build_prompt(digests: list[dict[str, Any]]) -> str:
+    """Prompt asking for a JSON analysis of every digest."""
+
+    symbols = ", ".join(digest["symbol"] for digest in digests)
+    return (
+        "You are a cryptocurrency technical analyst. Below are the latest 4h indicators of "
+        f"{len(digests)} trading pairs (SMA/EMA trend, ADX strength, RSI, MACD and signal line, "
+        "Bollinger bands, ATR, Chaikin money flow, volatility index 0-5). For every pair return an "
+        'entry in ONE JSON object keyed by symbol: {"SYMBOL": {"outlook": "bullish" | "bearish" | '
+        '"neutral", "summary": "<two or three sentences on trend, momentum and volatility>", '
+        '"recommendation": "<one sentence for an investor>"}}. Reply with the JSON object only.\n'
+        f"{serialize_for_llm(digests, 'batch_technical_analysis').text}\n"
+        f"{SYMBOLS_PREFIX} {symbols}"
+    )
+
+
+def _json_object(text: str) -> Any:
+    """The outermost ``{...}`` of ``text`` parsed as JSON (tolerates code fences and prose)."""
+
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        return json.loads(text[start : end + 1])
+    except ValueError:
+        return None
+
+
+def parse_response(text: str, symbols: Iterable[str]) -> dict[str, SymbolAnalysis]:
+    """Usable analyses in the model reply, keyed by requested symbol.
+
+    Accepts an object keyed by symbol (matched case-insensitively) or an
+    ``{"analyses": [{"symbol": ...}, ...]}`` list.  Entries without a summary
+    are dropped; unknown outlooks become ``neutral``.
+    """
+
+    wanted = {symbol.upper(): symbol for symbol in symbols}
+    data = _json_object(text)
+    if isinstance(data, dict) and isinstance(data.get("analyses"), list):
+        data = {str(item.get("symbol", "")): item for item in data["analyses"] if isinstance(item, dict)}
+    if not isinstance(data, dict):
+        return {}
+
+    parsed: dict[str, SymbolAnalysis] = {}
+    for key, entry in data.items():
+        symbol = wanted.get(str(key).strip().upper())
+        if symbol is None or not isinstance(entry, dict):
+            continue
+        summary = str(entry.get("summary") or "").strip()
+        if not summary:
+            continue
+        outlook = str(entry.get("outlook") or "").strip().lower()
+        parsed[symbol] = SymbolAnalysis(
+            symbol=symbol,
+            outlook=outlook if outlook in OUTLOOKS else "neutral",
+            summary=summary,
+            recommendation=str(entry.get("recommendation") or "").strip(),
+        )
+    return parsed
+
+
+def fallback_analysis(digest: Mapping[str, Any]) -> SymbolAnalysis:
+    """Indicator-only analysis for a symbol the model did not answer.
+
+    The outlook is bullish when the close is above the 20 EMA and MACD above
+    its signal line, bearish when both are below, neutral otherwise (a value
+    equal to its reference counts as neither).
+    """
+
+    indicators = digest.get("indicators") or {}
+    close, ema, rsi = digest.get("close"), indicators.get("EMA_20"), indicators.get("RSI")
+    macd, signal = indicators.get("MACD"), indicators.get("MACD_Signal")
+    votes = 0
+    if close is not None and ema is not None:
+        votes += _sign(close - ema)
+    if macd is not None and signal is not None:
+        votes += _sign(macd - signal)
+    outlook = "bullish" if votes == 2 else "bearish" if votes == -2 else "neutral"
+
+    facts = [f"close {close}" if close is not None else None, f"RSI {rsi:.1f}" if rsi is not None else None]
+    if digest.get("volatility_category"):
+        facts.append(f"{digest['volatility_category']} volatility")
+    detail = ", ".join(fact for fact in facts if fact)
+    summary = f"No model analysis available; indicators point to a {outlook} setup"
+    return SymbolAnalysis(
+        symbol=digest["symbol"],
+        outlook=outlook,
+        summary=f"{summary} ({detail})." if detail else f"{summary}.",
+        recommendation="Review the indicators before acting.",
+        source="fallback",
+    )
+
+
+def _chunks(items: list[Any], size: int) -> list[list[Any]]:
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def analyse_batch(
+    digests: list[dict[str, Any]],
+    invoke: PromptRunner,
+    size: int | None = None,
+) -> BatchResult:
+    """Analyse ``digests`` with one model call per ``size`` symbols.
+
+    Symbols missing from the replies are retried together once (again in
+    chunks of ``size``); what is still missing falls back to
+    :func:`fallback_analysis`.  A failing call counts as a reply without
+    usable entries.
+    """
+
+    size = size or batch_size()
+    by_symbol = {digest["symbol"]: digest for digest in digests}
+    answered: dict[str, SymbolAnalysis] = {}
+    calls = 0
+
+    pending = list(by_symbol)
+    for _attempt in range(2):
+        for chunk in _chunks(pending, size):
+            calls += 1
+            try:
+                text = invoke(build_prompt([by_symbol[symbol] for symbol in chunk]))
+            except Exception as exc:  # noqa: BLE001 – symbols are retried or fall back
+                print(f"Batch analysis of {len(chunk)} symbols failed: {exc}")
+                continue
+            answered.update(parse_response(text, chunk))
+        pending = [symbol for symbol in pending if symbol not in answered]
+        if not pending:
+            break
+
+    analyses = [answered.get(symbol) or fallback_analysis(by_symbol[symbol]) for symbol in by_symbol]
+    return BatchResult(analyses=analyses, llm_calls=calls)
@@ -0,0 +1,391 @@
+"""Rolling cross-asset correlation and beta-to-benchmark matrices.
+
+Given aligned close series for ``N`` symbols, :class:`RollingCorrelation`
+tracks the covariance of log returns over a rolling window of candles and
+derives
+
+* the ``N×N`` correlation matrix, and
+* every symbol's beta to a benchmark (``BTCUSDT`` by default):
+  ``cov(r_i, r_b) / var(r_b)``.
+
+:class:`RollingCovariance` keeps running sums of the returns and of their
+outer products.  A new candle adds one rank-1 update and the candle leaving
+the window subtracts one, so the matrix is refreshed in ``O(N²)`` per candle
+instead of ``O(window·N²)`` from scratch; the sums are re-synchronised from
+the window buffer periodically to bound floating point drift.
+
+Trackers are kept per symbol set, interval and window (see
+:func:`correlation_report`), so repeated requests only push the candles that
+closed since the previous one.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Sequence
+
+import numpy as np
+
+from crypto_advisor.providers.binance import fetch_binance_chart
+from crypto_advisor.services.response_cache import closed_candles
+
+DEFAULT_BENCHMARK = "BTCUSDT"
+DEFAULT_WINDOW = 72
+DEFAULT_FETCH_CONCURRENCY = 16
+# Beta vectors retained per tracker for ``history`` queries.
+MAX_HISTORY = 500
+# Trackers kept for repeated requests.
+MAX_TRACKERS = 16
+
+
+class RollingCovariance:
+    """Sample covariance of the last ``window`` observations of ``n`` variables.
+
+    Args:
+        n: Number of variables.
+        window: Observations kept.
+        resync_every: Recompute the running sums from the buffer after this
+            many updates (default: ``window``).
+    """
+
+    def __init__(self, n: int, window: int, resync_every: int | None = None) -> None:
+        if window < 2:
+            raise ValueError("window must be at least 2")
+        self.n = n
+        self.window = window
+        self.resync_every = resync_every or window
+        self._buffer = np.zeros((window, n))
+        self._sum = np.zeros(n)
+        self._cross = np.zeros((n, n))
+        self._count = 0
+        self._position = 0
+        self._updates = 0
+
+    @property
+    def count(self) -> int:
+        """Observations currently in the window."""
+
+        return self._count
+
+    def push(self, x: Sequence[float] | np.ndarray) -> None:
+        """Add one observation, evicting the oldest once the window is full."""
+
+        x = np.asarray(x, dtype=np.float64)
+        if self._count == self.window:
+            old = self._buffer[self._position]
+            self._sum -= old
+            self._cross -= np.outer(old, old)
+        else:
+            self._count += 1
+        self._buffer[self._position] = x
+        self._sum += x
+        self._cross += np.outer(x, x)
+        self._position = (self._position + 1) % self.window
+
+        self._updates += 1
+        if self._updates % self.resync_every == 0:
+            data = self._buffer[: self._count]
+            self._sum = data.sum(axis=0)
+            self._cross = data.T @ data
+
+    def covariance(self) -> np.ndarray:
+        """Return the ``n×n`` sample covariance matrix of the window."""
+
+        count = self._count
+        if count < 2:
+            raise ValueError("at least two observations are required")
+        mean = self._sum / count
+        return (self._cross - count * np.outer(mean, mean)) / (count - 1)
+
+    def covariance_with(self, index: int) -> np.ndarray:
+        """Return column ``index`` of :meth:`covariance` in ``O(n)``."""
+
+        count = self._count
+        if count < 2:
+            raise ValueError("at least two observations are required")
+        mean = self._sum / count
+        return (self._cross[:, index] - count * mean * mean[index]) / (count - 1)
+
+
+def correlation_from_covariance(covariance: np.ndarray) -> np.ndarray:
+    """Normalise a covariance matrix; constant series correlate as ``NaN``."""
+
+    std = np.sqrt(np.clip(np.diag(covariance), 0.0, None))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance / np.outer(std, std)
+    correlation[~np.isfinite(correlation)] = np.nan
+    np.fill_diagonal(correlation, np.where(std > 0, 1.0, np.nan))
+    return np.clip(correlation, -1.0, 1.0)
+
+
+@dataclass
+class RollingCorrelation:
+    """Incrementally updated correlation and beta matrices of a symbol set.
+
+    Attributes:
+        symbols: Column order of the close matrices passed to :meth:`update`.
+        benchmark: Symbol betas are measured against; must be in ``symbols``.
+        window: Returns per rolling window.
+    """
+
+    symbols: list[str]
+    benchmark: str = DEFAULT_BENCHMARK
+    window: int = DEFAULT_WINDOW
+    last_time: np.datetime64 | None = None
+    beta_history: deque = field(default_factory=lambda: deque(maxlen=MAX_HISTORY))
+    # Held by callers sharing the tracker across threads.
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self) -> None:
+        self._benchmark_index = self.symbols.index(self.benchmark)
+        self._covariance = RollingCovariance(len(self.symbols), self.window)
+
+    @property
+    def observations(self) -> int:  # noqa: D102
+        return self._covariance.count
+
+    def reset(self) -> None:
+        """Forget all observations."""
+
+        self._covariance = RollingCovariance(len(self.symbols), self.window)
+        self.last_time = None
+        self.beta_history.clear()
+
+    def update(self, times: np.ndarray, closes: np.ndarray) -> int:
+        """Push the candles of ``closes`` that are newer than the last update.
+
+        Args:
+            times: Candle times, strictly increasing, shape ``(T,)``.
+            closes: Close prices, shape ``(T, N)`` in :attr:`symbols` order.
+
+        Returns:
+            Number of returns pushed.  If the data does not overlap with the
+            previous update, the tracker is rebuilt from ``closes``.
+        """
+
+        start = 0
+        if self.last_time is not None:
+            overlap = np.flatnonzero(times == self.last_time)
+            if overlap.size:
+                start = int(overlap[0])
+            else:
+                self.reset()
+
+        log_closes = np.log(closes[start:])
+        returns = np.diff(log_closes, axis=0)
+        for row, time in zip(returns, times[start + 1 :]):
+            self._covariance.push(row)
+            if self._covariance.count == self.window:
+                self.beta_history.append((time, self.betas()))
+        if len(times):
+            self.last_time = times[-1]
+        return len(returns)
+
+    def correlation(self) -> np.ndarray:
+        """Current ``N×N`` correlation matrix."""
+
+        return correlation_from_covariance(self._covariance.covariance())
+
+    def betas(self) -> np.ndarray:
+        """Current beta of every symbol to the benchmark (``O(N)``)."""
+
+        column = self._covariance.covariance_with(self._benchmark_index)
+        variance = column[self._benchmark_index]
+        if variance <= 0:
+            return np.full(len(self.symbols), np.nan)
+        return column / variance
+
+
+# ---------------------------------------------------------------------------
+# Data alignment
+# ---------------------------------------------------------------------------
+
+
+def aligned_closes(
+    candles_by_symbol: dict[str, list[dict]],
+    min_length: int,
+) -> tuple[np.ndarray, list[str], np.ndarray, dict[str, str]]:
+    """Align close series on the candle times common to all symbols.
+
+    Symbols with fewer than ``min_length`` candles are dropped and reported.
+
+    Returns:
+        Times ``(T,)``, kept symbols, closes ``(T, N)`` and errors per symbol.
+    """
+
+    errors: dict[str, str] = {}
+    series: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for symbol, candles in candles_by_symbol.items():
+        if len(candles) < min_length:
+            errors[symbol] = f"insufficient history: {len(candles)} candles, {min_length} required"
+            continue
+        times = np.array([candle["time"] for candle in candles], dtype="datetime64[s]")
+        closes = np.array([candle["close"] for candle in candles], dtype=np.float64)
+        series[symbol] = (times, closes)
+
+    if not series:
+        return np.array([], dtype="datetime64[s]"), [], np.empty((0, 0)), errors
+    common = None
+    for times, _ in series.values():
+        common = times if common is None else np.intersect1d(common, times, assume_unique=True)
+    symbols = list(series)
+    matrix = np.empty((len(common), len(symbols)))
+    for column, symbol in enumerate(symbols):
+        times, closes = series[symbol]
+        matrix[:, column] = closes[np.isin(times, common, assume_unique=True)]
+    return common, symbols, matrix, errors
+
+
+def fetch_closed_candles(
+    symbols: Iterable[str],
+    interval: str,
+    limit: int,
+    concurrency: int = DEFAULT_FETCH_CONCURRENCY,
+) -> tuple[dict[str, list[dict]], dict[str, str]]:
+    """Fetch closed candles for all symbols concurrently.
+
+    Returns:
+        Candles per symbol and fetch errors per symbol.
+    """
+
+    symbols = list(symbols)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {symbol: pool.submit(fetch_binance_chart, symbol, interval, limit) for symbol in symbols}
+    candles: dict[str, list[dict]] = {}
+    errors: dict[str, str] = {}
+    for symbol, future in futures.items():
+        try:
+            candles[symbol] = closed_candles(future.result(), interval)
+        except Exception as exc:  # noqa: BLE001 – reported per symbol
+            errors[symbol] = str(exc)
+    return candles, errors
+
+
+# ---------------------------------------------------------------------------
+# Reports
+# ---------------------------------------------------------------------------
+
+
+def _round(value: float, digits: int = 4) -> float | None:
+    return None if not np.isfinite(value) else round(float(value), digits)
+
+
+def _as_time(value: np.datetime64) -> str:
+    return str(value.astype("datetime64[s]").item().isoformat())
+
+
+def _pairs(symbols: list[str], correlation: np.ndarray, count: int, descending: bool) -> list[dict[str, Any]]:
+    upper = np.triu_indices(len(symbols), k=1)
+    values = correlation[upper]
+    finite = np.flatnonzero(np.isfinite(values))
+    order = finite[np.argsort(values[finite])]
+    if descending:
+        order = order[::-1]
+    return [
+        {"pair": [symbols[upper[0][i]], symbols[upper[1][i]]], "correlation": _round(values[i])}
+        for i in order[:count]
+    ]
+
+
+def build_report(
+    tracker: RollingCorrelation,
+    errors: dict[str, str] | None = None,
+    history: int = 0,
+    matrix: bool = True,
+    pairs: int = 5,
+) -> dict[str, Any]:
+    """Render the state of ``tracker`` as a JSON-able dict.
+
+    Args:
+        tracker: Updated tracker.
+        errors: Symbols that could not be included, with reasons.
+        history: Number of past beta vectors to include (``beta_history``).
+        matrix: Include the full correlation matrix.
+        pairs: Number of most and least correlated pairs to list.
+    """
+
+    correlation = tracker.correlation()
+    benchmark_index = tracker.symbols.index(tracker.benchmark)
+    betas = tracker.betas()
+    report: dict[str, Any] = {
+        "benchmark": tracker.benchmark,
+        "window": tracker.window,
+        "observations": tracker.observations,
+        "as_of": _as_time(tracker.last_time) if tracker.last_time is not None else None,
+        "symbols": tracker.symbols,
+        "beta": {symbol: _round(beta) for symbol, beta in zip(tracker.symbols, betas)},
+        "correlation_to_benchmark": {
+            symbol: _round(value) for symbol, value in zip(tracker.symbols, correlation[:, benchmark_index])
+        },
+        "most_correlated": _pairs(tracker.symbols, correlation, pairs, descending=True),
+        "least_correlated": _pairs(tracker.symbols, correlation, pairs, descending=False),
+        "errors": errors or {},
+    }
+    if matrix:
+        report["correlation"] = [[_round(value) for value in row] for row in correlation]
+    if history:
+        report["beta_history"] = [
+            {"time": _as_time(time), "beta": {s: _round(b) for s, b in zip(tracker.symbols, vector)}}
+            for time, vector in list(tracker.beta_history)[-history:]
+        ]
+    return report
+
+
+_trackers: OrderedDict[tuple, RollingCorrelation] = OrderedDict()
+_trackers_lock = threading.Lock()
+
+
+def _tracker(symbols: list[str], interval: str, window: int, benchmark: str) -> RollingCorrelation:
+    key = (tuple(symbols), interval, window, benchmark)
+    with _trackers_lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = RollingCorrelation(symbols=symbols, benchmark=benchmark, window=window)
+            _trackers[key] = tracker
+        _trackers.move_to_end(key)
+        while len(_trackers) > MAX_TRACKERS:
+            _trackers.popitem(last=False)
+    return tracker
+
+
+def correlation_report(
+    symbols: Sequence[str],
+    interval: str = "1h",
+    limit: int = 200,
+    window: int = DEFAULT_WINDOW,
+    benchmark: str = DEFAULT_BENCHMARK,
+    history: int = 0,
+    matrix: bool = True,
+    pairs: int = 5,
+) -> dict[str, Any]:
+    """Fetch closes for ``symbols`` and report rolling correlation and betas.
+
+    The benchmark is added to ``symbols`` if missing.  The tracker of the
+    same symbol set, interval and window is reused, so only newly closed
+    candles are pushed on repeated calls.
+
+    Raises:
+        ValueError: If the benchmark has no usable data or ``limit`` does not
+            cover the window.
+    """
+
+    benchmark = benchmark.upper()
+    symbols = list(dict.fromkeys([benchmark, *(symbol.upper() for symbol in symbols)]))
+    if limit < window + 1:
+        raise ValueError(f"limit ({limit}) must exceed window ({window})")
+
+    candles, errors = fetch_closed_candles(symbols, interval, limit)
+    times, kept, closes, alignment_errors = aligned_closes(candles, min_length=window + 1)
+    errors.update(alignment_errors)
+    if benchmark not in kept:
+        raise ValueError(f"No usable data for benchmark {benchmark}: {errors.get(benchmark, 'missing')}")
+    if len(times) < window + 1:
+        raise ValueError(f"Only {len(times)} common candles, {window + 1} required")
+
+    tracker = _tracker(kept, interval, window, benchmark)
+    with tracker.lock:
+        tracker.update(times, closes)
+        return build_report(tracker, errors, history=history, matrix=matrix, pairs=pairs)
@@ -0,0 +1,311 @@
+"""Background analysis jobs with de-duplication and a pluggable result store.
+
+A full LLM analysis can outlive the timeout of a load balancer in front of
+the API.  :class:`JobManager` runs analyses in the background instead: a
+client submits a workflow and its parameters, receives a job ID right away and
+polls – or long-polls – for the result.
+
+Submitting a workflow/parameter combination that is already pending or running
+attaches to the existing job rather than starting a second analysis.  Finished
+jobs are retained for a configurable TTL.
+
+The job store is pluggable: :class:`InMemoryJobStore` (default) keeps jobs in
+the process, :class:`DiskJobStore` writes one JSON document per job to a local
+directory so results survive a restart.  Jobs run in the process that accepted
+them, and de-duplication and long-polling only see that process's jobs, so
+the disk store is meant for one server process at a time: a new
+:class:`JobManager` marks jobs a previous process left pending or running as
+failed (``interrupted by restart``).  Configuration:
+
+* ``CRYPTO_ADVISOR_JOB_STORE`` – ``memory`` (default) or ``disk``.
+* ``CRYPTO_ADVISOR_JOB_STORE_DIR`` – directory for the disk store.
+* ``CRYPTO_ADVISOR_JOB_TTL`` – seconds finished jobs are retained (3600).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterator, Mapping, Protocol
+
+from crypto_advisor.services.response_cache import ResponseCache
+
+DEFAULT_JOB_DIR = ".cache/jobs"
+DEFAULT_JOB_TTL = 3600.0
+DEFAULT_PURGE_INTERVAL = 60.0
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED_STATES = frozenset({SUCCEEDED, FAILED})
+
+# Error of jobs that were still in progress when their process stopped.
+INTERRUPTED = "interrupted by restart"
+
+JobRunner = Callable[[str, Mapping[str, Any]], Awaitable[str]]
+
+
+@dataclass
+class Job:
+    """State of a single background analysis."""
+
+    job_id: str
+    workflow: str
+    params: dict[str, Any]
+    status: str = PENDING
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    message: str | None = None
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:  # noqa: D102
+        return self.status in FINISHED_STATES
+
+
+class JobStore(Protocol):
+    """Minimal persistence interface implemented by every job store."""
+
+    def get(self, job_id: str) -> Job | None:  # noqa: D102
+        ...
+
+    def put(self, job: Job) -> None:  # noqa: D102
+        ...
+
+    def delete(self, job_id: str) -> None:  # noqa: D102
+        ...
+
+    def jobs(self) -> Iterator[Job]:  # noqa: D102
+        ...
+
+
+# ---------------------------------------------------------------------------
+# Stores
+# ---------------------------------------------------------------------------
+
+
+class InMemoryJobStore:
+    """Thread-safe in-process job store."""
+
+    def __init__(self) -> None:
+        self._jobs: dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def get(self, job_id: str) -> Job | None:  # noqa: D102
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def put(self, job: Job) -> None:  # noqa: D102
+        with self._lock:
+            self._jobs[job.job_id] = job
+
+    def delete(self, job_id: str) -> None:  # noqa: D102
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def jobs(self) -> Iterator[Job]:  # noqa: D102
+        with self._lock:
+            return iter(list(self._jobs.values()))
+
+
+class DiskJobStore:
+    """Job store writing one JSON document per job to a local directory."""
+
+    def __init__(self, directory: str | os.PathLike[str] = DEFAULT_JOB_DIR) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, job_id: str) -> Path:
+        # Job IDs are generated as hex UUIDs; anything else cannot exist.
+        return self.directory / f"{uuid.UUID(hex=job_id).hex}.json"
+
+    def get(self, job_id: str) -> Job | None:  # noqa: D102
+        try:
+            return Job(**json.loads(self._path(job_id).read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, job: Job) -> None:  # noqa: D102
+        path = self._path(job.job_id)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(asdict(job), default=str))
+        os.replace(tmp_path, path)  # atomic on POSIX and Windows
+
+    def delete(self, job_id: str) -> None:  # noqa: D102
+        try:
+            self._path(job_id).unlink(missing_ok=True)
+        except ValueError:
+            pass
+
+    def jobs(self) -> Iterator[Job]:  # noqa: D102
+        for path in self.directory.glob("*.json"):
+            try:
+                yield Job(**json.loads(path.read_text()))
+            except (OSError, ValueError, TypeError):
+                continue
+
+
+# ---------------------------------------------------------------------------
+# Job manager
+# ---------------------------------------------------------------------------
+
+
+class JobManager:
+    """Start, de-duplicate, await and expire background analyses.
+
+    Unfinished jobs already in ``store`` are marked as failed on creation
+    (see :meth:`recover`).
+
+    Args:
+        store: Where job state is persisted.
+        runner: Coroutine function executing ``(workflow, params)`` and
+            returning the final advisor message.
+        ttl: Seconds a finished job is retained.
+        purge_interval: Minimum seconds between two purges of expired jobs,
+            which run in a worker thread when a job is submitted.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        runner: JobRunner,
+        ttl: float = DEFAULT_JOB_TTL,
+        purge_interval: float = DEFAULT_PURGE_INTERVAL,
+    ) -> None:
+        self.store = store
+        self.runner = runner
+        self.ttl = ttl
+        self.purge_interval = purge_interval
+        self._next_purge = 0.0
+        # De-duplication key -> job ID of a pending or running job.
+        self._active: dict[str, str] = {}
+        self._done: dict[str, asyncio.Event] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.recover()
+
+    def recover(self) -> int:
+        """Fail the stored jobs a previous process left pending or running.
+
+        Returns:
+            Number of jobs marked as :data:`INTERRUPTED`.
+        """
+
+        now = time.time()
+        interrupted = [job for job in self.store.jobs() if not job.finished and job.job_id not in self._done]
+        for job in interrupted:
+            job.status, job.error, job.finished_at = FAILED, INTERRUPTED, now
+            self.store.put(job)
+        return len(interrupted)
+
+    def submit(self, workflow: str, params: Mapping[str, Any]) -> tuple[Job, bool]:
+        """Start ``workflow`` unless an identical job is already in progress.
+
+        Must be called from the event loop that should run the job.
+
+        Returns:
+            The job and ``True`` if it was newly created, ``False`` if the
+            submission attached to an in-progress job.
+        """
+
+        self._schedule_purge()
+        key = ResponseCache.make_key(workflow, params)
+        active_id = self._active.get(key)
+        if active_id is not None:
+            job = self.store.get(active_id)
+            if job is not None and not job.finished:
+                return job, False
+
+        job = Job(job_id=uuid.uuid4().hex, workflow=workflow, params=dict(params))
+        self.store.put(job)
+        self._active[key] = job.job_id
+        self._done[job.job_id] = asyncio.Event()
+        self._start(self._run(key, job))
+        return job, True
+
+    def _start(self, coroutine: Awaitable[Any]) -> None:
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _schedule_purge(self) -> None:
+        # Listing a disk store costs a file read per job, so keep it off the
+        # event loop and run it at most once per ``purge_interval``.
+        now = time.monotonic()
+        if now >= self._next_purge:
+            self._next_purge = now + self.purge_interval
+            self._start(asyncio.to_thread(self.purge_expired))
+
+    async def _run(self, key: str, job: Job) -> None:
+        job.status = RUNNING
+        self.store.put(job)
+        try:
+            job.message = await self.runner(job.workflow, job.params)
+            job.status = SUCCEEDED
+        except Exception as exc:  # noqa: BLE001 – reported through the job
+            job.error = str(exc)
+            job.status = FAILED
+        job.finished_at = time.time()
+        self.store.put(job)
+        if self._active.get(key) == job.job_id:
+            del self._active[key]
+        self._done.pop(job.job_id).set()
+
+    def _expired(self, job: Job, now: float) -> bool:
+        return job.finished_at is not None and job.finished_at + self.ttl < now
+
+    def get(self, job_id: str) -> Job | None:
+        """Return the job, or ``None`` if it is unknown or has expired."""
+
+        job = self.store.get(job_id)
+        if job is not None and self._expired(job, time.time()):
+            self.store.delete(job_id)
+            return None
+        return job
+
+    async def wait(self, job_id: str, timeout: float) -> Job | None:
+        """Long-poll: return once the job finished or ``timeout`` elapsed."""
+
+        done = self._done.get(job_id)
+        if done is not None and timeout > 0:
+            try:
+                await asyncio.wait_for(done.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.get(job_id)
+
+    def purge_expired(self) -> int:
+        """Delete finished jobs older than the TTL and return their count."""
+
+        now = time.time()
+        expired = [job.job_id for job in self.store.jobs() if self._expired(job, now)]
+        for job_id in expired:
+            self.store.delete(job_id)
+        return len(expired)
+
+
+def build_job_store() -> JobStore:
+    """Create a job store from the ``CRYPTO_ADVISOR_JOB_STORE*`` variables.
+
+    Raises:
+        ValueError: If an unknown store name is configured.
+    """
+
+    store_name = os.getenv("CRYPTO_ADVISOR_JOB_STORE", "memory").lower()
+    if store_name == "memory":
+        return InMemoryJobStore()
+    if store_name == "disk":
+        return DiskJobStore(os.getenv("CRYPTO_ADVISOR_JOB_STORE_DIR", DEFAULT_JOB_DIR))
+    raise ValueError(f"Unknown job store: {store_name}")
+
+
+def job_ttl() -> float:
+    """Retention of finished jobs from ``CRYPTO_ADVISOR_JOB_TTL``."""
+
+    return float(os.getenv("CRYPTO_ADVISOR_JOB_TTL", DEFAULT_JOB_TTL))
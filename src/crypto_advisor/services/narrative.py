@@ -0,0 +1,322 @@
+"""Rule-based narratives that answer without the LLM.
+
+Most requests need the same standard reading of the data: trend direction
+from the moving averages and ADX, the RSI zone, the MACD position relative to
+its signal line, the volatility category and recent candlestick patterns.
+:func:`technical_narrative` and :func:`market_narrative` render that reading
+from the outputs of :mod:`~crypto_advisor.services.ta_service` and the
+CoinMarketCap fetchers with fixed thresholds and templates, so the same data
+always produces the same text, in well under a millisecond.
+
+The thresholds are the textbook ones: RSI 30/70 (with 45/55 around the
+midline), ADX 20/25/40, a close above or below the 20 EMA and 50 SMA, and
+Fear & Greed 25/75 for the contrarian extremes.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Mapping
+
+BULLISH = "bullish"
+BEARISH = "bearish"
+NEUTRAL = "neutral"
+
+_PATTERN_NAMES = {
+    "doji": "doji",
+    "hammer": "hammer",
+    "hangingman": "hanging man",
+    "engulfing": "engulfing",
+    "morningstar": "morning star",
+    "eveningstar": "evening star",
+    "3whitesoldiers": "three white soldiers",
+    "3blackcrows": "three black crows",
+}
+
+
+@dataclass
+class Reading:
+    """One interpreted aspect of the data.
+
+    Attributes:
+        text: Sentence describing it.
+        vote: ``+1`` bullish, ``-1`` bearish, ``0`` neutral.
+    """
+
+    text: str
+    vote: int = 0
+
+
+def _number(value: Any) -> float | None:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _price(value: float) -> str:
+    return f"{value:,.2f}" if abs(value) >= 1 else f"{value:.6g}"
+
+
+def _money(value: float) -> str:
+    for divisor, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M")):
+        if abs(value) >= divisor:
+            return f"${value / divisor:,.2f}{suffix}"
+    return f"${value:,.0f}"
+
+
+def _sign(value: float) -> int:
+    return (value > 0) - (value < 0)
+
+
+# ---------------------------------------------------------------------------
+# Technical analysis
+# ---------------------------------------------------------------------------
+
+
+def trend_reading(close: float | None, indicators: Mapping[str, Any]) -> Reading | None:
+    """Trend from the close, 20 EMA and 50 SMA, strength from ADX."""
+
+    ema, sma, adx = (_number(indicators.get(name)) for name in ("EMA_20", "SMA_50", "ADX"))
+    pairs = [(close, ema), (close, sma), (ema, sma)]
+    votes = [_sign(a - b) for a, b in pairs if a is not None and b is not None]
+    if not votes:
+        return None
+    score = sum(votes)
+    direction = "uptrend" if score >= 2 else "downtrend" if score <= -2 else "sideways market"
+
+    levels = []
+    if close is not None and ema is not None:
+        levels.append(f"{'above' if close > ema else 'below'} the 20 EMA ({_price(ema)})")
+    if close is not None and sma is not None:
+        levels.append(f"{'above' if close > sma else 'below'} the 50 SMA ({_price(sma)})")
+    text = f"The pair is in a {direction}"
+    if close is not None and levels:
+        text += f": price {_price(close)} is " + " and ".join(levels)
+
+    if adx is not None:
+        if adx >= 40:
+            strength = "a very strong trend"
+        elif adx >= 25:
+            strength = "a strong trend"
+        elif adx >= 20:
+            strength = "a developing trend"
+        else:
+            strength = "a weak or absent trend"
+        text += f"; ADX {adx:.1f} signals {strength}"
+        if adx < 20:
+            score = 0  # moving-average alignment alone is not a trend
+    return Reading(f"{text}.", _sign(score) if abs(score) >= 2 else 0)
+
+
+def rsi_reading(indicators: Mapping[str, Any]) -> Reading | None:
+    """RSI zone; overbought and oversold are cautions rather than votes."""
+
+    rsi = _number(indicators.get("RSI"))
+    if rsi is None:
+        return None
+    if rsi >= 70:
+        return Reading(f"RSI {rsi:.1f} is overbought, so a pullback or consolidation is likely.")
+    if rsi <= 30:
+        return Reading(f"RSI {rsi:.1f} is oversold, so a relief bounce is possible.")
+    if rsi >= 55:
+        return Reading(f"RSI {rsi:.1f} shows bullish momentum with room before overbought levels.", 1)
+    if rsi <= 45:
+        return Reading(f"RSI {rsi:.1f} shows bearish momentum without being oversold.", -1)
+    return Reading(f"RSI {rsi:.1f} is neutral around the midline.")
+
+
+def macd_reading(indicators: Mapping[str, Any]) -> Reading | None:
+    """MACD line against its signal line and the zero line.
+
+    Only the latest values are available, so the reading describes which
+    side of the signal line MACD is on rather than the crossing itself.
+    """
+
+    macd, signal = _number(indicators.get("MACD")), _number(indicators.get("MACD_Signal"))
+    if macd is None or signal is None:
+        return None
+    bullish = macd > signal
+    text = (
+        f"MACD ({macd:.4g}) is {'above' if bullish else 'below'} its signal line ({signal:.4g}) "
+        f"in {'positive' if macd > 0 else 'negative'} territory, a {BULLISH if bullish else BEARISH} signal."
+    )
+    return Reading(text, 1 if bullish else -1)
+
+
+def volatility_reading(volatility: Mapping[str, Any], indicators: Mapping[str, Any]) -> Reading | None:
+    """Volatility category and index, with ATR when available."""
+
+    index = _number(volatility.get("volatility_index"))
+    category = volatility.get("volatility_category")
+    if index is None or not category:
+        return None
+    atr = _number(indicators.get("ATR"))
+    text = f"Volatility is {str(category).lower()} (index {index:.1f}/5"
+    return Reading(text + (f", ATR {_price(atr)})." if atr is not None else ")."))
+
+
+def pattern_reading(patterns: Mapping[str, Mapping[Any, Any]]) -> Reading:
+    """Candlestick patterns of ``detect_selected_patterns`` over the last candles."""
+
+    found = []
+    vote = 0
+    for name, signals in patterns.items():
+        values = [value for value in (_number(signal) for signal in signals.values()) if value]
+        if not values:
+            continue
+        signal = values[-1]
+        label = _PATTERN_NAMES.get(name, name)
+        found.append(f"{BULLISH if signal > 0 else BEARISH} {label}")
+        vote += _sign(signal)
+    if not found:
+        return Reading("No selected candlestick patterns formed in the last three candles.")
+    return Reading(f"Recent candlestick patterns: {', '.join(found)}.", _sign(vote))
+
+
+def outlook(readings: list[Reading | None]) -> str:
+    """Bullish or bearish when the votes lean at least two points one way."""
+
+    score = sum(reading.vote for reading in readings if reading is not None)
+    return BULLISH if score >= 2 else BEARISH if score <= -2 else NEUTRAL
+
+
+def _recommendation(view: str, rsi: float | None, volatility: float | None) -> str:
+    if view == BULLISH:
+        text = "Favour long exposure on pullbacks toward the 20 EMA and reassess if price closes below the 50 SMA"
+        if rsi is not None and rsi >= 70:
+            text += "; avoid chasing while RSI is overbought"
+    elif view == BEARISH:
+        text = "Reduce exposure or stay defensive until price reclaims the 20 EMA"
+        if rsi is not None and rsi <= 30:
+            text += "; avoid selling into oversold conditions"
+    else:
+        text = "Wait for a decisive break of the current range before adding exposure"
+    if volatility is not None and volatility >= 3:
+        text += ", and size positions smaller while volatility is elevated"
+    return f"{text}."
+
+
+def technical_narrative(
+    symbol: str,
+    candles: Mapping[str, Any],
+    indicators: Mapping[str, Any],
+    volatility: Mapping[str, Any],
+    patterns: Mapping[str, Mapping[Any, Any]] | None = None,
+    interval: str = "4h",
+) -> str:
+    """Standard technical summary of one pair.
+
+    Args:
+        symbol: Trading pair.
+        candles: :func:`~crypto_advisor.run_context.candle_summary` of the candles.
+        indicators: ``latest_indicators`` of ``perform_technical_analysis``.
+        volatility: Result of ``calculate_volatility_index``.
+        patterns: ``detected_patterns`` of ``detect_selected_patterns``.
+        interval: Candle interval, used in the heading.
+    """
+
+    close = _number(candles.get("last_close")) or _number(indicators.get("close"))
+    readings = [
+        trend_reading(close, indicators),
+        rsi_reading(indicators),
+        macd_reading(indicators),
+        volatility_reading(volatility, indicators),
+        pattern_reading(patterns or {}),
+    ]
+    view = outlook(readings)
+
+    heading = f"{symbol} technical summary ({interval} candles)"
+    change = _number(candles.get("change_pct"))
+    if change is not None and candles.get("count"):
+        heading += f": {change:+.2f}% over the last {candles['count']} candles"
+    lines = [f"{heading}.", *(reading.text for reading in readings if reading is not None)]
+    lines.append(
+        f"Outlook: {view}. "
+        + _recommendation(view, _number(indicators.get("RSI")), _number(volatility.get("volatility_index")))
+    )
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+# Market overview
+# ---------------------------------------------------------------------------
+
+
+def _sentiment_zone(value: float) -> int:
+    if value >= 75:
+        return -1  # extreme greed: crowded, contrarian caution
+    if value <= 25:
+        return 1  # extreme fear: contrarian opportunity
+    return 0
+
+
+def market_narrative(
+    global_data: Mapping[str, Any] | None,
+    dominance: Mapping[str, Any] | None,
+    sentiment: Mapping[str, Any] | None,
+) -> str:
+    """Standard market overview from the CoinMarketCap fetchers.
+
+    Args:
+        global_data: Result of ``fetch_coinmarketcap_global_data``.
+        dominance: Result of ``fetch_altcoin_dominance``.
+        sentiment: Result of ``fetch_fear_greed_index``.
+    """
+
+    lines = ["Crypto market overview."]
+    if global_data:
+        cap, volume = _number(global_data.get("total_market_cap")), _number(global_data.get("total_volume_24h"))
+        btc, eth = _number(global_data.get("btc_dominance")), _number(global_data.get("eth_dominance"))
+        parts = []
+        if cap is not None:
+            parts.append(f"total market capitalisation is {_money(cap)}")
+        if volume is not None:
+            parts.append(f"24h volume {_money(volume)}")
+        if btc is not None and eth is not None:
+            parts.append(f"Bitcoin dominance {btc:.1f}% and Ethereum {eth:.1f}%")
+        if parts:
+            text = ", ".join(parts)
+            lines.append(f"{text[0].upper()}{text[1:]}.")
+
+    flow = None
+    if dominance:
+        analysis = dominance.get("analysis") or {}
+        change = _number(analysis.get("btc_dominance_change"))
+        if change is not None:
+            days = analysis.get("period_days")
+            period = f" over {days} days" if days else ""
+            flow = "bitcoin" if change > 0 else "altcoins"
+            lines.append(
+                f"Bitcoin dominance {'rose' if change > 0 else 'fell'} {abs(change):.2f} points{period}: "
+                f"capital is rotating into {'Bitcoin' if change > 0 else 'altcoins'}."
+            )
+
+    mood = None
+    if sentiment:
+        current = sentiment.get("current") or {}
+        value = _number(current.get("value"))
+        if value is not None:
+            trend = (sentiment.get("analysis") or {}).get("sentiment_trend")
+            text = f"The Fear & Greed Index reads {value:.0f} ({current.get('classification', 'n/a')})"
+            if trend and trend != "neutral":
+                text += f" and sentiment is {trend}"
+            lines.append(f"{text}.")
+            mood = _sentiment_zone(value)
+
+    if flow is None and mood is None:
+        takeaway = "Not enough data for a directional takeaway."
+    elif mood == 1:
+        takeaway = "Extreme fear has historically offered better entries; accumulate gradually with tight risk limits."
+    elif mood == -1:
+        takeaway = "Extreme greed leaves the market crowded; take partial profits and avoid leverage."
+    elif flow == "bitcoin":
+        takeaway = "Risk appetite is defensive; favour Bitcoin over smaller caps until dominance turns."
+    elif flow == "altcoins":
+        takeaway = "Risk appetite is broadening; altcoins may outperform while dominance keeps falling."
+    else:
+        takeaway = "Sentiment is balanced; hold core positions and wait for confirmation."
+    lines.append(f"Takeaway: {takeaway}")
+    return "\n".join(lines)
@@ -0,0 +1,275 @@
+"""Scheduled precomputation of advisor reports.
+
+Most traffic asks for the market overview and the technical analysis of a
+few dozen symbols, and those answers only change when a candle closes.
+:class:`Precomputer` runs the workflows of a configured watchlist shortly
+after every relevant close and keeps the finished reports in a
+:class:`ReportStore` together with the close time of the data they were
+computed from.  A stored report is *fresh* while no newer candle of its
+interval has closed; the API answers from fresh reports, so a common request
+costs a dictionary lookup.
+
+Each report is due ``delay`` seconds after the close plus a random jitter of
+up to ``jitter`` seconds, drawn once per close, so a watchlist does not hit
+the upstream APIs in one burst; at most ``concurrency`` runs execute at once.
+A failed run is retried after :data:`RETRY_SECONDS`.  Configuration:
+
+* ``CRYPTO_ADVISOR_PRECOMPUTE_SYMBOLS`` – comma-separated pairs whose
+  technical analysis is precomputed.
+* ``CRYPTO_ADVISOR_PRECOMPUTE_MARKET`` – set to ``1`` to precompute the
+  market overview (default parameters).
+* ``CRYPTO_ADVISOR_PRECOMPUTE_DELAY`` (5 s), ``CRYPTO_ADVISOR_PRECOMPUTE_JITTER``
+  (30 s) and ``CRYPTO_ADVISOR_PRECOMPUTE_CONCURRENCY`` (2).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Mapping
+
+from crypto_advisor.services.response_cache import ResponseCache
+from crypto_advisor.utils.http_cache import candle_bounds
+
+MARKET_OVERVIEW = "market_overview"
+TECHNICAL_ANALYSIS = "technical_analysis"
+
+# Seconds before a failed run is attempted again.
+RETRY_SECONDS = 60.0
+# Upper bound of one scheduler sleep, so clock jumps are picked up.
+MAX_SLEEP_SECONDS = 30.0
+
+ReportRunner = Callable[[str, Mapping[str, Any]], Awaitable[str]]
+
+
+def _utc_now(now: datetime | None) -> datetime:
+    return now or datetime.now(timezone.utc)
+
+
+@dataclass(frozen=True)
+class ScheduledReport:
+    """A workflow invocation refreshed after every close of ``interval``."""
+
+    workflow: str
+    params: Mapping[str, Any]
+    interval: str
+
+    @property
+    def key(self) -> str:  # noqa: D102
+        return ResponseCache.make_key(self.workflow, self.params)
+
+
+@dataclass
+class PrecomputedReport:
+    """A finished advisor message and the close time of its data."""
+
+    workflow: str
+    params: dict[str, Any]
+    message: str
+    data_time: str
+    computed_at: float
+    duration: float
+
+
+class ReportStore:
+    """Thread-safe in-process store of precomputed reports."""
+
+    def __init__(self) -> None:
+        self._reports: dict[str, PrecomputedReport] = {}
+        self._lock = threading.Lock()
+
+    def get(self, workflow: str, params: Mapping[str, Any]) -> PrecomputedReport | None:  # noqa: D102
+        with self._lock:
+            return self._reports.get(ResponseCache.make_key(workflow, params))
+
+    def put(self, report: PrecomputedReport) -> None:  # noqa: D102
+        with self._lock:
+            self._reports[ResponseCache.make_key(report.workflow, report.params)] = report
+
+    def fresh(
+        self,
+        workflow: str,
+        params: Mapping[str, Any],
+        interval: str,
+        now: datetime | None = None,
+    ) -> PrecomputedReport | None:
+        """Return the stored report unless a candle of ``interval`` closed since it was computed."""
+
+        report = self.get(workflow, params)
+        if report is None or report.data_time != candle_bounds(interval, _utc_now(now))[0].isoformat():
+            return None
+        return report
+
+
+class Precomputer:
+    """Refresh the reports of ``schedule`` after each candle close.
+
+    Args:
+        schedule: Reports to keep fresh.
+        runner: Coroutine function executing ``(workflow, params)`` and
+            returning the final advisor message.
+        store: Where finished reports are kept.
+        delay: Seconds after a close before a report is due.
+        jitter: Upper bound of the random extra delay per report and close.
+        concurrency: Maximum number of simultaneous runs.
+    """
+
+    def __init__(
+        self,
+        schedule: list[ScheduledReport],
+        runner: ReportRunner,
+        store: ReportStore | None = None,
+        delay: float = 5.0,
+        jitter: float = 30.0,
+        concurrency: int = 2,
+    ) -> None:
+        self.schedule = schedule
+        self.runner = runner
+        self.store = store or ReportStore()
+        self.delay = delay
+        self.jitter = jitter
+        self.concurrency = concurrency
+        self.errors: dict[str, str] = {}
+        self._keys = {item.key for item in schedule}
+        # Report key -> (close time, delay plus jitter) of the pending run.
+        self._offsets: dict[str, tuple[datetime, float]] = {}
+        self._retry_at: dict[str, float] = {}
+        self._running: set[str] = set()
+
+    def scheduled(self, workflow: str, params: Mapping[str, Any]) -> bool:
+        """Whether the report of ``workflow``/``params`` is precomputed."""
+
+        return ResponseCache.make_key(workflow, params) in self._keys
+
+    def _offset(self, item: ScheduledReport, close: datetime) -> float:
+        offset = self._offsets.get(item.key)
+        if offset is None or offset[0] != close:
+            offset = (close, self.delay + random.uniform(0, self.jitter))
+            self._offsets[item.key] = offset
+        return offset[1]
+
+    def due_at(self, item: ScheduledReport, now: datetime | None = None) -> float:
+        """Unix time at which ``item`` is next computed."""
+
+        now = _utc_now(now)
+        last_close, next_close = candle_bounds(item.interval, now)
+        fresh = self.store.fresh(item.workflow, item.params, item.interval, now) is not None
+        close = next_close if fresh else last_close
+        return max(close.timestamp() + self._offset(item, close), self._retry_at.get(item.key, 0.0))
+
+    def due(self, now: datetime | None = None) -> list[ScheduledReport]:
+        """Reports whose time has come and that are not already running."""
+
+        now = _utc_now(now)
+        return [
+            item
+            for item in self.schedule
+            if item.key not in self._running and self.due_at(item, now) <= now.timestamp()
+        ]
+
+    async def _refresh(self, item: ScheduledReport, semaphore: asyncio.Semaphore, now: datetime | None) -> None:
+        self._running.add(item.key)
+        try:
+            async with semaphore:
+                data_time = candle_bounds(item.interval, _utc_now(now))[0]
+                started = time.perf_counter()
+                message = await self.runner(item.workflow, item.params)
+        except Exception as exc:  # noqa: BLE001 – retried after RETRY_SECONDS
+            self.errors[item.key] = str(exc)
+            self._retry_at[item.key] = _utc_now(now).timestamp() + RETRY_SECONDS
+            print(f"Precomputing {item.key} failed: {exc}")
+            return
+        finally:
+            self._running.discard(item.key)
+
+        self.errors.pop(item.key, None)
+        self._retry_at.pop(item.key, None)
+        self.store.put(
+            PrecomputedReport(
+                workflow=item.workflow,
+                params=dict(item.params),
+                message=message,
+                data_time=data_time.isoformat(),
+                computed_at=time.time(),
+                duration=round(time.perf_counter() - started, 3),
+            )
+        )
+
+    async def run_once(self, now: datetime | None = None) -> int:
+        """Compute every due report; returns the number of runs started."""
+
+        items = self.due(now)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self._refresh(item, semaphore, now) for item in items))
+        return len(items)
+
+    async def run_forever(self) -> None:
+        """Keep the reports fresh until cancelled."""
+
+        while True:
+            await self.run_once()
+            now = datetime.now(timezone.utc)
+            wake = min((self.due_at(item, now) for item in self.schedule), default=now.timestamp())
+            await asyncio.sleep(min(MAX_SLEEP_SECONDS, max(1.0, wake - now.timestamp())))
+
+    def fresh(self, workflow: str, params: Mapping[str, Any], interval: str) -> PrecomputedReport | None:
+        """Fresh stored report for a request, if its parameters are scheduled."""
+
+        if not self.scheduled(workflow, params):
+            return None
+        return self.store.fresh(workflow, params, interval)
+
+    def status(self, now: datetime | None = None) -> list[dict[str, Any]]:
+        """Freshness, last run and next run of every scheduled report."""
+
+        now = _utc_now(now)
+        rows = []
+        for item in self.schedule:
+            report = self.store.get(item.workflow, item.params)
+            rows.append(
+                {
+                    "workflow": item.workflow,
+                    "params": dict(item.params),
+                    "fresh": self.store.fresh(item.workflow, item.params, item.interval, now) is not None,
+                    "running": item.key in self._running,
+                    "last_run": {k: v for k, v in asdict(report).items() if k != "message"} if report else None,
+                    "next_run": datetime.fromtimestamp(self.due_at(item, now), timezone.utc).isoformat(),
+                    "error": self.errors.get(item.key),
+                }
+            )
+        return rows
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+
+def precompute_symbols() -> list[str]:
+    """Symbols from ``CRYPTO_ADVISOR_PRECOMPUTE_SYMBOLS``."""
+
+    raw = os.getenv("CRYPTO_ADVISOR_PRECOMPUTE_SYMBOLS", "")
+    return list(dict.fromkeys(symbol.strip().upper() for symbol in raw.split(",") if symbol.strip()))
+
+
+def precompute_market() -> bool:
+    """Whether ``CRYPTO_ADVISOR_PRECOMPUTE_MARKET`` enables the market overview."""
+
+    return os.getenv("CRYPTO_ADVISOR_PRECOMPUTE_MARKET", "0").lower() in {"1", "true", "on", "yes"}
+
+
+def build_precomputer(schedule: list[ScheduledReport], runner: ReportRunner) -> Precomputer:
+    """Create a :class:`Precomputer` from the ``CRYPTO_ADVISOR_PRECOMPUTE_*`` variables."""
+
+    return Precomputer(
+        schedule,
+        runner,
+        delay=float(os.getenv("CRYPTO_ADVISOR_PRECOMPUTE_DELAY", "5")),
+        jitter=float(os.getenv("CRYPTO_ADVISOR_PRECOMPUTE_JITTER", "30")),
+        concurrency=int(os.getenv("CRYPTO_ADVISOR_PRECOMPUTE_CONCURRENCY", "2")),
+    )
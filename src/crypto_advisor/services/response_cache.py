@@ -0,0 +1,352 @@
+"""Data-fingerprinted cache for LLM advisor responses.
+
+The ``agent`` node of every workflow is by far the slowest and most expensive
+step, yet its inputs only change when new market data arrives (e.g. when the
+next 4h candle closes).  This module caches the final LLM message keyed by
+
+* the workflow name (``"technical_analysis"``, ``"market_overview"``),
+* the workflow parameters (symbol, interval, days, …), and
+* a fingerprint of the data fetched into ``GraphState``.
+
+Storage is pluggable: :class:`InMemoryLRUBackend` (default) keeps a bounded
+number of entries per process, :class:`DiskBackend` persists JSON files in a
+local directory and :class:`SharedBackend` shares entries between all worker
+processes on the machine through
+:class:`~crypto_advisor.services.shared_cache.SharedCache`.  The backend is
+selected through environment variables:
+
+* ``CRYPTO_ADVISOR_RESPONSE_CACHE`` – ``memory`` (default), ``disk``,
+  ``shared`` or ``off``.
+* ``CRYPTO_ADVISOR_RESPONSE_CACHE_DIR`` – directory for the disk backend.
+* ``CRYPTO_ADVISOR_RESPONSE_CACHE_SIZE`` – maximum entries of the LRU backend.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Protocol
+
+from crypto_advisor.providers.binance import interval_to_seconds
+from crypto_advisor.services.shared_cache import SharedCache, open_shared_cache
+
+DEFAULT_CACHE_DIR = ".cache/responses"
+DEFAULT_MAX_ENTRIES = 256
+
+# Keys whose values change on every request without the underlying data
+# changing (e.g. countdown to the next Fear & Greed update).
+_VOLATILE_KEYS = frozenset({"time_until_update"})
+
+
+@dataclass
+class CachedResponse:
+    """A single cached LLM answer together with the data it was computed from."""
+
+    fingerprint: str
+    message: str
+    created_at: float
+
+
+class ResponseCacheBackend(Protocol):
+    """Minimal key/value interface implemented by every storage backend."""
+
+    def get(self, key: str) -> CachedResponse | None:  # noqa: D102
+        ...
+
+    def set(self, key: str, entry: CachedResponse) -> None:  # noqa: D102
+        ...
+
+    def delete(self, key: str) -> None:  # noqa: D102
+        ...
+
+    def keys(self) -> Iterator[str]:  # noqa: D102
+        ...
+
+    def clear(self) -> None:  # noqa: D102
+        ...
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+class InMemoryLRUBackend:
+    """Thread-safe, size-bounded in-process backend with LRU eviction."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> CachedResponse | None:  # noqa: D102
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CachedResponse) -> None:  # noqa: D102
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:  # noqa: D102
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def keys(self) -> Iterator[str]:  # noqa: D102
+        with self._lock:
+            return iter(list(self._entries))
+
+    def clear(self) -> None:  # noqa: D102
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskBackend:
+    """Backend storing one JSON document per key in a local directory."""
+
+    def __init__(self, directory: str | os.PathLike[str] = DEFAULT_CACHE_DIR) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def get(self, key: str) -> CachedResponse | None:  # noqa: D102
+        try:
+            payload = json.loads(self._path(key).read_text())
+        except (OSError, ValueError):
+            return None
+        return CachedResponse(**payload["entry"])
+
+    def set(self, key: str, entry: CachedResponse) -> None:  # noqa: D102
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps({"key": key, "entry": asdict(entry)}))
+        os.replace(tmp_path, path)  # atomic on POSIX and Windows
+
+    def delete(self, key: str) -> None:  # noqa: D102
+        self._path(key).unlink(missing_ok=True)
+
+    def keys(self) -> Iterator[str]:  # noqa: D102
+        for path in self.directory.glob("*.json"):
+            try:
+                yield json.loads(path.read_text())["key"]
+            except (OSError, ValueError, KeyError):
+                continue
+
+    def clear(self) -> None:  # noqa: D102
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+
+class SharedBackend:
+    """Backend storing entries in the cross-process :class:`SharedCache`."""
+
+    prefix = "response|"
+
+    def __init__(self, cache: SharedCache) -> None:
+        self.cache = cache
+
+    def get(self, key: str) -> CachedResponse | None:  # noqa: D102
+        return self.cache.get(self.prefix + key)
+
+    def set(self, key: str, entry: CachedResponse) -> None:  # noqa: D102
+        self.cache.set(self.prefix + key, entry)
+
+    def delete(self, key: str) -> None:  # noqa: D102
+        self.cache.delete(self.prefix + key)
+
+    def keys(self) -> Iterator[str]:  # noqa: D102
+        return iter([key[len(self.prefix) :] for key in self.cache.keys() if key.startswith(self.prefix)])
+
+    def clear(self) -> None:  # noqa: D102
+        for key in list(self.keys()):
+            self.delete(key)
+
+
+# ---------------------------------------------------------------------------
+# Cache facade
+# ---------------------------------------------------------------------------
+
+
+class ResponseCache:
+    """Workflow-aware facade on top of a :class:`ResponseCacheBackend`."""
+
+    def __init__(self, backend: ResponseCacheBackend) -> None:
+        self.backend = backend
+
+    @staticmethod
+    def make_key(workflow: str, params: Mapping[str, Any]) -> str:
+        """Build the storage key for a workflow invocation."""
+
+        return f"{workflow}|{json.dumps(dict(params), sort_keys=True, default=str)}"
+
+    def lookup(self, workflow: str, params: Mapping[str, Any], fingerprint: str) -> str | None:
+        """Return the cached message if it was computed from identical data.
+
+        A stored entry whose fingerprint differs from ``fingerprint`` means new
+        data (e.g. a freshly closed candle) has arrived; it is invalidated and
+        ``None`` is returned.
+        """
+
+        key = self.make_key(workflow, params)
+        entry = self.backend.get(key)
+        if entry is None:
+            return None
+        if entry.fingerprint != fingerprint:
+            self.backend.delete(key)
+            return None
+        return entry.message
+
+    def store(self, workflow: str, params: Mapping[str, Any], fingerprint: str, message: str) -> None:
+        """Persist ``message`` for the given workflow, parameters and data."""
+
+        entry = CachedResponse(fingerprint=fingerprint, message=message, created_at=time.time())
+        self.backend.set(self.make_key(workflow, params), entry)
+
+    def invalidate(self, workflow: str | None = None, params: Mapping[str, Any] | None = None) -> None:
+        """Drop cached responses.
+
+        Args:
+            workflow: Restrict invalidation to this workflow.  ``None`` clears
+                the whole cache.
+            params: Restrict invalidation to a single parameter set of
+                ``workflow``.
+        """
+
+        if workflow is None:
+            self.backend.clear()
+            return
+        if params is not None:
+            self.backend.delete(self.make_key(workflow, params))
+            return
+        prefix = f"{workflow}|"
+        for key in list(self.backend.keys()):
+            if key.startswith(prefix):
+                self.backend.delete(key)
+
+
+# ---------------------------------------------------------------------------
+# Fingerprinting
+# ---------------------------------------------------------------------------
+
+
+def _normalise(value: Any) -> Any:
+    """Recursively drop volatile keys so they do not affect the fingerprint."""
+
+    if isinstance(value, Mapping):
+        return {k: _normalise(v) for k, v in value.items() if k not in _VOLATILE_KEYS}
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    return value
+
+
+def _candle_time(candle: Mapping[str, Any]) -> datetime:
+    value = candle["time"]
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
+
+
+def closed_candles(candles: list[dict], interval: str, now: datetime | None = None) -> list[dict]:
+    """Return ``candles`` without the trailing, still-forming candle.
+
+    Binance always includes the current (open) kline as the last element.  Its
+    close price changes on every tick, so it must not take part in the
+    fingerprint – otherwise no two requests within a candle would match.
+    """
+
+    if not candles:
+        return candles
+    now = now or datetime.now()
+    last_open = _candle_time(candles[-1])
+    if last_open + timedelta(seconds=interval_to_seconds(interval)) > now:
+        return candles[:-1]
+    return candles
+
+
+def fingerprint_inputs(state: Mapping[str, Any], interval: str | None = None, now: datetime | None = None) -> str:
+    """Compute a stable digest of the market data held in ``state``.
+
+    Candles are reduced to closed candles when ``interval`` is given.  The
+    derived ``indicators`` and ``volatility`` fields are deterministic
+    functions of the candles, so they only contribute when no candles are
+    present.  The request-time ``timestamp`` of ``global_data`` is ignored.
+    """
+
+    candles = state.get("candles")
+    if candles and interval:
+        candles = closed_candles(candles, interval, now)
+
+    global_data = state.get("global_data")
+    if global_data:
+        global_data = {k: v for k, v in global_data.items() if k != "timestamp"}
+
+    material: dict[str, Any] = {
+        "candles": candles,
+        "global_data": global_data,
+        "dominance": state.get("dominance"),
+        "sentiment": state.get("sentiment"),
+    }
+    if not candles:
+        material["indicators"] = state.get("indicators")
+        material["volatility"] = state.get("volatility")
+
+    encoded = json.dumps(_normalise(material), sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------------
+
+
+_cache: ResponseCache | None = None
+_cache_built = False
+_cache_lock = threading.Lock()
+
+
+def build_response_cache() -> ResponseCache | None:
+    """Create a cache from the ``CRYPTO_ADVISOR_RESPONSE_CACHE*`` variables.
+
+    Returns:
+        A configured :class:`ResponseCache`, or ``None`` when caching is off.
+
+    Raises:
+        ValueError: If an unknown backend name is configured.
+    """
+
+    backend_name = os.getenv("CRYPTO_ADVISOR_RESPONSE_CACHE", "memory").lower()
+    if backend_name in {"off", "none", ""}:
+        return None
+    if backend_name == "memory":
+        max_entries = int(os.getenv("CRYPTO_ADVISOR_RESPONSE_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+        return ResponseCache(InMemoryLRUBackend(max_entries))
+    if backend_name == "disk":
+        return ResponseCache(DiskBackend(os.getenv("CRYPTO_ADVISOR_RESPONSE_CACHE_DIR", DEFAULT_CACHE_DIR)))
+    if backend_name == "shared":
+        return ResponseCache(SharedBackend(open_shared_cache()))
+    raise ValueError(f"Unknown response cache backend: {backend_name}")
+
+
+def get_response_cache() -> ResponseCache | None:
+    """Return the lazily created process-wide response cache."""
+
+    global _cache, _cache_built  # noqa: PLW0603
+    with _cache_lock:
+        if not _cache_built:
+            _cache = build_response_cache()
+            _cache_built = True
+        return _cache
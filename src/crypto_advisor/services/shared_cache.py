@@ -0,0 +1,268 @@
+"""Cross-process cache shared by all workers on one machine.
+
+With several uvicorn workers per host, per-process caches are duplicated and
+warmed once per worker, and every worker calls the upstream APIs on its own.
+:class:`SharedCache` stores entries in a local SQLite database (WAL mode), so
+all processes on the machine see the same entries without an external
+service.
+
+* **Atomic fill** – :meth:`SharedCache.get_or_fill` lets exactly one process
+  compute a missing entry.  The filler holds a lease row; other processes
+  poll for the value until the lease is released, and take the lease over if
+  its holder died (lease older than ``lease_timeout``).
+* **Bounded size** – after each write, entries beyond ``max_entries`` are
+  evicted, expired ones first, then the oldest.
+
+Values are pickled; the database is a private local file, not an exchange
+format.  Configuration:
+
+* ``CRYPTO_ADVISOR_SHARED_CACHE`` – path of the database.  Enables caching of
+  provider responses (see :func:`shared_cached`); unset disables it.
+* ``CRYPTO_ADVISOR_SHARED_CACHE_SIZE`` – maximum number of entries (1024).
+
+Setting ``CRYPTO_ADVISOR_RESPONSE_CACHE=shared`` stores LLM responses in the
+same database.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Iterator, TypeVar
+
+from crypto_advisor.metrics import CACHE_LOOKUPS
+
+DEFAULT_SHARED_CACHE_PATH = ".cache/shared.sqlite3"
+DEFAULT_MAX_ENTRIES = 1024
+
+T = TypeVar("T")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS entries_created_at ON entries (created_at);
+CREATE TABLE IF NOT EXISTS fills (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    started_at REAL NOT NULL
+);
+"""
+
+
+class SharedCache:
+    """SQLite-backed key/value cache safe to use from many processes and threads.
+
+    Args:
+        path: Database file; created if missing.
+        max_entries: Upper bound on stored entries.
+        lease_timeout: Seconds after which a fill lease is considered abandoned.
+        poll_interval: Seconds between checks while waiting for another filler.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] = DEFAULT_SHARED_CACHE_PATH,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        lease_timeout: float = 60.0,
+        poll_interval: float = 0.05,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self._owner = uuid.uuid4().hex
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ------------------------------------------------------------------
+    # Plain key/value access
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the live value stored under ``key`` or ``default``."""
+
+        row = self._conn().execute(
+            "SELECT value FROM entries WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return default if row is None else pickle.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``, optionally expiring after ``ttl`` seconds."""
+
+        now = time.time()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO entries (key, value, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now, None if ttl is None else now + ttl),
+        )
+        self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return
+        conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "  SELECT key FROM entries"
+            "  ORDER BY (expires_at IS NOT NULL AND expires_at <= ?) DESC, created_at"
+            "  LIMIT ?"
+            ")",
+            (now, excess),
+        )
+
+    def delete(self, key: str) -> None:  # noqa: D102
+        self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def keys(self) -> Iterator[str]:  # noqa: D102
+        rows = self._conn().execute("SELECT key FROM entries").fetchall()
+        return iter([key for (key,) in rows])
+
+    def clear(self) -> None:  # noqa: D102
+        self._conn().execute("DELETE FROM entries")
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Atomic fill
+    # ------------------------------------------------------------------
+
+    def _try_lease(self, key: str) -> bool:
+        now = time.time()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT started_at FROM fills WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] + self.lease_timeout > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO fills (key, owner, started_at) VALUES (?, ?, ?)",
+                (key, self._owner, now),
+            )
+            return True
+        finally:
+            conn.execute("COMMIT")
+
+    def _lease_held(self, key: str) -> bool:
+        row = self._conn().execute("SELECT started_at FROM fills WHERE key = ?", (key,)).fetchone()
+        return row is not None and row[0] + self.lease_timeout > time.time()
+
+    def _release(self, key: str) -> None:
+        self._conn().execute("DELETE FROM fills WHERE key = ? AND owner = ?", (key, self._owner))
+
+    def get_or_fill(self, key: str, compute: Callable[[], T], ttl: float | None = None) -> T:
+        """Return the cached value or compute it in exactly one process.
+
+        Processes that find another filler at work wait for its result.  If
+        the filler fails (no value appears once its lease is released), the
+        next waiter takes the lease and computes the value itself.
+        """
+
+        missing = object()
+        while True:
+            value = self.get(key, missing)
+            if value is not missing:
+                CACHE_LOOKUPS.inc(cache="shared", result="hit")
+                return value
+            if self._try_lease(key):
+                break
+            while self._lease_held(key):
+                time.sleep(self.poll_interval)
+                value = self.get(key, missing)
+                if value is not missing:
+                    CACHE_LOOKUPS.inc(cache="shared", result="hit")
+                    return value
+
+        try:
+            # Another process may have filled the entry between get and lease.
+            value = self.get(key, missing)
+            if value is missing:
+                CACHE_LOOKUPS.inc(cache="shared", result="miss")
+                value = compute()
+                self.set(key, value, ttl)
+            return value
+        finally:
+            self._release(key)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide instance and provider decorator
+# ---------------------------------------------------------------------------
+
+
+_shared: dict[str, SharedCache] = {}
+_shared_lock = threading.Lock()
+
+
+def open_shared_cache(path: str | os.PathLike[str] | None = None) -> SharedCache:
+    """Return the process-wide :class:`SharedCache` for ``path``.
+
+    ``path`` defaults to ``CRYPTO_ADVISOR_SHARED_CACHE`` or
+    :data:`DEFAULT_SHARED_CACHE_PATH`.
+    """
+
+    path = str(path or os.getenv("CRYPTO_ADVISOR_SHARED_CACHE") or DEFAULT_SHARED_CACHE_PATH)
+    with _shared_lock:
+        if path not in _shared:
+            max_entries = int(os.getenv("CRYPTO_ADVISOR_SHARED_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+            _shared[path] = SharedCache(path, max_entries=max_entries)
+        return _shared[path]
+
+
+def get_shared_cache() -> SharedCache | None:
+    """Return the shared cache if ``CRYPTO_ADVISOR_SHARED_CACHE`` is set."""
+
+    if not os.getenv("CRYPTO_ADVISOR_SHARED_CACHE"):
+        return None
+    return open_shared_cache()
+
+
+def shared_cached(namespace: str, ttl: float) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Cache a provider function's results in the shared cache.
+
+    Calls are keyed by ``namespace`` and the bound arguments (defaults
+    applied), so positional and keyword spellings share an entry.  Without a
+    configured shared cache the function is called directly.
+    """
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            cache = get_shared_cache()
+            if cache is None:
+                return func(*args, **kwargs)
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = f"{namespace}|{json.dumps(bound.arguments, sort_keys=True, default=str)}"
+            return cache.get_or_fill(key, lambda: func(*args, **kwargs), ttl=ttl)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,242 @@
+"""Optional process-pool execution of the ``ta_service`` functions.
+
+The indicator, volatility and pattern code is CPU-bound pandas work that holds
+the GIL, so in the default ``thread`` mode concurrent analyses in the server's
+worker threads run one at a time and delay everything else in the process.
+In ``process`` mode the same calls are dispatched to a warm pool of worker
+processes:
+
+* the candles are validated and packed into one
+  :class:`~multiprocessing.shared_memory.SharedMemory` block (``int64``
+  nanosecond times followed by a ``float64`` OHLCV matrix) instead of
+  pickling a list of dicts;
+* the worker attaches to the block, runs the unchanged ``ta_service``
+  function on the columns and returns its result in the usual dict shape;
+* the caller unlinks the block once the result is back.
+
+The functions of this module mirror ``ta_service`` and are drop-in
+replacements for callers.  Configuration:
+
+* ``CRYPTO_ADVISOR_TA_EXECUTOR`` – ``thread`` (default, run in the calling
+  thread) or ``process``.
+* ``CRYPTO_ADVISOR_TA_WORKERS`` – pool size (default: CPU count).
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any
+
+import numpy as np
+
+from crypto_advisor import tracing
+from crypto_advisor.api.models.candles import NUMERIC_COLUMNS, validate_ohlcv
+from crypto_advisor.metrics import TA_SECONDS
+from crypto_advisor.services import ta_service
+
+THREAD = "thread"
+PROCESS = "process"
+
+_FUNCTIONS = frozenset({"perform_technical_analysis", "calculate_volatility_index", "detect_selected_patterns"})
+
+
+def executor_mode() -> str:
+    """Mode selected by ``CRYPTO_ADVISOR_TA_EXECUTOR``."""
+
+    mode = os.getenv("CRYPTO_ADVISOR_TA_EXECUTOR", THREAD).lower()
+    if mode not in (THREAD, PROCESS):
+        raise ValueError(f"Unknown CRYPTO_ADVISOR_TA_EXECUTOR: {mode}")
+    return mode
+
+
+def _workers() -> int:
+    return int(os.getenv("CRYPTO_ADVISOR_TA_WORKERS", "0")) or os.cpu_count() or 1
+
+
+# ---------------------------------------------------------------------------
+# Shared-memory candle buffers
+# ---------------------------------------------------------------------------
+
+
+def pack_candles(candles: Any) -> tuple[SharedMemory, int]:
+    """Validate ``candles`` and copy them into a new shared-memory block.
+
+    Returns:
+        The block (owned by the caller, who must ``close`` and ``unlink`` it)
+        and the number of rows.
+    """
+
+    columns = validate_ohlcv(candles)
+    rows = len(columns["time"])
+    block = SharedMemory(create=True, size=rows * 8 * (1 + len(NUMERIC_COLUMNS)))
+    times = np.ndarray((rows,), dtype=np.int64, buffer=block.buf)
+    values = np.ndarray((rows, len(NUMERIC_COLUMNS)), dtype=np.float64, buffer=block.buf, offset=rows * 8)
+    times[:] = columns["time"].view(np.int64)
+    for index, column in enumerate(NUMERIC_COLUMNS):
+        values[:, index] = columns[column]
+    del times, values  # release the buffer exports
+    return block, rows
+
+
+def unpack_candles(block: SharedMemory, rows: int) -> dict[str, np.ndarray]:
+    """Copy the columns of a block written by :func:`pack_candles`."""
+
+    times = np.ndarray((rows,), dtype=np.int64, buffer=block.buf)
+    values = np.ndarray((rows, len(NUMERIC_COLUMNS)), dtype=np.float64, buffer=block.buf, offset=rows * 8)
+    columns = {"time": times.view("datetime64[ns]").copy()}
+    for index, column in enumerate(NUMERIC_COLUMNS):
+        columns[column] = values[:, index].copy()
+    del times, values
+    return columns
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+
+def _warm_worker() -> None:
+    """Pool initializer: pay the first-call overhead of the TA libraries."""
+
+    rows = 60
+    closes = 100 + np.sin(np.arange(rows) / 5)
+    columns = {
+        "time": np.datetime64("2024-01-01T00:00", "ns") + np.arange(rows) * np.timedelta64(1, "h"),
+        "open": closes - 0.2,
+        "high": closes + 1,
+        "low": closes - 1,
+        "close": closes,
+        "volume": np.full(rows, 1000.0),
+    }
+    for function in sorted(_FUNCTIONS):
+        try:
+            getattr(ta_service, function)(columns)
+        except Exception:  # noqa: BLE001 – warm-up only
+            pass
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _run_in_worker(function: str, name: str, rows: int) -> dict:
+    # Workers share the parent's resource tracker, so attaching does not
+    # make them owners of the block; the caller unlinks it.
+    block = SharedMemory(name=name)
+    try:
+        columns = unpack_candles(block, rows)
+    finally:
+        block.close()
+    return getattr(ta_service, function)(columns)
+
+
+# ---------------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------------
+
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the lazily created process-wide pool."""
+
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_workers(),
+                # ``spawn`` – forking a multi-threaded server is unsafe.
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+        return _pool
+
+
+def start_pool() -> int:
+    """Start and warm every worker of the pool.
+
+    Returns:
+        Number of distinct worker processes that answered.
+    """
+
+    pool = get_pool()
+    futures = [pool.submit(_ping) for _ in range(_workers())]
+    return len({future.result() for future in futures})
+
+
+def shutdown_pool() -> None:
+    """Stop the pool, if it was started."""
+
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """Drop ``pool`` so that the next :func:`get_pool` builds a new one."""
+
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit(function: str, name: str, rows: int) -> dict:
+    """Run one call in the pool, rebuilding the pool once if a worker died."""
+
+    pool = get_pool()
+    try:
+        return pool.submit(_run_in_worker, function, name, rows).result()
+    except BrokenProcessPool as exc:
+        print(f"TA process pool is broken ({exc}), restarting it and retrying {function}")
+        _discard_pool(pool)
+        return get_pool().submit(_run_in_worker, function, name, rows).result()
+
+
+def run(function: str, candles: Any) -> dict:
+    """Run ``ta_service.<function>`` on ``candles`` according to :func:`executor_mode`."""
+
+    if function not in _FUNCTIONS:
+        raise ValueError(f"Unknown ta_service function: {function}")
+    mode = executor_mode()
+    with tracing.span(f"ta:{function}", "ta", executor=mode):
+        if mode == THREAD:
+            return getattr(ta_service, function)(candles)
+
+        started = time.perf_counter()
+        block, rows = pack_candles(candles)
+        try:
+            return _submit(function, block.name, rows)
+        finally:
+            block.close()
+            block.unlink()
+            TA_SECONDS.observe(time.perf_counter() - started, function=function)
+
+
+def perform_technical_analysis(candlestick_data: Any) -> dict:
+    """:func:`ta_service.perform_technical_analysis` via the configured executor."""
+
+    return run("perform_technical_analysis", candlestick_data)
+
+
+def calculate_volatility_index(candlestick_data: Any) -> dict:
+    """:func:`ta_service.calculate_volatility_index` via the configured executor."""
+
+    return run("calculate_volatility_index", candlestick_data)
+
+
+def detect_selected_patterns(candlestick_data: Any) -> dict:
+    """:func:`ta_service.detect_selected_patterns` via the configured executor."""
+
+    return run("detect_selected_patterns", candlestick_data)
@@ -2,6 +2,9 @@ import pandas as pd
 import ta
 import pandas_ta as pta
 
+from crypto_advisor.metrics import TA_SECONDS, timed
+
+@timed(TA_SECONDS, function="calculate_trend_indicators")
 def calculate_trend_indicators(df):
     """Calculate trend indicators for a DataFrame of candlestick data."""
     df["SMA_50"] = ta.trend.sma_indicator(df["close"], window=50)  # 50-period SMA
@@ -9,6 +12,7 @@ def calculate_trend_indicators(df):
     df["ADX"] = ta.trend.adx(df["high"], df["low"], df["close"], window=14)  # ADX Trend Strength
     return df
 
+@timed(TA_SECONDS, function="calculate_momentum_indicators")
 def calculate_momentum_indicators(df):
     """Calculate momentum indicators for a DataFrame of candlestick data."""
     df["RSI"] = ta.momentum.rsi(df["close"], window=14)  # RSI with 14 periods
@@ -23,6 +27,7 @@ def calculate_momentum_indicators(df):
     df["MACD_Signal"] = ta.trend.macd_signal(df["close"])  # MACD signal line
     return df
 
+@timed(TA_SECONDS, function="calculate_volatility_indicators")
 def calculate_volatility_indicators(df):
     """Calculate volatility indicators for a DataFrame of candlestick data."""
     indicator_bb = ta.volatility.BollingerBands(close=df["close"], window=20, window_dev=2)
@@ -31,6 +36,7 @@ def calculate_volatility_indicators(df):
     df["ATR"] = ta.volatility.average_true_range(df["high"], df["low"], df["close"], window=14)  # ATR for volatility
     return df
 
+@timed(TA_SECONDS, function="calculate_volume_indicators")
 def calculate_volume_indicators(df):
     """Calculate volume indicators for a DataFrame of candlestick data."""
     df["OBV"] = ta.volume.on_balance_volume(df["close"], df["volume"])  # On-Balance Volume
@@ -38,6 +44,7 @@ def calculate_volume_indicators(df):
     df["VWAP"] = pta.vwap(df["high"], df["low"], df["close"], df["volume"])  # VWAP Indicator
     return df
 
+@timed(TA_SECONDS, function="calculate_volatility_index")
 def calculate_volatility_index(candlestick_data: list) -> dict:
     """
     Calculate a volatility index for a cryptocurrency trading pair using ATR, BBW, and HV.
@@ -133,6 +140,7 @@ def calculate_volatility_index(candlestick_data: list) -> dict:
         }
     }
 
+@timed(TA_SECONDS, function="perform_technical_analysis")
 def perform_technical_analysis(candlestick_data: list) -> dict:
     """
     Perform technical analysis on candlestick data.
@@ -161,6 +169,7 @@ def perform_technical_analysis(candlestick_data: list) -> dict:
         "latest_indicators": latest_data
     }
 
+@timed(TA_SECONDS, function="detect_selected_patterns")
 def detect_selected_patterns(candlestick_data: list) -> dict:
     """
     Detect selected candlestick patterns in the given OHLCV data.
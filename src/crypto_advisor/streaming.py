@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+"""Server-sent event (SSE) streaming of workflow progress and LLM tokens.
+
+A compiled workflow graph is executed in a worker thread.  Node completions
+and LLM tokens are pushed from that thread onto an :class:`asyncio.Queue` and
+rendered as SSE frames by :func:`stream_workflow_events`:
+
+* ``start``    – emitted immediately so the client receives its first byte
+  without waiting for any upstream call.
+* ``progress`` – ``{"node": "<name>"}`` after each graph node finishes.
+* ``token``    – ``{"token": "<text>"}`` for every generated LLM token.
+* ``message``  – ``{"message": "<full text>"}`` once the agent is done.
+* ``error``    – ``{"detail": "<reason>"}`` if the workflow raised.
+"""
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Callable
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+_DONE = object()
+
+# Strong references to running workers so they are not garbage-collected when
+# the client disconnects before the workflow finishes.
+_workers: set[asyncio.Task[None]] = set()
+
+
+def format_sse(event: str, data: dict[str, Any]) -> str:
+    """Render a single server-sent event frame."""
+
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+class TokenCallbackHandler(BaseCallbackHandler):
+    """Forward every non-empty LLM token to ``on_token``."""
+
+    def __init__(self, on_token: Callable[[str], None]) -> None:
+        self.on_token = on_token
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:  # noqa: D102
+        # Function-call deltas of the OpenAI functions agent carry no content.
+        if token:
+            self.on_token(token)
+
+
+async def stream_workflow_events(app_callable, payload: dict[str, Any] | None = None) -> AsyncIterator[str]:
+    """Run ``app_callable`` in a thread and yield SSE frames as it progresses.
+
+    Args:
+        app_callable: A compiled LangGraph workflow, ideally built with
+            ``streaming=True`` so that token events are produced.
+        payload: Initial graph input.
+
+    Yields:
+        Encoded SSE frames (see module docstring for the event types).
+    """
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[Any] = asyncio.Queue()
+
+    def _put(item: Any) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, item)
+
+    def _run() -> None:
+        handler = TokenCallbackHandler(lambda token: _put(format_sse("token", {"token": token})))
+        message: str | None = None
+        try:
+            for update in app_callable.stream(payload or {}, config={"callbacks": [handler]}):
+                for node, state in update.items():
+                    _put(format_sse("progress", {"node": node}))
+                    messages = (state or {}).get("messages") if node == "agent" else None
+                    if messages:
+                        message = messages[-1].content
+            _put(format_sse("message", {"message": message or ""}))
+        except Exception as exc:  # noqa: BLE001 – reported to the client
+            _put(format_sse("error", {"detail": str(exc)}))
+        finally:
+            _put(_DONE)
+
+    yield format_sse("start", {})
+    worker = asyncio.create_task(asyncio.to_thread(_run))
+    _workers.add(worker)
+    worker.add_done_callback(_workers.discard)
+
+    while True:
+        item = await queue.get()
+        if item is _DONE:
+            break
+        yield item
@@ -2,14 +2,36 @@
 LangChain tools for cryptocurrency market analysis.
 
 This module provides various tools for fetching and analyzing cryptocurrency market data.
+
+Inside a workflow run the tools first consult the active
+:class:`~crypto_advisor.run_context.RunContext` and answer from the data the
+graph has already fetched and computed, falling back to the providers only for
+data that is not part of the precomputed state.
+
+:func:`get_agent_tools` additionally serialises tool results into compact JSON
+(see :mod:`crypto_advisor.utils.compact`) before they reach the prompt and
+memoizes repeated calls with identical arguments within a run, while the tools
+returned by :func:`get_all_tools` keep returning plain Python data.
+
+Within a run the chart tool does not return candles to the model: it registers
+them as a run dataset and returns a handle plus a summary, and the analysis
+tools accept that handle (``dataset``) in place of ``candlestick_data``.
 """
 
+from typing import Any, Dict, List, Optional, Union
+
 from langchain.tools import StructuredTool, Tool
 from langchain_community.utilities import GoogleSerperAPIWrapper
 
 from crypto_advisor.api.chart import fetch_chart_data_tool
+from crypto_advisor.api.models.chart import ChartRequest
+from crypto_advisor.api.models.patterns import PatternRecognitionRequest
+from crypto_advisor.api.models.technical import TechnicalAnalysisRequest
 from crypto_advisor.api.patterns import recognize_patterns_tool
 from crypto_advisor.api.technical import analyze_technical_data_tool
+from crypto_advisor import tracing
+from crypto_advisor.run_context import candle_summary, current_run, tool_call_key
+from crypto_advisor.utils.compact import as_records, serialize_for_llm
 
 def get_search_tool():
     """Create and return the web search tool."""
@@ -30,9 +52,74 @@ def get_all_tools():
         get_pattern_recognition_tool(),
         get_fear_greed_structured_tool(),
         get_volatility_index_tool(),
+        get_correlation_tool(),
         get_search_tool()
     ]
 
+def compact_tool_output(tool):
+    """Return a copy of ``tool`` whose results are serialised for the LLM.
+
+    Plain string tools (e.g. web search) are returned unchanged.
+    """
+
+    if not isinstance(tool, StructuredTool):
+        return tool
+
+    def _compact(**kwargs):
+        return serialize_for_llm(tool.func(**kwargs), tool.name).text
+
+    return StructuredTool(
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema,
+        func=_compact,
+    )
+
+def memoize_tool(tool):
+    """Return a copy of ``tool`` that memoizes results within a workflow run.
+
+    Outside of a :func:`~crypto_advisor.run_context.run_scope` every call is
+    executed as usual.  Each call is recorded as a ``tool`` span of the
+    current request trace.
+    """
+
+    def _memoized(*args, **kwargs):
+        with tracing.span(f"tool:{tool.name}", "tool") as attributes:
+            run = current_run()
+            if run is None:
+                return tool.func(*args, **kwargs)
+            key = tool_call_key(tool.name, args, kwargs)
+            deduplicated = run.deduplicated_calls
+            result = run.memoized(key, lambda: tool.func(*args, **kwargs))
+            attributes["deduplicated"] = run.deduplicated_calls > deduplicated
+            return result
+
+    if isinstance(tool, StructuredTool):
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            func=_memoized,
+        )
+    return Tool(name=tool.name, description=tool.description, func=_memoized)
+
+def get_agent_tools():
+    """Return all tools wrapped for use by the LLM agent."""
+    return [memoize_tool(compact_tool_output(tool)) for tool in get_all_tools()]
+
+def _resolve_candles(dataset: Optional[str], candlestick_data):
+    """Return the candles behind a dataset handle or the raw data, else an error message."""
+
+    if dataset:
+        run = current_run()
+        candles = run.dataset(dataset) if run is not None else None
+        if candles is None:
+            return None, f"Unknown dataset {dataset!r}; call binance_chart_tool first and pass its `dataset` handle."
+        return candles, None
+    if candlestick_data:
+        return candlestick_data, None
+    return None, "Provide a `dataset` handle from binance_chart_tool."
+
 def get_coinmarketcap_historical_tool():
     """Return historical market data tool accepting simple ``days`` param."""
 
@@ -58,6 +145,12 @@ def get_altcoin_market_tool():
         from crypto_advisor.api.market import get_altcoin_dominance_tool
         from crypto_advisor.api.models.market import AltcoinDominanceRequest
 
+        run = current_run()
+        precomputed = run.for_days("dominance", days) if run is not None else None
+        if precomputed is not None:
+            print("Using precomputed altcoin dominance...")
+            return precomputed
+
         return get_altcoin_dominance_tool(AltcoinDominanceRequest(days=days))
 
     return StructuredTool.from_function(
@@ -68,11 +161,31 @@ def get_altcoin_market_tool():
 
 def get_binance_chart_tool():
     """Create and return the Binance chart data tool."""
+
+    def _chart(symbol: str, interval: str = "1h", limit: Optional[int] = None, num_candles: Optional[int] = None):
+        """Wrapper building a ``ChartRequest`` from flat arguments."""
+
+        limit = limit or num_candles or 100
+        run = current_run()
+        if run is None:
+            return fetch_chart_data_tool(ChartRequest(symbol=symbol, interval=interval, num_candles=limit))
+
+        candles = run.candles_for(symbol, interval, limit)
+        if candles is not None:
+            print("Using precomputed candles...")
+        else:
+            candles = fetch_chart_data_tool(ChartRequest(symbol=symbol, interval=interval, num_candles=limit))
+        if not candles:
+            return candles
+        return {"dataset": run.register_dataset(symbol, interval, candles), **candle_summary(candles)}
+
     return StructuredTool.from_function(
-        fetch_chart_data_tool,
+        _chart,
         name="binance_chart_tool",
         description=(
-            "Fetch OHLCV candlestick chart data for a cryptocurrency from Binance. "
+            "Fetch OHLCV candlestick chart data for a cryptocurrency from Binance. Returns a `dataset` handle "
+            "and a short summary (count, time range, last close, high/low, change); pass the handle as `dataset` "
+            "to technical_analysis, pattern_recognition and volatility_index instead of the candles. "
             "The input should be a JSON object with the following keys: "
             "`symbol` (e.g., BTCUSDT), `interval` (e.g., 1m, 1h, 4h, 1d), and `limit` (the number of candles to fetch). "
             "Note: You can also use the alias `num_candles` for `limit`."
@@ -81,25 +194,51 @@ def get_binance_chart_tool():
 
 def get_technical_analysis_tool():
     """Create and return the technical analysis tool."""
+
+    def _technical(
+        dataset: Optional[str] = None,
+        candlestick_data: Optional[Union[List[Dict], Dict[str, List[Any]]]] = None,
+    ):
+        """Wrapper forwarding the candles of a dataset (or raw data) to the analyzer."""
+
+        candlestick_data, error = _resolve_candles(dataset, candlestick_data)
+        if error:
+            return {"error": error}
+        run = current_run()
+        if run is not None and run.state.get("indicators") and run.matches_candles(as_records(candlestick_data)):
+            print("Using precomputed technical indicators...")
+            return {"latest_indicators": run.state["indicators"]}
+        return analyze_technical_data_tool(TechnicalAnalysisRequest(candlestick_data=candlestick_data))
+
     return StructuredTool.from_function(
-        analyze_technical_data_tool,
+        _technical,
         name="technical_analysis",
         description=(
             "Performs technical analysis on candlestick data, calculating indicators such as RSI, Stochastic RSI, MACD, "
             "Moving Averages (SMA, EMA), Bollinger Bands, ATR, ADX, VWAP, and On-Balance Volume. "
-            "This tool provides raw indicator values without predefined insights, allowing for flexible interpretation."
+            "This tool provides raw indicator values without predefined insights, allowing for flexible interpretation. "
+            "Pass the `dataset` handle returned by binance_chart_tool."
         )
     )
 
 def get_volatility_index_tool():
     """Return the volatility index tool with a simple list parameter."""
 
-    from typing import List, Dict
     from crypto_advisor.api.volatility import analyze_volatility_tool
-    from crypto_advisor.api.models.technical import TechnicalAnalysisRequest
 
-    def _volatility(candlestick_data: List[Dict]):  # type: ignore[valid-type]
-        """Wrapper forwarding raw candle data to the analyzer."""
+    def _volatility(
+        dataset: Optional[str] = None,
+        candlestick_data: Optional[Union[List[Dict], Dict[str, List[Any]]]] = None,  # type: ignore[valid-type]
+    ):
+        """Wrapper forwarding the candles of a dataset (or raw data) to the analyzer."""
+
+        candlestick_data, error = _resolve_candles(dataset, candlestick_data)
+        if error:
+            return {"error": error}
+        run = current_run()
+        if run is not None and run.state.get("volatility") and run.matches_candles(as_records(candlestick_data)):
+            print("Using precomputed volatility index...")
+            return run.state["volatility"]
 
         req = TechnicalAnalysisRequest(candlestick_data=candlestick_data)
         return analyze_volatility_tool(req)
@@ -109,14 +248,47 @@ def get_volatility_index_tool():
         name="volatility_index",
         description=(
             "Calculates a volatility index (0-5) from candlestick data using ATR, BBW, and HV. "
-            "Returns the index value, category label, and component scores."
+            "Returns the index value, category label, and component scores. "
+            "Pass the `dataset` handle returned by binance_chart_tool."
+        ),
+    )
+
+def get_correlation_tool():
+    """Return the rolling correlation / beta-to-BTC tool."""
+
+    def _correlation(symbols: str, interval: str = "1h", window: int = 72):
+        from crypto_advisor.services.correlation import correlation_report
+
+        parsed = [symbol.strip().upper() for symbol in symbols.split(",") if symbol.strip()]
+        return correlation_report(parsed, interval, limit=max(200, window + 1), window=window, matrix=len(parsed) <= 8)
+
+    return StructuredTool.from_function(
+        _correlation,
+        name="correlation_matrix",
+        description=(
+            "Rolling correlation and beta to BTC of closed-candle returns for several pairs. "
+            "Accepts `symbols` (comma-separated, e.g. ETHUSDT,SOLUSDT), `interval` (e.g. 1h, 4h) and "
+            "`window` (number of candles). Returns each pair's beta and correlation to BTCUSDT and the most "
+            "and least correlated pairs (plus the full matrix for up to 8 pairs)."
         ),
     )
 
 def get_pattern_recognition_tool():
     """Create and return the pattern recognition tool."""
+
+    def _patterns(
+        dataset: Optional[str] = None,
+        candlestick_data: Optional[Union[List[Dict], Dict[str, List[Any]]]] = None,
+    ):
+        """Wrapper forwarding the candles of a dataset (or raw data) to the pattern detector."""
+
+        candlestick_data, error = _resolve_candles(dataset, candlestick_data)
+        if error:
+            return {"error": error}
+        return recognize_patterns_tool(PatternRecognitionRequest(candlestick_data=candlestick_data))
+
     return StructuredTool.from_function(
-        recognize_patterns_tool,
+        _patterns,
         name="pattern_recognition",
         description=(
             "Detects key candlestick patterns from OHLCV (Open, High, Low, Close, Volume) data. "
@@ -132,7 +304,8 @@ def get_pattern_recognition_tool():
             "- **Three Black Crows**: Strong bearish continuation signal. "
             "The tool provides a structured response, indicating the detected patterns, timestamps, and signal strength. "
             "Positive values indicate a bullish pattern, while negative values indicate a bearish pattern."
-            "Probability of bearish and bullish scenarios should be provided."
+            "Probability of bearish and bullish scenarios should be provided. "
+            "Pass the `dataset` handle returned by binance_chart_tool."
         )
     )
 
@@ -143,6 +316,12 @@ def get_fear_greed_structured_tool():
         from crypto_advisor.api.market import get_fear_greed_index_tool
         from crypto_advisor.api.models.market import FearGreedIndexRequest
 
+        run = current_run()
+        precomputed = run.for_days("sentiment", days) if run is not None else None
+        if precomputed is not None:
+            print("Using precomputed Fear & Greed Index...")
+            return precomputed
+
         return get_fear_greed_index_tool(FearGreedIndexRequest(days=days))
 
     return StructuredTool.from_function(
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+"""Per-request execution timelines.
+
+Aggregate metrics cannot show the critical path of one slow request.  This
+module records lightweight spans for it:
+
+* ``request`` – the HTTP request itself (root span, opened by the server);
+* ``node`` – every LangGraph node execution;
+* ``tool`` – every agent tool invocation (``deduplicated`` when answered from
+  the per-run memo);
+* ``llm`` – every chat model call (model and token usage);
+* ``http`` – every upstream provider request (host and status);
+* ``ta`` – every ``ta_service`` computation.
+
+The current trace and parent span live in :class:`contextvars.ContextVar`
+objects, which ``asyncio.to_thread`` and LangGraph's executor copy into
+worker threads, so spans nest correctly across threads.  Outside a traced
+request :func:`span` is a no-op.
+
+Configuration (tracing is enabled when either is set):
+
+* ``CRYPTO_ADVISOR_TRACE_FILE`` – append finished spans to this file as JSON
+  lines (one object per span, grouped by ``trace_id``);
+  ``crypto-advisor trace <file>`` renders them as a timeline.
+* ``CRYPTO_ADVISOR_SERVER_TIMING`` – set to ``1`` to add a ``Server-Timing``
+  header with the time spent per span kind, plus ``X-Trace-Id``.
+
+Streaming responses are traced up to the first byte of the response.
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TypeVar
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+T = TypeVar("T")
+
+TRACE_ID_HEADER = "X-Trace-Id"
+
+# Server-Timing entries, in display order.
+SPAN_KINDS = ("node", "tool", "llm", "http", "ta")
+
+
+@dataclass(frozen=True)
+class TraceSettings:
+    """Tracing configuration read from the environment."""
+
+    file: Path | None = None
+    server_timing: bool = False
+
+    @property
+    def enabled(self) -> bool:  # noqa: D102
+        return self.file is not None or self.server_timing
+
+    @classmethod
+    def from_env(cls) -> TraceSettings:  # noqa: D102
+        file = os.getenv("CRYPTO_ADVISOR_TRACE_FILE")
+        return cls(
+            file=Path(file) if file else None,
+            server_timing=os.getenv("CRYPTO_ADVISOR_SERVER_TIMING", "0").lower() in ("1", "true", "yes"),
+        )
+
+
+@lru_cache(maxsize=1)
+def settings() -> TraceSettings:
+    """Process-wide settings (read once)."""
+
+    return TraceSettings.from_env()
+
+
+def enabled() -> bool:
+    """Whether tracing is configured."""
+
+    return settings().enabled
+
+
+# ---------------------------------------------------------------------------
+# Spans and traces
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Span:
+    """One timed operation of a trace."""
+
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    name: str
+    kind: str
+    start: float
+    duration_ms: float = 0.0
+    status: str = "ok"
+    thread: str = ""
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    """Spans recorded for one request."""
+
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    spans: List[Span] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, span: Span) -> None:  # noqa: D102
+        with self.lock:
+            self.spans.append(span)
+
+    def totals(self) -> Dict[str, tuple[float, int]]:
+        """Summed duration (ms) and count of the spans of each kind."""
+
+        totals: Dict[str, tuple[float, int]] = {}
+        with self.lock:
+            spans = list(self.spans)
+        for span in spans:
+            duration, count = totals.get(span.kind, (0.0, 0))
+            totals[span.kind] = (duration + span.duration_ms, count + 1)
+        return totals
+
+
+_trace: contextvars.ContextVar[Trace | None] = contextvars.ContextVar("crypto_advisor_trace", default=None)
+_parent: contextvars.ContextVar[str | None] = contextvars.ContextVar("crypto_advisor_span", default=None)
+
+
+def current_trace() -> Trace | None:
+    """Trace of the request being handled, if it is traced."""
+
+    return _trace.get()
+
+
+def _new_span(trace: Trace, name: str, kind: str, attributes: Dict[str, Any]) -> Span:
+    return Span(
+        trace_id=trace.trace_id,
+        span_id=uuid.uuid4().hex[:16],
+        parent_id=_parent.get(),
+        name=name,
+        kind=kind,
+        start=time.time(),
+        thread=threading.current_thread().name,
+        attributes=attributes,
+    )
+
+
+@contextmanager
+def _timed(trace: Trace, span: Span) -> Iterator[Dict[str, Any]]:
+    token = _parent.set(span.span_id)
+    started = time.perf_counter()
+    try:
+        yield span.attributes
+    except BaseException as exc:
+        span.status = "error"
+        span.attributes.setdefault("error", f"{type(exc).__name__}: {exc}")
+        raise
+    finally:
+        span.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        _parent.reset(token)
+        trace.add(span)
+
+
+@contextmanager
+def span(name: str, kind: str, **attributes: Any) -> Iterator[Dict[str, Any]]:
+    """Record the enclosed block as a child of the current span.
+
+    Yields:
+        The span's attribute dict, which the block may extend.
+    """
+
+    trace = _trace.get()
+    if trace is None:
+        yield attributes
+        return
+    with _timed(trace, _new_span(trace, name, kind, attributes)) as span_attributes:
+        yield span_attributes
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Trace]:
+    """Open a new trace whose root span covers the enclosed block."""
+
+    trace = Trace()
+    token = _trace.set(trace)
+    parent_token = _parent.set(None)
+    try:
+        with _timed(trace, _new_span(trace, name, "request", attributes)):
+            yield trace
+    finally:
+        _parent.reset(parent_token)
+        _trace.reset(token)
+
+
+def traced(name: str, kind: str, func: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``func`` so each call is recorded as a span.
+
+    Returns ``func`` itself when tracing is disabled.
+    """
+
+    if not enabled():
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        with span(name, kind):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+class LLMTracingHandler(BaseCallbackHandler):
+    """Callback handler recording chat model calls as ``llm`` spans."""
+
+    def __init__(self) -> None:
+        self._open: Dict[UUID, tuple[Trace, Span, float]] = {}
+
+    def _start(self, serialized: Dict[str, Any], run_id: UUID) -> None:
+        trace = _trace.get()
+        if trace is not None:
+            name = (serialized or {}).get("name") or "chat_model"
+            self._open[run_id] = (trace, _new_span(trace, f"llm:{name}", "llm", {}), time.perf_counter())
+
+    def _finish(self, run_id: UUID, status: str, **attributes: Any) -> None:
+        entry = self._open.pop(run_id, None)
+        if entry is None:
+            return
+        trace, llm_span, started = entry
+        llm_span.duration_ms = round((time.perf_counter() - started) * 1000, 3)
+        llm_span.status = status
+        llm_span.attributes.update(attributes)
+        trace.add(llm_span)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: Any, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: D102
+        self._start(serialized, run_id)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any) -> None:  # noqa: D102
+        self._start(serialized, run_id)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: D102
+        output = response.llm_output or {}
+        usage = output.get("token_usage") or {}
+        tokens = {kind: usage[kind] for kind in ("prompt_tokens", "completion_tokens") if usage.get(kind)}
+        self._finish(run_id, "ok", model=str(output.get("model_name") or "unknown"), **tokens)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:  # noqa: D102
+        self._finish(run_id, "error", error=f"{type(error).__name__}: {error}")
+
+
+llm_tracing_handler = LLMTracingHandler()
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+
+_export_lock = threading.Lock()
+
+
+def export(trace: Trace, path: Path | None = None) -> None:
+    """Append the spans of ``trace`` to the trace file as JSON lines."""
+
+    path = path or settings().file
+    if path is None:
+        return
+    with trace.lock:
+        lines = [json.dumps(asdict(item), default=str) for item in sorted(trace.spans, key=lambda s: s.start)]
+    with _export_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("a", encoding="utf-8") as handle:
+            handle.write("\n".join(lines) + "\n")
+
+
+def server_timing(trace: Trace, total_ms: float) -> str:
+    """``Server-Timing`` header value summarising ``trace`` by span kind."""
+
+    totals = trace.totals()
+    entries = [f"total;dur={total_ms:.1f}"]
+    for kind in SPAN_KINDS:
+        if kind in totals:
+            duration, count = totals[kind]
+            entries.append(f'{kind};dur={duration:.1f};desc="{count} span{"s" if count != 1 else ""}"')
+    return ", ".join(entries)
+
+
+def load_spans(path: Path) -> Dict[str, List[Span]]:
+    """Read a trace file; returns the spans grouped by trace ID in file order."""
+
+    traces: Dict[str, List[Span]] = {}
+    with Path(path).open(encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                item = Span(**json.loads(line))
+                traces.setdefault(item.trace_id, []).append(item)
+    return traces
+
+
+def format_timeline(spans: Iterable[Span], width: int = 40) -> str:
+    """Render the spans of one trace as an indented timeline with bars."""
+
+    spans = sorted(spans, key=lambda s: s.start)
+    if not spans:
+        return ""
+    children: Dict[str | None, List[Span]] = {}
+    ids = {item.span_id for item in spans}
+    for item in spans:
+        children.setdefault(item.parent_id if item.parent_id in ids else None, []).append(item)
+    origin = spans[0].start
+    end = max(item.start + item.duration_ms / 1000 for item in spans)
+    scale = width / max(end - origin, 1e-9)
+
+    lines: List[str] = []
+
+    def render(item: Span, depth: int) -> None:
+        offset = int((item.start - origin) * scale)
+        length = max(1, int(item.duration_ms / 1000 * scale))
+        bar = (" " * offset + "█" * length).ljust(width)[:width]
+        label = f"{'  ' * depth}{item.name}" + (" !" if item.status != "ok" else "")
+        extra = ", ".join(f"{key}={value}" for key, value in item.attributes.items() if key != "error")
+        if extra:
+            label += f"  ({extra})"
+        lines.append(f"{(item.start - origin) * 1000:9.1f} {item.duration_ms:9.1f}ms |{bar}| {label}")
+        for child in children.get(item.span_id, []):
+            render(child, depth + 1)
+
+    for root in children.get(None, []):
+        render(root, 0)
+    return "\n".join(lines)
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+"""Token-compact serialization of tool outputs and graph state for the LLM.
+
+Everything the agent sees ends up in the prompt, so the representation of
+tool results directly drives token spend and model latency.  This module turns
+arbitrary tool output into compact JSON by
+
+* converting lists of same-shaped dicts (candles, histories) into columnar
+  arrays, so keys are written once instead of once per row,
+* rounding floats to a fixed number of significant digits and converting
+  numpy scalars, timestamps and ``NaN`` into plain JSON values,
+* optionally downsampling long histories (keeping the most recent point), and
+* shrinking histories further until a per-tool token budget is met.
+
+Budgets are defined in :data:`DEFAULT_POLICIES` and can be overridden with
+``CRYPTO_ADVISOR_TOKEN_BUDGET_<TOOL_NAME>`` environment variables, e.g.
+``CRYPTO_ADVISOR_TOKEN_BUDGET_FEAR_GREED_INDEX=300``.
+"""
+
+import json
+import math
+import os
+from dataclasses import dataclass, replace
+from datetime import date, datetime
+from typing import Any, Mapping
+
+# Marker added to columnar blocks that were downsampled.
+DOWNSAMPLED_KEY = "_downsampled_from"
+
+# Rough characters-per-token ratio of GPT tokenizers on JSON payloads.
+_CHARS_PER_TOKEN = 4
+
+# Histories are never shrunk below this many points.
+_MIN_POINTS = 8
+
+
+@dataclass(frozen=True)
+class SerializationPolicy:
+    """How a single tool's output is serialised for the LLM.
+
+    Attributes:
+        max_tokens: Estimated token budget; ``None`` disables the budget.
+        precision: Significant digits kept for floats; ``None`` keeps full
+            precision.
+        max_points: Initial cap on the length of columnar histories.
+        downsample: Whether histories may be downsampled at all.  Disabled for
+            data the model must pass back verbatim (e.g. candles).
+    """
+
+    max_tokens: int | None = None
+    precision: int | None = 6
+    max_points: int | None = None
+    downsample: bool = True
+
+
+DEFAULT_POLICIES: dict[str, SerializationPolicy] = {
+    # Candles come back verbatim in tool calls and must match the run's own.
+    "binance_chart_tool": SerializationPolicy(precision=None, downsample=False),
+    # One row per symbol; every row must reach the model, prices unrounded
+    # (symbol_digest already rounds the oscillators).
+    "batch_technical_analysis": SerializationPolicy(precision=None, downsample=False),
+    "technical_analysis": SerializationPolicy(max_tokens=400),
+    "volatility_index": SerializationPolicy(max_tokens=200),
+    "pattern_recognition": SerializationPolicy(max_tokens=400),
+    "correlation_matrix": SerializationPolicy(max_tokens=800),
+    "coinmarketcap_historical": SerializationPolicy(max_tokens=800, max_points=30),
+    "altcoin_market_analysis": SerializationPolicy(max_tokens=800, max_points=30),
+    "fear_greed_index": SerializationPolicy(max_tokens=600, max_points=30),
+    "graph_state": SerializationPolicy(max_tokens=1500, max_points=30),
+}
+
+
+@dataclass(frozen=True)
+class CompactResult:
+    """Serialised payload together with its estimated token count."""
+
+    text: str
+    tokens: int
+
+
+def get_policy(name: str) -> SerializationPolicy:
+    """Return the serialization policy for ``name`` honouring env overrides."""
+
+    policy = DEFAULT_POLICIES.get(name, SerializationPolicy())
+    override = os.getenv(f"CRYPTO_ADVISOR_TOKEN_BUDGET_{name.upper()}")
+    if override:
+        policy = replace(policy, max_tokens=int(override) or None)
+    return policy
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate that needs no tokenizer download."""
+
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+# ---------------------------------------------------------------------------
+# Value conversion
+# ---------------------------------------------------------------------------
+
+
+def _scalar(value: Any, precision: int | None) -> Any:
+    if hasattr(value, "item") and not isinstance(value, (list, dict)):
+        try:
+            value = value.item()  # numpy scalar → Python scalar
+        except (TypeError, ValueError):
+            pass
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            return None
+        return value if precision is None else float(f"{value:.{precision}g}")
+    if isinstance(value, datetime):
+        if value.second == 0 and value.microsecond == 0:
+            return value.isoformat(timespec="minutes")
+        return value.isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (int, str)):
+        return value
+    return str(value)
+
+
+def _is_table(value: Any) -> bool:
+    """Whether ``value`` is a non-empty list of dicts sharing the same keys."""
+
+    if not isinstance(value, list) or not value or not isinstance(value[0], Mapping):
+        return False
+    keys = value[0].keys()
+    return all(isinstance(row, Mapping) and row.keys() == keys for row in value)
+
+
+def _sample_indices(length: int, max_points: int) -> list[int]:
+    """Evenly spaced indices that always include the first and last element."""
+
+    if length <= max_points:
+        return list(range(length))
+    step = (length - 1) / (max_points - 1)
+    return sorted({round(i * step) for i in range(max_points)})
+
+
+def to_columnar(rows: list[Mapping[str, Any]]) -> dict[str, list[Any]]:
+    """Convert a list of same-shaped dicts into a dict of equal-length lists."""
+
+    return {key: [row[key] for row in rows] for key in rows[0]}
+
+
+def as_records(data: Any) -> Any:
+    """Inverse of :func:`to_columnar`; other values are returned unchanged."""
+
+    if isinstance(data, Mapping) and data and all(isinstance(v, list) for v in data.values()):
+        columns = {k: v for k, v in data.items() if k != DOWNSAMPLED_KEY}
+        lengths = {len(v) for v in columns.values()}
+        if len(lengths) == 1:
+            return [dict(zip(columns, row)) for row in zip(*columns.values())]
+    return data
+
+
+def compact(value: Any, precision: int | None = 6, max_points: int | None = None) -> Any:
+    """Recursively convert ``value`` into a compact, JSON-serialisable form.
+
+    Args:
+        value: Tool output or state fragment.
+        precision: Significant digits kept for floats; ``None`` keeps them all.
+        max_points: Downsample columnar histories longer than this.
+
+    Returns:
+        Plain Python structure ready for ``json.dumps``.
+    """
+
+    if _is_table(value):
+        rows = value
+        if max_points is not None and len(rows) > max_points:
+            rows = [rows[i] for i in _sample_indices(len(rows), max_points)]
+        table: dict[str, Any] = {
+            str(_scalar(key, precision)): [compact(row[key], precision, max_points) for row in rows]
+            for key in rows[0]
+        }
+        if len(rows) != len(value):
+            table[DOWNSAMPLED_KEY] = len(value)
+        return table
+    if isinstance(value, Mapping):
+        return {str(_scalar(k, precision)): compact(v, precision, max_points) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [compact(v, precision, max_points) for v in value]
+    return _scalar(value, precision)
+
+
+def _longest_table(value: Any) -> int:
+    if _is_table(value):
+        return len(value)
+    if isinstance(value, Mapping):
+        return max((_longest_table(v) for v in value.values()), default=0)
+    if isinstance(value, (list, tuple)):
+        return max((_longest_table(v) for v in value), default=0)
+    return 0
+
+
+# ---------------------------------------------------------------------------
+# Public entry point
+# ---------------------------------------------------------------------------
+
+
+def serialize_for_llm(value: Any, name: str, policy: SerializationPolicy | None = None) -> CompactResult:
+    """Serialise ``value`` for the prompt according to ``name``'s policy.
+
+    Histories are halved repeatedly until the estimated token count fits the
+    budget or they reach a minimum length; the payload is never truncated
+    mid-structure, so it may exceed the budget when that is impossible.
+
+    Args:
+        value: Tool output or graph-state fragment.
+        name: Tool name (or ``"graph_state"``) used to look up the policy.
+        policy: Explicit policy overriding the configured one.
+
+    Returns:
+        The compact JSON text and its estimated token count.
+    """
+
+    policy = policy or get_policy(name)
+    max_points = policy.max_points if policy.downsample else None
+
+    while True:
+        text = json.dumps(compact(value, policy.precision, max_points), separators=(",", ":"))
+        tokens = estimate_tokens(text)
+        if policy.max_tokens is None or tokens <= policy.max_tokens or not policy.downsample:
+            break
+        longest = _longest_table(value) if max_points is None else max_points
+        if longest <= _MIN_POINTS:
+            break
+        max_points = max(_MIN_POINTS, longest // 2)
+
+    print(f"Serialized {name} for LLM: ~{tokens} tokens")
+    return CompactResult(text=text, tokens=tokens)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+"""Fast JSON encoding of analysis results.
+
+The indicator, volatility and pattern helpers return numpy scalars and pandas
+timestamps.  :func:`dumps` hands them to ``orjson``, which serialises numpy
+values natively (``NaN`` becomes ``null``) so no per-value Python conversion
+is needed; only timestamps go through the ``default`` hook.  Mappings keyed by
+timestamps (e.g. detected candlestick patterns) are the one case ``orjson``
+rejects outright – those payloads get a single key-normalisation pass and are
+encoded again.
+"""
+
+from datetime import date, datetime
+from typing import Any, Mapping
+
+import orjson
+from fastapi.responses import JSONResponse
+
+_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _stringify_keys(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {
+            (k.isoformat() if isinstance(k, (datetime, date)) else k): _stringify_keys(v) for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_stringify_keys(v) for v in value]
+    return value
+
+
+def dumps(content: Any) -> bytes:
+    """Serialise ``content`` to JSON bytes."""
+
+    try:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+    except TypeError:
+        return orjson.dumps(_stringify_keys(content), default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered through :func:`dumps`."""
+
+    def render(self, content: Any) -> bytes:  # noqa: D102
+        return dumps(content)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+"""HTTP caching validators aligned to candle closes.
+
+An analysis of a 4h chart only changes when the next 4h candle closes.  For
+such responses :func:`candle_validators` derives
+
+* an ``ETag`` from the workflow, its parameters and the close time of the
+  latest closed candle, and
+* a ``Cache-Control: max-age`` equal to the seconds left until the current
+  candle closes,
+
+from the clock alone, so a conditional request can be answered with ``304 Not
+Modified`` before any market data is fetched.  Candle boundaries follow
+Binance: intraday and daily intervals are multiples of the interval since the
+Unix epoch (UTC), weekly candles open on Monday and monthly candles on the
+first of the month.
+"""
+
+import hashlib
+import json
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Mapping
+
+from crypto_advisor.providers.binance import interval_to_seconds
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+# 1970-01-01 was a Thursday; Binance weekly candles open on Monday.
+_WEEK_OFFSET = timedelta(days=4)
+
+
+@dataclass(frozen=True)
+class CacheValidators:
+    """``ETag`` and freshness lifetime of a response."""
+
+    etag: str
+    max_age: int
+
+    @property
+    def headers(self) -> dict[str, str]:  # noqa: D102
+        return {"ETag": self.etag, "Cache-Control": f"public, max-age={self.max_age}"}
+
+
+def _utc(now: datetime | None) -> datetime:
+    if now is None:
+        return datetime.now(timezone.utc)
+    return now if now.tzinfo is not None else now.replace(tzinfo=timezone.utc)
+
+
+def candle_bounds(interval: str, now: datetime | None = None) -> tuple[datetime, datetime]:
+    """Return open and close time (UTC) of the candle forming at ``now``.
+
+    The open time of the forming candle is the close time of the latest
+    closed one.
+
+    Raises:
+        ValueError: If ``interval`` is not a Binance interval.
+    """
+
+    now = _utc(now)
+    if interval == "1M":
+        opened = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        year, month = divmod(opened.month, 12)
+        return opened, opened.replace(year=opened.year + year, month=month + 1)
+
+    seconds = interval_to_seconds(interval)
+    origin = _EPOCH + _WEEK_OFFSET if interval == "1w" else _EPOCH
+    elapsed = (now - origin).total_seconds()
+    opened = origin + timedelta(seconds=elapsed - elapsed % seconds)
+    return opened, opened + timedelta(seconds=seconds)
+
+
+def candle_validators(
+    workflow: str,
+    params: Mapping[str, Any],
+    interval: str,
+    now: datetime | None = None,
+) -> CacheValidators:
+    """Validators for a response that changes only when ``interval`` closes.
+
+    The ETag is weak: repeated LLM runs on the same data are equivalent, not
+    byte-identical.
+    """
+
+    now = _utc(now)
+    last_close, next_close = candle_bounds(interval, now)
+    material = json.dumps([workflow, dict(params), interval, last_close.isoformat()], sort_keys=True, default=str)
+    digest = hashlib.sha256(material.encode()).hexdigest()[:20]
+    max_age = max(0, math.ceil((next_close - now).total_seconds()))
+    return CacheValidators(etag=f'W/"{digest}"', max_age=max_age)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(if_none_match: str | None, etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header using weak comparison."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
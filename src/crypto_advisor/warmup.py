@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+"""Start-up warm-up of the API server.
+
+Without warm-up the first request to each endpoint pays for agent and LLM
+client construction, graph compilation, first-call overhead of the indicator
+libraries and TCP/TLS handshakes with every upstream host.  :func:`warm_up`
+does that work before traffic arrives:
+
+1. ``ta_service`` – runs indicators, the volatility index and pattern
+   detection on a small synthetic candle series (through the TA process
+   pool, which is started first, when ``CRYPTO_ADVISOR_TA_EXECUTOR=process``);
+2. ``graphs`` – builds and caches the workflow graphs (agents, tools and LLM
+   clients included) for the default parameters of every endpoint;
+3. ``provider_connections`` – opens pooled connections to Binance,
+   CoinMarketCap and the Fear & Greed API.
+
+Steps 1 and 2 are required: if they fail, the instance never reports ready.
+Step 3 is best effort.  The server runs warm-up in the background from its
+lifespan handler and ``GET /ready`` answers ``200`` only once it finished.
+
+Configuration:
+
+* ``CRYPTO_ADVISOR_WARMUP`` – set to ``0`` to skip warm-up (ready at once).
+* ``CRYPTO_ADVISOR_WARMUP_SYMBOLS`` – comma-separated pairs whose
+  technical-analysis graphs are pre-built (``ETHUSDT``).
+"""
+
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable
+
+from crypto_advisor.providers import http
+from crypto_advisor.providers.binance import API_BASE_URL
+from crypto_advisor.providers.coinmarketcap import CMC_API_URL, FEAR_GREED_API_URL
+from crypto_advisor.services import ta_pool
+from crypto_advisor.workflows import get_market_overview_app, get_technical_analysis_app
+
+STARTING = "starting"
+WARMING = "warming"
+READY = "ready"
+FAILED = "failed"
+
+
+@dataclass
+class WarmupReport:
+    """Outcome of a warm-up run."""
+
+    status: str = STARTING
+    durations: dict[str, float] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ready(self) -> bool:  # noqa: D102
+        return self.status == READY
+
+
+def synthetic_candles(count: int = 120) -> list[dict]:
+    """Deterministic 4h OHLCV series long enough for every indicator window."""
+
+    step = timedelta(hours=4)
+    start = datetime(2024, 1, 1)
+    candles = []
+    for i in range(count):
+        close = 100 + 10 * math.sin(i / 7) + i * 0.1
+        candles.append(
+            {
+                "time": start + i * step,
+                "open": close - 0.5 * math.cos(i),
+                "high": close + 1.5,
+                "low": close - 1.5,
+                "close": close,
+                "volume": 1000 + 100 * (i % 10),
+            }
+        )
+    return candles
+
+
+def _warm_ta_service() -> None:
+    if ta_pool.executor_mode() == ta_pool.PROCESS:
+        ta_pool.start_pool()
+    candles = synthetic_candles()
+    ta_pool.perform_technical_analysis(candles)
+    ta_pool.calculate_volatility_index(candles)
+    ta_pool.detect_selected_patterns(candles)
+
+
+def _warm_graphs(symbols: list[str]) -> None:
+    for streaming in (False, True):
+        get_market_overview_app(streaming=streaming)
+        for symbol in symbols:
+            get_technical_analysis_app(symbol, streaming=streaming)
+
+
+def _prime_connections() -> None:
+    urls = [
+        os.getenv("BINANCE_KLINES_URL", API_BASE_URL),
+        os.getenv("COINMARKETCAP_API_URL", CMC_API_URL),
+        os.getenv("FEAR_GREED_API_URL", FEAR_GREED_API_URL),
+    ]
+    unreachable = [url for url in urls if not http.prime(url)]
+    if unreachable:
+        raise ConnectionError(f"Unreachable: {', '.join(unreachable)}")
+
+
+def warmup_symbols() -> list[str]:
+    """Symbols from ``CRYPTO_ADVISOR_WARMUP_SYMBOLS``."""
+
+    raw = os.getenv("CRYPTO_ADVISOR_WARMUP_SYMBOLS", "ETHUSDT")
+    return [symbol.strip().upper() for symbol in raw.split(",") if symbol.strip()]
+
+
+def warm_up(report: WarmupReport | None = None, symbols: list[str] | None = None) -> WarmupReport:
+    """Run all warm-up steps, recording durations and errors in ``report``."""
+
+    if report is None:
+        report = WarmupReport()
+    symbols = symbols if symbols is not None else warmup_symbols()
+    steps: list[tuple[str, Callable[[], None], bool]] = [
+        ("ta_service", _warm_ta_service, True),
+        ("graphs", lambda: _warm_graphs(symbols), True),
+        ("provider_connections", _prime_connections, False),
+    ]
+
+    report.status = WARMING
+    failed = False
+    for name, step, required in steps:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception as exc:  # noqa: BLE001 – reported through /ready
+            report.errors[name] = str(exc)
+            failed = failed or required
+        report.durations[name] = round(time.perf_counter() - started, 4)
+        print(f"Warm-up step {name}: {report.durations[name]:.3f}s" + (" (failed)" if name in report.errors else ""))
+
+    report.status = FAILED if failed else READY
+    return report
+
+
+def warmup_enabled() -> bool:
+    """Whether ``CRYPTO_ADVISOR_WARMUP`` allows warm-up (default: yes)."""
+
+    return os.getenv("CRYPTO_ADVISOR_WARMUP", "1").lower() not in {"0", "false", "off", "no"}
@@ -8,6 +8,11 @@ This module defines two independent graphs:
 * ``build_technical_analysis_app`` – Performs a technical analysis on a
   specific trading pair (currently ETH/USDT) and returns structured insights.
 
+``build_batch_technical_analysis_app`` analyses a list of pairs without the
+agent: candles and indicators are fetched and computed per symbol in
+parallel, and one model call answers up to ``CRYPTO_ADVISOR_BATCH_SIZE``
+symbols (see :mod:`crypto_advisor.services.batch_analysis`).
+
 Each graph is compiled via `langgraph.StateGraph` and can be invoked just like
 any other LangChain Runnable::
 
@@ -15,17 +20,38 @@ any other LangChain Runnable::
     result = app.invoke({})
 
 Both graphs share the same LLM/tooling stack; only the *prompt seed* differs.
+
+Compiled graphs are stateless between invocations.  The server uses
+:func:`get_market_overview_app` and :func:`get_technical_analysis_app`, which
+keep built graphs (and their agents and LLM clients) for reuse.
+
+The ``agent`` node consults :mod:`crypto_advisor.services.response_cache`
+before calling the model: when the fetched market data is unchanged since the
+last run with the same parameters, the cached analysis is returned instead.
+Otherwise the agent receives the precomputed state as structured context, and
+its tools answer from that state (see :mod:`crypto_advisor.run_context`) so
+each request fetches and computes its data only once.
 """
 
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from functools import lru_cache
 from typing import Any, Dict, List, TypedDict
 
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from langchain_core.runnables import Runnable
+from langchain_core.runnables import Runnable, RunnableConfig
 from langgraph.graph import END, StateGraph
 
-from crypto_advisor.agent import create_agent, load_environment
+from crypto_advisor import profiling, tracing
+from crypto_advisor.agent import create_agent, create_llm, load_environment
+from crypto_advisor.metrics import CACHE_LOOKUPS, TOOL_CALLS, timed_node
 from crypto_advisor.providers.binance import fetch_binance_chart
-from crypto_advisor.services import ta_service
+from crypto_advisor.run_context import candle_summary, run_scope
+from crypto_advisor.services import ta_pool
+from crypto_advisor.services.batch_analysis import analyse_batch, symbol_digest
+from crypto_advisor.services.response_cache import fingerprint_inputs, get_response_cache
+from crypto_advisor.utils.compact import serialize_for_llm
 
 from crypto_advisor.providers.coinmarketcap import (
     fetch_coinmarketcap_global_data,
@@ -34,6 +60,21 @@ from crypto_advisor.providers.coinmarketcap import (
 )
 
 
+# Candle settings used by the technical-analysis workflow.
+TA_INTERVAL = "4h"
+TA_CANDLE_LIMIT = 100
+
+# Number of built graphs kept per workflow by the ``get_*_app`` helpers.
+APP_CACHE_SIZE = 64
+
+# Symbols fetched and computed at once by the batch technical analysis.
+BATCH_FETCH_CONCURRENCY = 16
+
+# Granularity at which the market overview inputs (global quotes, dominance,
+# sentiment) are treated as a new snapshot for HTTP caching.
+MARKET_SNAPSHOT_INTERVAL = "1h"
+
+
 class GraphState(TypedDict):
     """Minimal state passed between graph nodes."""
 
@@ -46,21 +87,127 @@ class GraphState(TypedDict):
     sentiment: dict | None
 
 
+class BatchState(TypedDict):
+    """State of the batch technical-analysis graph.
+
+    ``symbols`` is the invocation input; ``digests`` holds the compact
+    per-symbol inputs of the model and ``errors`` the symbols that could not
+    be fetched or computed.
+    """
+
+    symbols: List[str]
+    digests: List[dict]
+    errors: Dict[str, str]
+    analyses: List[dict]
+    llm_calls: int
+
+
 # ---------------------------------------------------------------------------
 # Shared building blocks
 # ---------------------------------------------------------------------------
 
 
-def _build_agent_runnable() -> Runnable[[GraphState], GraphState]:  # type: ignore[type-arg]
-    """Wrap the existing LangChain agent into a Runnable interface."""
+def _response_text(response: Any) -> str:
+    """Extract the final answer from an ``AgentExecutor`` result."""
+
+    if isinstance(response, dict):
+        return str(response.get("output", ""))
+    return str(response)
+
+
+# State keys forwarded verbatim to the agent as precomputed context.
+_CONTEXT_KEYS = ("indicators", "volatility", "global_data", "dominance", "sentiment")
+
+
+def _precomputed_context(state: GraphState, dataset: str | None = None) -> Dict[str, Any]:
+    """Collect the data computed by earlier nodes for the agent prompt.
+
+    Raw candles are summarised.  ``dataset`` is the run handle of those
+    candles, which the model passes to the analysis tools instead of the data.
+    """
+
+    context: Dict[str, Any] = {}
+    candles = state.get("candles")
+    if candles:
+        context["candles"] = candle_summary(candles)
+        if dataset is not None:
+            context["candles"] = {"dataset": dataset, **context["candles"]}
+    for key in _CONTEXT_KEYS:
+        if state.get(key) is not None:
+            context[key] = state[key]
+    return context
+
+
+def _agent_input(state: GraphState, dataset: str | None = None) -> str:
+    """Render the seed prompt followed by the precomputed context."""
+
+    prompt = "\n\n".join(str(m.content) for m in state["messages"] if isinstance(m, HumanMessage))
+    context = _precomputed_context(state, dataset)
+    if not context:
+        return prompt
+    return (
+        f"{prompt}\n\n"
+        "The following data has already been fetched and computed for this request. "
+        "Use it directly; tools called for the same data return these values.\n"
+        f"{serialize_for_llm(context, 'graph_state').text}"
+    )
+
+
+def _build_agent_runnable(
+    workflow: str,
+    params: Dict[str, Any],
+    interval: str | None = None,
+    streaming: bool = False,
+) -> Runnable[[GraphState], GraphState]:  # type: ignore[type-arg]
+    """Wrap the existing LangChain agent into a Runnable interface.
+
+    Args:
+        workflow: Workflow name used as the response-cache namespace.
+        params: Workflow parameters that, together with the fetched data,
+            determine the answer.
+        interval: Candle interval of ``state["candles"]``, if any.  Used to
+            ignore the still-forming candle when fingerprinting.
+        streaming: Build the LLM in streaming mode.  Callbacks passed in the
+            graph ``config`` then receive tokens as they are generated.
+    """
+
+    agent = create_agent(streaming=streaming)
+
+    def _run(state: GraphState, config: RunnableConfig) -> GraphState:  # noqa: WPS430
+        cache = get_response_cache()
+        fingerprint = fingerprint_inputs(state, interval=interval)
+
+        if cache is not None:
+            cached = cache.lookup(workflow, params, fingerprint)
+            CACHE_LOOKUPS.inc(cache="response", result="miss" if cached is None else "hit")
+            if cached is not None:
+                return {"messages": state["messages"] + [AIMessage(content=cached)]}
+
+        with run_scope(state, params) as run:
+            response = agent.invoke({"input": _agent_input(state, run.state_dataset())}, config=config)
+        print(f"Agent tool calls: {run.tool_calls} ({run.deduplicated_calls} deduplicated)")
+        TOOL_CALLS.inc(run.tool_calls - run.deduplicated_calls, workflow=workflow, outcome="executed")
+        TOOL_CALLS.inc(run.deduplicated_calls, workflow=workflow, outcome="deduplicated")
+        content = _response_text(response)
+
+        if cache is not None:
+            cache.store(workflow, params, fingerprint, content)
+        return {"messages": state["messages"] + [AIMessage(content=content)]}
 
-    agent = create_agent()
+    return _run  # type: ignore[return-value]
 
-    def _run(state: GraphState) -> GraphState:  # noqa: WPS430
-        response = agent.invoke(state["messages"])
-        return {"messages": state["messages"] + [AIMessage(content=response)]}
 
-    return _run  # type: ignore[return-value]
+def _add_nodes(graph: StateGraph, workflow: str, nodes: Dict[str, Any]) -> None:
+    """Add ``nodes`` to ``graph``, timing each in the node latency histogram.
+
+    Each execution is also recorded as a ``node`` span of the current request
+    trace.  Nodes run in LangGraph's executor threads, which join the current
+    request profile (if any) through :func:`profiling.attached`.
+    """
+
+    for name, node in nodes.items():
+        node = tracing.traced(f"{workflow}.{name}", "node", profiling.attached(node))
+        graph.add_node(name, timed_node(workflow, name, node))
 
 
 # ---------------------------------------------------------------------------
@@ -68,7 +215,17 @@ def _build_agent_runnable() -> Runnable[[GraphState], GraphState]:  # type: igno
 # ---------------------------------------------------------------------------
 
 
-def build_market_overview_app(days: int = 60) -> Runnable[[Dict[str, Any]], Dict[str, Any]]:  # noqa: D103
+def build_market_overview_app(
+    days: int = 60,
+    streaming: bool = False,
+) -> Runnable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build a graph that produces a global market overview.
+
+    Args:
+        days: Look-back window for dominance and sentiment history.
+        streaming: Stream LLM tokens to callbacks passed at invocation time.
+    """
+
     load_environment()
 
     def seed(_: GraphState) -> GraphState:
@@ -94,26 +251,41 @@ def build_market_overview_app(days: int = 60) -> Runnable[[Dict[str, Any]], Dict
     def sentiment_node(_: GraphState) -> GraphState:
         return {"sentiment": fetch_fear_greed_index(days)}
 
-    agent_runnable = _build_agent_runnable()
+    agent_runnable = _build_agent_runnable("market_overview", {"days": days}, streaming=streaming)
 
     graph: StateGraph[GraphState] = StateGraph(GraphState)
-    graph.add_node("seed", seed)
-    graph.add_node("global", global_node)
-    graph.add_node("dominance", dominance_node)
-    graph.add_node("sentiment", sentiment_node)
-    graph.add_node("agent", agent_runnable)
-
+    _add_nodes(
+        graph,
+        "market_overview",
+        {
+            "seed": seed,
+            "global": global_node,
+            "fetch_dominance": dominance_node,
+            "fetch_sentiment": sentiment_node,
+            "agent": agent_runnable,
+        },
+    )
+
+    graph.set_entry_point("seed")
     graph.add_edge("seed", "global")
-    graph.add_edge("global", "dominance")
-    graph.add_edge("dominance", "sentiment")
-    graph.add_edge("sentiment", "agent")
+    graph.add_edge("global", "fetch_dominance")
+    graph.add_edge("fetch_dominance", "fetch_sentiment")
+    graph.add_edge("fetch_sentiment", "agent")
     graph.add_edge("agent", END)
 
     return graph.compile()
 
 
-def build_technical_analysis_app(symbol: str = "ETHUSDT") -> Runnable[[Dict[str, Any]], Dict[str, Any]]:  # noqa: D103
-    """Build a graph that performs a full technical analysis for the given pair."""
+def build_technical_analysis_app(
+    symbol: str = "ETHUSDT",
+    streaming: bool = False,
+) -> Runnable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build a graph that performs a full technical analysis for the given pair.
+
+    Args:
+        symbol: Trading pair symbol (e.g. ``"ETHUSDT"``).
+        streaming: Stream LLM tokens to callbacks passed at invocation time.
+    """
 
     load_environment()
 
@@ -130,31 +302,117 @@ def build_technical_analysis_app(symbol: str = "ETHUSDT") -> Runnable[[Dict[str,
         }
 
     def fetch(_: GraphState) -> GraphState:
-        candles = fetch_binance_chart(symbol, "4h", 100)
+        candles = fetch_binance_chart(symbol, TA_INTERVAL, TA_CANDLE_LIMIT)
         return {"candles": candles}
 
     def calc_indicators(state: GraphState) -> GraphState:
-        indicators = ta_service.perform_technical_analysis(state["candles"])["latest_indicators"]  # type: ignore[index]
+        indicators = ta_pool.perform_technical_analysis(state["candles"])["latest_indicators"]  # type: ignore[index]
         return {"indicators": indicators}
 
     def calc_vol(state: GraphState) -> GraphState:
-        volatility = ta_service.calculate_volatility_index(state["candles"])
+        volatility = ta_pool.calculate_volatility_index(state["candles"])
         return {"volatility": volatility}
 
-    agent_runnable = _build_agent_runnable()
+    agent_runnable = _build_agent_runnable(
+        "technical_analysis",
+        {"symbol": symbol.upper(), "interval": TA_INTERVAL, "limit": TA_CANDLE_LIMIT},
+        interval=TA_INTERVAL,
+        streaming=streaming,
+    )
 
     graph: StateGraph[GraphState] = StateGraph(GraphState)
-    graph.add_node("seed", seed)
-    graph.add_node("fetch", fetch)
-    graph.add_node("indicators", calc_indicators)
-    graph.add_node("vol", calc_vol)
-    graph.add_node("agent", agent_runnable)
+    _add_nodes(
+        graph,
+        "technical_analysis",
+        {
+            "seed": seed,
+            "fetch": fetch,
+            "calc_indicators": calc_indicators,
+            "vol": calc_vol,
+            "agent": agent_runnable,
+        },
+    )
 
     # Edges
+    graph.set_entry_point("seed")
     graph.add_edge("seed", "fetch")
-    graph.add_edge("fetch", "indicators")
-    graph.add_edge("indicators", "vol")
+    graph.add_edge("fetch", "calc_indicators")
+    graph.add_edge("calc_indicators", "vol")
     graph.add_edge("vol", "agent")
     graph.add_edge("agent", END)
 
-    return graph.compile() 
\ No newline at end of file
+    return graph.compile() 
+
+
+def build_batch_technical_analysis_app() -> Runnable[[Dict[str, Any]], Dict[str, Any]]:
+    """Build a graph analysing the pairs in ``{"symbols": [...]}`` with batched LLM calls.
+
+    The result holds ``analyses`` (one dict per analysed symbol, in input
+    order), ``errors`` per failed symbol and the number of ``llm_calls``.
+    """
+
+    load_environment()
+    llm = create_llm()
+
+    def collect_symbol(symbol: str) -> dict:
+        candles = fetch_binance_chart(symbol, TA_INTERVAL, TA_CANDLE_LIMIT)
+        indicators = ta_pool.perform_technical_analysis(candles)["latest_indicators"]
+        volatility = ta_pool.calculate_volatility_index(candles)
+        return symbol_digest(symbol, candle_summary(candles), indicators, volatility)
+
+    def collect(state: BatchState) -> BatchState:
+        symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in state["symbols"] if symbol.strip()))
+        task = profiling.attached(collect_symbol)
+        workers = max(1, min(len(symbols), BATCH_FETCH_CONCURRENCY))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # A context copy per task keeps spans and profiles attached to the request.
+            futures = {symbol: pool.submit(contextvars.copy_context().run, task, symbol) for symbol in symbols}
+        digests, errors = [], {}
+        for symbol, future in futures.items():
+            try:
+                digests.append(future.result())
+            except Exception as exc:  # noqa: BLE001 – reported per symbol
+                errors[symbol] = str(exc)
+        return {"digests": digests, "errors": errors}
+
+    def analyse(state: BatchState) -> BatchState:
+        result = analyse_batch(state["digests"], lambda prompt: str(llm.invoke(prompt).content))
+        print(f"Batch analysis of {len(state['digests'])} symbols: {result.llm_calls} LLM calls")
+        return {"analyses": [asdict(item) for item in result.analyses], "llm_calls": result.llm_calls}
+
+    graph: StateGraph[BatchState] = StateGraph(BatchState)
+    _add_nodes(graph, "batch_technical_analysis", {"collect": collect, "analyse": analyse})
+
+    graph.set_entry_point("collect")
+    graph.add_edge("collect", "analyse")
+    graph.add_edge("analyse", END)
+
+    return graph.compile()
+
+
+@lru_cache(maxsize=APP_CACHE_SIZE)
+def get_market_overview_app(days: int = 60, streaming: bool = False) -> Runnable[[Dict[str, Any]], Dict[str, Any]]:
+    """Return a reusable market overview graph, building it on first use."""
+
+    return build_market_overview_app(days, streaming=streaming)
+
+
+@lru_cache(maxsize=APP_CACHE_SIZE)
+def _technical_analysis_app(symbol: str, streaming: bool) -> Runnable[[Dict[str, Any]], Dict[str, Any]]:
+    return build_technical_analysis_app(symbol, streaming=streaming)
+
+
+def get_technical_analysis_app(
+    symbol: str = "ETHUSDT",
+    streaming: bool = False,
+) -> Runnable[[Dict[str, Any]], Dict[str, Any]]:
+    """Return a reusable technical analysis graph, building it on first use."""
+
+    return _technical_analysis_app(symbol.strip().upper(), streaming)
+
+
+@lru_cache(maxsize=1)
+def get_batch_technical_analysis_app() -> Runnable[[Dict[str, Any]], Dict[str, Any]]:
+    """Return the reusable batch technical analysis graph, building it on first use."""
+
+    return build_batch_technical_analysis_app()
@@ -0,0 +1,102 @@
+"""Unit tests for ``crypto_advisor.admission``."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from crypto_advisor.admission import AdmissionController, AdmissionRejected, AdmittedStreamingResponse
+
+
+def test_queue_full_is_rejected_with_429() -> None:  # noqa: D103
+    async def scenario() -> None:
+        controller = AdmissionController("llm", max_in_flight=1, max_queue=1, queue_timeout=5)
+        await controller.acquire()
+        waiter = asyncio.ensure_future(controller.acquire())
+        await asyncio.sleep(0)
+        assert controller.stats().queue_depth == 1
+
+        with pytest.raises(AdmissionRejected) as info:
+            await controller.acquire()
+        assert info.value.status_code == 429
+        assert int(info.value.headers["Retry-After"]) >= 1
+
+        controller.release(0.1)
+        waited = await waiter
+        assert waited >= 0
+        assert controller.stats().in_flight == 1
+        assert controller.stats().queue_depth == 0
+
+    asyncio.run(scenario())
+
+
+def test_queue_timeout_is_rejected_with_503() -> None:  # noqa: D103
+    async def scenario() -> None:
+        controller = AdmissionController("provider", max_in_flight=1, max_queue=4, queue_timeout=0.01)
+        async with controller.slot():
+            with pytest.raises(AdmissionRejected) as info:
+                await controller.acquire()
+        assert info.value.status_code == 503
+
+        stats = controller.stats()
+        assert stats.rejected_timeout == 1
+        assert stats.in_flight == 0
+        assert stats.admitted == 1
+
+    asyncio.run(scenario())
+
+
+def test_background_acquire_waits_beyond_queue_and_timeout() -> None:  # noqa: D103
+    async def scenario() -> None:
+        controller = AdmissionController("llm", max_in_flight=1, max_queue=0, queue_timeout=0.01)
+        await controller.acquire()
+        job = asyncio.ensure_future(controller.acquire(background=True))
+        await asyncio.sleep(0.05)
+        assert not job.done()
+        assert controller.stats().background_waiting == 1
+
+        with pytest.raises(AdmissionRejected) as info:
+            await controller.acquire()
+        assert info.value.status_code == 429
+
+        controller.release(0.1)
+        assert await job >= 0.05
+        stats = controller.stats()
+        assert stats.in_flight == 1
+        assert stats.background_waiting == 0
+
+    asyncio.run(scenario())
+
+
+def test_streaming_response_releases_its_slot() -> None:  # noqa: D103
+    async def numbers():
+        for i in range(3):
+            yield str(i)
+
+    async def receive() -> dict:
+        await asyncio.sleep(10)
+        return {"type": "http.disconnect"}
+
+    async def scenario() -> None:
+        controller = AdmissionController("llm", max_in_flight=1, max_queue=0, queue_timeout=1)
+        chunks: list[bytes] = []
+
+        async def send(message: dict) -> None:
+            chunks.append(message.get("body", b""))
+
+        await controller.acquire()
+        await AdmittedStreamingResponse(controller, numbers())({"type": "http"}, receive, send)
+        assert b"".join(chunks) == b"012"
+        assert controller.stats().in_flight == 0
+
+        async def send_fails(message: dict) -> None:
+            raise OSError("client went away")
+
+        # The body iterator never starts; the slot must still be released.
+        await controller.acquire()
+        with pytest.raises(Exception):  # noqa: B017 – OSError, possibly in an exception group
+            await AdmittedStreamingResponse(controller, numbers())({"type": "http"}, receive, send_fails)
+        assert controller.stats().in_flight == 0
+
+    asyncio.run(scenario())
\ No newline at end of file
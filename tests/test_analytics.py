@@ -0,0 +1,139 @@
+"""Tests of the ``/analytics/*`` routes and the batch technical analysis.
+
+The providers are pointed at :class:`UpstreamSimulator`; batch analysis uses
+:class:`FakeAdvisorChatModel`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from crypto_advisor.admission import AdmissionController, AdmissionRejected
+from crypto_advisor.harness.upstream import UpstreamSimulator
+from crypto_advisor.routes import analytics
+
+
+@pytest.fixture()
+def upstream(monkeypatch):  # noqa: D103
+    with UpstreamSimulator() as simulator:
+        for key, value in simulator.env().items():
+            monkeypatch.setenv(key, value)
+        yield simulator
+
+
+@pytest.fixture()
+def client(upstream) -> TestClient:  # noqa: D103
+    app = FastAPI()
+    app.include_router(analytics.router)
+    return TestClient(app)
+
+
+def test_parse_symbols_normalises_and_bounds() -> None:  # noqa: D103
+    assert analytics.parse_symbols(" ethusdt,BTCUSDT,,ETHUSDT ") == ["ETHUSDT", "BTCUSDT"]
+    for symbols, max_symbols in ((" , ", 50), ("AUSDT,BUSDT,CUSDT", 2)):
+        with pytest.raises(HTTPException) as info:
+            analytics.parse_symbols(symbols, max_symbols)
+        assert info.value.status_code == 400
+
+
+@pytest.mark.parametrize("route, key", [("indicators", "RSI"), ("volatility", "volatility_index")])
+def test_candle_routes_answer_per_symbol(client, route, key) -> None:  # noqa: D103
+    response = client.get(f"/analytics/{route}", params={"symbols": "ethusdt,BTCUSDT", "interval": "1h", "limit": 60})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["interval"], body["limit"], body["errors"]) == ("1h", 60, {})
+    assert list(body["results"]) == ["ETHUSDT", "BTCUSDT"]
+    assert key in body["results"]["ETHUSDT"]
+
+
+def test_every_upstream_call_is_admitted(monkeypatch) -> None:  # noqa: D103
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def fetch(symbol: str, interval: str, limit: int) -> str:
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return symbol
+
+    monkeypatch.setattr(analytics, "fetch_binance_chart", fetch)
+    symbols = [f"SYM{i}USDT" for i in range(8)]
+    monkeypatch.setattr(analytics, "provider_admission", AdmissionController("provider", 2, 8, 5.0))
+    payload = asyncio.run(analytics._per_symbol(symbols, "1h", 50, lambda candles: candles))
+    assert payload["results"] == {symbol: symbol for symbol in symbols}
+    assert peak == 2
+
+    monkeypatch.setattr(analytics, "provider_admission", AdmissionController("provider", 2, 0, 5.0))
+    with pytest.raises(AdmissionRejected):
+        asyncio.run(analytics._per_symbol(symbols, "1h", 50, lambda candles: candles))
+
+
+def test_candle_routes_reject_bad_input(client) -> None:  # noqa: D103
+    assert client.get("/analytics/patterns", params={"interval": "7m"}).status_code == 400
+    assert client.get("/analytics/indicators", params={"symbols": ""}).status_code == 400
+    assert client.get("/analytics/volatility", params={"limit": 5}).status_code == 422
+
+
+def test_correlation_includes_the_benchmark(client) -> None:  # noqa: D103
+    params = {"symbols": "ETHUSDT,SOLUSDT", "limit": 100, "window": 50, "matrix": "false"}
+    body = client.get("/analytics/correlation", params=params).json()
+
+    assert body["benchmark"] == "BTCUSDT" and body["symbols"] == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert body["beta"]["BTCUSDT"] == 1.0 and "correlation" not in body
+    assert client.get("/analytics/correlation", params={"limit": 50, "window": 50}).status_code == 400
+
+
+@pytest.mark.parametrize(
+    "error, status",
+    [(ValueError("Only 12 common candles, 51 required"), 400), (RuntimeError("Failed to fetch data"), 502)],
+)
+def test_correlation_errors_map_to_status(client, monkeypatch, error, status) -> None:  # noqa: D103
+    def fail(*args, **kwargs):
+        raise error
+
+    monkeypatch.setattr(analytics, "correlation_report", fail)
+    response = client.get("/analytics/correlation")
+
+    assert response.status_code == status
+    assert response.json()["detail"] == str(error)
+
+
+def test_depth_metrics(client) -> None:  # noqa: D103
+    body = client.get("/analytics/depth", params={"symbols": "ETHUSDT", "limit": 100}).json()
+
+    metrics = body["results"]["ETHUSDT"]
+    assert body["errors"] == {}
+    assert metrics["best_bid"] < metrics["best_ask"] and metrics["spread_bps"] > 0
+
+
+@pytest.mark.parametrize("route", ["dominance", "sentiment", "global"])
+def test_market_routes(client, route) -> None:  # noqa: D103
+    assert client.get(f"/analytics/{route}").status_code == 200
+
+
+def test_batch_technical_analysis_endpoint(upstream, monkeypatch) -> None:  # noqa: D103
+    monkeypatch.setenv("CRYPTO_ADVISOR_FAKE_LLM", "1")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("SERPER_API_KEY", "test")
+    from crypto_advisor import server
+
+    client = TestClient(server.app)
+    response = client.get("/technical-analysis/batch", params={"symbols": "btcusdt,ETHUSDT,SOLUSDT,BTCUSDT"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["symbol"] for item in body["analyses"]] == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert {item["source"] for item in body["analyses"]} == {"llm"}
+    assert (body["llm_calls"], body["errors"]) == (1, {})
+    assert client.get("/technical-analysis/batch", params={"symbols": ","}).status_code == 400
@@ -0,0 +1,87 @@
+"""Unit tests for ``crypto_advisor.services.batch_analysis``."""
+
+from __future__ import annotations
+
+import json
+
+from crypto_advisor.services.batch_analysis import (
+    SYMBOLS_PREFIX,
+    analyse_batch,
+    build_prompt,
+    fallback_analysis,
+    parse_response,
+    symbol_digest,
+)
+
+
+def _digest(symbol: str, close: float = 110.0) -> dict:
+    indicators = {"EMA_20": 100.0, "RSI": 61.234, "MACD": 1.5, "MACD_Signal": 1.0, "ADX": float("nan")}
+    summary = {"last_close": close, "change_pct": 4.2}
+    return symbol_digest(symbol, summary, indicators, {"volatility_index": 2.5, "volatility_category": "Moderate"})
+
+
+def _requested(prompt: str) -> list[str]:
+    last_line = prompt.rsplit("\n", 1)[-1]
+    assert last_line.startswith(SYMBOLS_PREFIX)
+    return [symbol.strip() for symbol in last_line[len(SYMBOLS_PREFIX) :].split(",")]
+
+
+def test_twenty_symbols_take_one_call_per_batch() -> None:  # noqa: D103
+    digests = [_digest(f"SYM{i}USDT") for i in range(20)]
+    prompts: list[str] = []
+
+    def invoke(prompt: str) -> str:
+        prompts.append(prompt)
+        entry = {"outlook": "Bullish", "summary": "Uptrend.", "recommendation": "Hold."}
+        return "```json\n" + json.dumps({symbol: entry for symbol in _requested(prompt)}) + "\n```"
+
+    result = analyse_batch(digests, invoke, size=20)
+    assert result.llm_calls == 1
+    assert [item.symbol for item in result.analyses] == [f"SYM{i}USDT" for i in range(20)]
+    assert {(item.outlook, item.source) for item in result.analyses} == {("bullish", "llm")}
+    assert '"SYM19USDT"' in prompts[0] and '"RSI"' in prompts[0]
+
+    assert analyse_batch(digests, invoke, size=15).llm_calls == 2
+
+
+def test_omitted_symbols_are_retried_once_then_fall_back() -> None:  # noqa: D103
+    digests = [_digest("BTCUSDT"), _digest("ETHUSDT"), _digest("SOLUSDT", close=90.0)]
+    requests: list[list[str]] = []
+
+    def invoke(prompt: str) -> str:
+        requests.append(_requested(prompt))
+        if len(requests) == 1:
+            # BTC answered, ETH without a summary, SOL omitted.
+            answers = {"btcusdt": {"outlook": "sideways", "summary": "Range."}, "ETHUSDT": {"outlook": "bullish"}}
+            return json.dumps(answers)
+        raise TimeoutError("model timed out")
+
+    result = analyse_batch(digests, invoke, size=25)
+    assert requests == [["BTCUSDT", "ETHUSDT", "SOLUSDT"], ["ETHUSDT", "SOLUSDT"]]
+    assert result.llm_calls == 2
+
+    btc, eth, sol = result.analyses
+    assert (btc.symbol, btc.outlook, btc.source) == ("BTCUSDT", "neutral", "llm")
+    assert (eth.outlook, eth.source) == ("bullish", "fallback")  # close > EMA and MACD > signal
+    assert sol.outlook == "neutral" and "RSI 61.2" in sol.summary
+
+
+def test_fallback_reads_prices_at_full_precision() -> None:  # noqa: D103
+    indicators = {"EMA_20": 67123.41, "RSI": 55.55555, "MACD": 12.0, "MACD_Signal": 10.0}
+    digest = symbol_digest("BTCUSDT", {"last_close": 67123.45}, indicators, {})
+    assert (digest["close"], digest["indicators"]["EMA_20"], digest["indicators"]["RSI"]) == (67123.45, 67123.41, 55.56)
+    assert "67123.45" in build_prompt([digest])
+
+    bullish = fallback_analysis(digest)
+    assert bullish.outlook == "bullish" and "close 67123.45" in bullish.summary
+
+    tied = symbol_digest("BTCUSDT", {"last_close": 67123.41}, {**indicators, "MACD": 8.0}, {})
+    assert fallback_analysis(tied).outlook == "neutral"  # close on the EMA votes neither way
+
+
+def test_parse_accepts_a_list_of_analyses() -> None:  # noqa: D103
+    text = json.dumps({"analyses": [{"symbol": "ETHUSDT", "outlook": "bearish", "summary": "Weak."}]})
+    parsed = parse_response(text, ["ETHUSDT", "BTCUSDT"])
+    assert list(parsed) == ["ETHUSDT"] and parsed["ETHUSDT"].outlook == "bearish"
+    assert parse_response("no json here", ["ETHUSDT"]) == {}
+    assert build_prompt([_digest("ETHUSDT")]).endswith(f"{SYMBOLS_PREFIX} ETHUSDT")
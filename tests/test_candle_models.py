@@ -0,0 +1,57 @@
+"""Unit tests for the columnar candle request models."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from crypto_advisor.api.models.chart import ChartRequest
+from crypto_advisor.api.models.patterns import PatternRecognitionRequest
+from crypto_advisor.api.models.technical import TechnicalAnalysisRequest
+
+
+def _candles(count: int = 5) -> list[dict]:
+    start = datetime(2024, 1, 1)
+    return [
+        {"time": start + timedelta(hours=i), "open": 1, "high": 2, "low": 0.5, "close": 1.5 + i, "volume": 10}
+        for i in range(count)
+    ]
+
+
+def test_rows_and_columns_validate_to_the_same_arrays() -> None:  # noqa: D103
+    rows = _candles()
+    columns = {key: [str(row[key]) if key == "time" else row[key] for row in rows] for key in rows[0]}
+
+    from_rows = TechnicalAnalysisRequest(candlestick_data=rows).candlestick_data
+    from_columns = PatternRecognitionRequest(candlestick_data=columns).candlestick_data
+
+    assert list(from_rows) == ["time", "open", "high", "low", "close", "volume"]
+    assert from_rows["time"].dtype == np.dtype("datetime64[ns]")
+    assert from_rows["close"].dtype == np.float64
+    for key in from_rows:
+        np.testing.assert_array_equal(from_rows[key], from_columns[key])
+
+
+@pytest.mark.parametrize(
+    ("mutate", "message"),
+    [
+        (lambda c: [{k: v for k, v in row.items() if k != "volume"} for row in c], "missing columns: volume"),
+        (lambda c: c[::-1], "strictly increasing"),
+        (lambda c: [{**row, "close": "n/a"} for row in c], "'close' must be numeric"),
+        (lambda c: [{**row, "high": float("nan")} for row in c], "'high' contains non-finite"),
+        (lambda c: {**{k: [r[k] for r in c] for k in c[0]}, "open": [1]}, "differ in length"),
+        (lambda c: {**{k: [r[k] for r in c] for k in c[0]}, "close": 1.0}, "'close' must be an array"),
+        (lambda c: [], "missing columns"),
+    ],
+)
+def test_invalid_candles_are_rejected(mutate, message) -> None:  # noqa: D103
+    with pytest.raises(ValidationError, match=message):
+        TechnicalAnalysisRequest(candlestick_data=mutate(_candles()))
+
+
+def test_chart_request_accepts_alias_and_field_name() -> None:  # noqa: D103
+    assert ChartRequest(symbol="ETHUSDT", interval="1h", num_candles=10).limit == 10
+    assert ChartRequest(symbol="ETHUSDT", interval="1h", limit=20).limit == 20
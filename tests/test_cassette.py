@@ -0,0 +1,53 @@
+"""Unit tests for ``crypto_advisor.providers.cassette``."""
+
+from __future__ import annotations
+
+import gzip
+import json
+
+import pytest
+
+from crypto_advisor.harness.upstream import UpstreamSimulator
+from crypto_advisor.providers.binance import fetch_binance_chart
+from crypto_advisor.providers.cassette import Cassette
+from crypto_advisor.providers.coinmarketcap import fetch_coinmarketcap_historical_data
+
+
+@pytest.fixture()
+def cassette_dir(tmp_path, monkeypatch):  # noqa: D103
+    monkeypatch.setenv("CRYPTO_ADVISOR_CASSETTE_DIR", str(tmp_path))
+    monkeypatch.setenv("COINMARKETCAP_API_KEY", "secret-key")
+    return tmp_path
+
+
+def test_request_id_ignores_query_string_and_volatile_params() -> None:  # noqa: D103
+    first = Cassette.request_id("https://h/x?a=1", {"b": 2, "time_start": "2024-01-01", "a": "1"})
+    second = Cassette.request_id("https://h/x", {"a": 1, "b": "2", "time_end": "2024-02-01"})
+
+    assert first == second == {"url": "https://h/x", "params": {"a": "1", "b": "2"}}
+
+
+def test_record_then_replay_without_network(cassette_dir, monkeypatch) -> None:  # noqa: D103
+    monkeypatch.setenv("CRYPTO_ADVISOR_CASSETTE_MODE", "record")
+    with UpstreamSimulator() as simulator:
+        for key, value in simulator.env().items():
+            monkeypatch.setenv(key, value)
+        recorded_candles = fetch_binance_chart("ETHUSDT", "4h", 20)
+        recorded_history = fetch_coinmarketcap_historical_data(days=7)
+
+    files = sorted(cassette_dir.rglob("*.json.gz"))
+    assert [path.parent.name for path in files] == ["fetch_binance_chart", "fetch_coinmarketcap_historical_data"]
+    assert all(b"secret-key" not in gzip.decompress(path.read_bytes()) for path in files)
+    assert json.loads(gzip.decompress(files[0].read_bytes()))["response"]["status"] == 200
+
+    # The simulator is gone: replay must be served from the cassettes alone.
+    monkeypatch.setenv("CRYPTO_ADVISOR_CASSETTE_MODE", "replay")
+    assert fetch_binance_chart("ETHUSDT", "4h", 20) == recorded_candles
+    assert fetch_coinmarketcap_historical_data(days=7) == recorded_history
+
+
+def test_replay_miss_surfaces_as_provider_error(cassette_dir, monkeypatch) -> None:  # noqa: D103
+    monkeypatch.setenv("CRYPTO_ADVISOR_CASSETTE_MODE", "replay")
+
+    with pytest.raises(RuntimeError, match="No cassette for fetch_binance_chart"):
+        fetch_binance_chart("BTCUSDT", "1h", 5)
@@ -0,0 +1,99 @@
+"""Unit tests for ``crypto_advisor.utils.compact``."""
+
+from __future__ import annotations
+
+import json
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from crypto_advisor.utils.compact import (
+    DOWNSAMPLED_KEY,
+    SerializationPolicy,
+    as_records,
+    compact,
+    get_policy,
+    serialize_for_llm,
+)
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def candles() -> list[dict]:
+    """Twenty hourly candles with full-precision floats."""
+
+    start = datetime(2024, 1, 1)
+    return [
+        {
+            "time": start + timedelta(hours=i),
+            "open": 1000 + i / 3,
+            "high": 1010 + i / 3,
+            "low": 990 + i / 3,
+            "close": 1001 + i / 7,
+            "volume": 12345.678901,
+        }
+        for i in range(20)
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_compact_converts_tables_to_columns(candles) -> None:  # noqa: D103
+    result = compact(candles, precision=6)
+
+    assert set(result) == {"time", "open", "high", "low", "close", "volume"}
+    assert result["time"][0] == "2024-01-01T00:00"
+    assert result["open"][1] == 1000.33
+    assert as_records(result)[0]["close"] == 1001.0
+
+
+def test_compact_handles_numpy_nan_and_timestamp_keys() -> None:  # noqa: D103
+    value = {"RSI": np.float64(55.123456789), "ADX": float("nan"), "n": np.int64(3)}
+    patterns = {"doji": {datetime(2024, 1, 1, 4): -100.0}}
+
+    assert compact(value, precision=4) == {"RSI": 55.12, "ADX": None, "n": 3}
+    assert compact(patterns) == {"doji": {"2024-01-01T04:00": -100.0}}
+
+
+def test_downsampling_keeps_last_point(candles) -> None:  # noqa: D103
+    result = compact(candles, max_points=5)
+
+    assert len(result["time"]) == 5
+    assert result["time"][-1] == "2024-01-01T19:00"
+    assert result[DOWNSAMPLED_KEY] == 20
+
+
+def test_budget_shrinks_histories(candles) -> None:  # noqa: D103
+    payload = {"historical": candles * 10}
+    unbounded = serialize_for_llm(payload, "test", SerializationPolicy())
+    bounded = serialize_for_llm(payload, "test", SerializationPolicy(max_tokens=unbounded.tokens // 4))
+
+    assert bounded.tokens <= unbounded.tokens // 4
+    assert json.loads(bounded.text)["historical"][DOWNSAMPLED_KEY] == 200
+
+
+def test_budget_never_downsamples_when_disabled(candles) -> None:  # noqa: D103
+    result = serialize_for_llm(candles, "test", SerializationPolicy(max_tokens=10, downsample=False))
+
+    assert len(json.loads(result.text)["time"]) == len(candles)
+
+
+def test_policy_env_override(monkeypatch) -> None:  # noqa: D103
+    monkeypatch.setenv("CRYPTO_ADVISOR_TOKEN_BUDGET_FEAR_GREED_INDEX", "123")
+
+    assert get_policy("fear_greed_index").max_tokens == 123
+
+
+def test_candles_keep_full_precision_for_the_chart_tool(candles) -> None:  # noqa: D103
+    text = serialize_for_llm(candles, "binance_chart_tool").text
+
+    echoed = as_records(json.loads(text))
+    assert [row["close"] for row in echoed] == [row["close"] for row in candles]
+    assert compact(candles)["close"][1] != candles[1]["close"]  # other data is still rounded
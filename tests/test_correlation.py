@@ -0,0 +1,87 @@
+"""Unit tests for ``crypto_advisor.services.correlation``."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from crypto_advisor.harness.upstream import UpstreamSimulator
+from crypto_advisor.services.correlation import (
+    RollingCorrelation,
+    RollingCovariance,
+    aligned_closes,
+    correlation_report,
+)
+
+
+@pytest.fixture()
+def closes() -> np.ndarray:
+    """Random-walk closes for 6 symbols over 120 candles."""
+
+    rng = np.random.default_rng(7)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (120, 6)), axis=0))
+
+
+def test_rolling_covariance_matches_batch_computation() -> None:  # noqa: D103
+    rng = np.random.default_rng(1)
+    data = rng.normal(size=(50, 4))
+    rolling = RollingCovariance(4, window=10, resync_every=7)
+
+    for end, row in enumerate(data, start=1):
+        rolling.push(row)
+        if end >= 2:
+            window = data[max(0, end - 10) : end]
+            np.testing.assert_allclose(rolling.covariance(), np.cov(window.T), atol=1e-12)
+            np.testing.assert_allclose(rolling.covariance_with(2), np.cov(window.T)[:, 2], atol=1e-12)
+
+
+def test_incremental_update_equals_fresh_tracker(closes) -> None:  # noqa: D103
+    symbols = ["BTCUSDT", "A", "B", "C", "D", "E"]
+    times = np.arange(len(closes)).astype("datetime64[h]")
+    incremental = RollingCorrelation(symbols=symbols, window=30)
+    incremental.update(times[:100], closes[:100])
+
+    assert incremental.update(times[5:], closes[5:]) == 20
+
+    fresh = RollingCorrelation(symbols=symbols, window=30)
+    fresh.update(times, closes)
+    returns = np.diff(np.log(closes), axis=0)[-30:]
+    np.testing.assert_allclose(incremental.correlation(), np.corrcoef(returns.T), atol=1e-12)
+    np.testing.assert_allclose(incremental.betas(), fresh.betas(), atol=1e-12)
+    assert incremental.betas()[0] == pytest.approx(1.0)
+    assert incremental.last_time == times[-1]
+
+
+def test_aligned_closes_intersects_times_and_drops_short_series() -> None:  # noqa: D103
+    start = datetime(2024, 1, 1)
+
+    def candles(offsets: range, close: float) -> list[dict]:
+        return [{"time": start + timedelta(hours=i), "close": close + i} for i in offsets]
+
+    by_symbol = {
+        "BTCUSDT": candles(range(0, 10), 100.0),
+        "ETHUSDT": candles(range(2, 12), 10.0),
+        "NEW": candles(range(3), 1.0),
+    }
+    times, symbols, matrix, errors = aligned_closes(by_symbol, min_length=5)
+
+    assert symbols == ["BTCUSDT", "ETHUSDT"]
+    assert len(times) == 8 and matrix.shape == (8, 2)
+    assert matrix[0].tolist() == [102.0, 12.0]
+    assert "insufficient history" in errors["NEW"]
+
+
+def test_correlation_report_from_upstream(monkeypatch) -> None:  # noqa: D103
+    with UpstreamSimulator() as simulator:
+        for key, value in simulator.env().items():
+            monkeypatch.setenv(key, value)
+        report = correlation_report(["ethusdt", "SOLUSDT"], interval="1h", limit=100, window=48, history=3)
+
+    assert report["symbols"] == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert report["observations"] == 48
+    assert report["beta"]["BTCUSDT"] == 1.0
+    assert len(report["correlation"]) == 3 and report["correlation"][1][1] == 1.0
+    assert len(report["beta_history"]) == 3
+    assert len(report["most_correlated"]) == 3
@@ -0,0 +1,161 @@
+"""Unit tests for ``crypto_advisor.providers.depth``."""
+
+from __future__ import annotations
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from crypto_advisor.harness.upstream import (
+    DEPTH_SNAPSHOT_UPDATE_ID,
+    UpstreamSimulator,
+    depth_diff_events,
+    depth_snapshot_payload,
+)
+from crypto_advisor.providers import depth
+from crypto_advisor.providers.depth import OrderBook, OrderBookGap, OrderBookSet, maintain_books
+
+
+@pytest.fixture()
+def book() -> OrderBook:
+    """Book with three levels per side around a mid of 100."""
+
+    return OrderBook(
+        "btcusdt",
+        10,
+        bids=[["99", "1"], ["99.5", "2"], ["98", "10"]],
+        asks=[["100.5", "2"], ["101", "1"], ["103", "10"]],
+    )
+
+
+@pytest.fixture()
+def upstream(monkeypatch):
+    """Upstream simulator with the providers pointed at it."""
+
+    with UpstreamSimulator() as simulator:
+        for key, value in simulator.env().items():
+            monkeypatch.setenv(key, value)
+        yield simulator
+
+
+def _apply_naively(levels: dict[float, float], updates: list[list[str]]) -> None:
+    for price, quantity in updates:
+        if float(quantity) == 0:
+            levels.pop(float(price), None)
+        else:
+            levels[float(price)] = float(quantity)
+
+
+def test_sides_are_sorted_and_metrics_vectorized(book) -> None:  # noqa: D103
+    assert book.symbol == "BTCUSDT"
+    assert book.bid_prices.tolist() == [98.0, 99.0, 99.5]
+    assert (book.best_bid, book.best_ask, book.mid) == (99.5, 100.5, 100.0)
+
+    bid_depth, ask_depth = book.depth_within([0.6, 1.0, 5.0])
+    assert bid_depth.tolist() == [199.0, 298.0, 1278.0]
+    assert ask_depth.tolist() == [201.0, 302.0, 1332.0]
+
+    # 201 USDT fills the first ask level exactly; 2000 USDT exceeds the book.
+    buy = book.slippage([201.0, 2000.0], "buy")
+    assert buy[0] == pytest.approx(50.0)
+    assert np.isnan(buy[1])
+    metrics = book.metrics(pcts=(1.0,), notionals=(100.0,))
+    assert metrics["depth"]["1%"]["imbalance"] == pytest.approx(-4 / 600, abs=1e-6)
+
+
+def test_bulk_diffs_match_sequential_application(book) -> None:  # noqa: D103
+    events = [
+        {"U": 5, "u": 10, "b": [["1", "1"]], "a": []},  # stale, dropped
+        {"U": 9, "u": 12, "b": [["99", "0"], ["97", "3"]], "a": [["100.5", "1"]]},
+        {"U": 13, "u": 13, "b": [["97", "4"], ["99.7", "1"]], "a": [["100.5", "0"], ["104", "2"]]},
+    ]
+    bids = dict(zip(book.bid_prices.tolist(), book.bid_quantities.tolist()))
+    asks = dict(zip(book.ask_prices.tolist(), book.ask_quantities.tolist()))
+    for event in events[1:]:
+        _apply_naively(bids, event["b"])
+        _apply_naively(asks, event["a"])
+
+    assert book.apply_diffs(events) == 2
+    assert book.last_update_id == 13
+    assert dict(zip(book.bid_prices.tolist(), book.bid_quantities.tolist())) == bids
+    assert dict(zip(book.ask_prices.tolist(), book.ask_quantities.tolist())) == asks
+    assert book.bid_prices.tolist() == sorted(bids)
+
+
+def test_gap_leaves_book_unchanged(book) -> None:  # noqa: D103
+    with pytest.raises(OrderBookGap):
+        book.apply_diffs([{"U": 11, "u": 11, "b": [["99", "0"]], "a": []}, {"U": 13, "u": 14, "b": [], "a": []}])
+
+    assert book.last_update_id == 10
+    assert book.best_bid == 99.5
+
+
+def _snapshot(symbol: str, last_update_id: int) -> OrderBook:
+    payload = depth_snapshot_payload(symbol, 50)
+    return OrderBook.from_snapshot(symbol, {**payload, "lastUpdateId": last_update_id})
+
+
+def test_book_set_follows_stand_in_feed(upstream, monkeypatch) -> None:  # noqa: D103
+    books = OrderBookSet(snapshot_limit=50)
+    for symbol in ("BTCUSDT", "ETHUSDT"):
+        assert books.load(symbol)
+    assert books.books["ETHUSDT"].last_update_id == DEPTH_SNAPSHOT_UPDATE_ID
+
+    feed = depth_diff_events("BTCUSDT", 40, levels=50) + depth_diff_events("ETHUSDT", 40, levels=50)
+    assert books.apply(feed) == set()
+    assert books.books["BTCUSDT"].last_update_id == feed[39]["u"]
+
+    gapped = depth_diff_events("ETHUSDT", 3, first_update_id=feed[-1]["u"] + 5)
+    monkeypatch.setattr(depth, "fetch_depth_snapshot", lambda symbol, limit: _snapshot(symbol, gapped[0]["u"]))
+
+    async def source():
+        for event in gapped:
+            yield event
+
+    asyncio.run(maintain_books(books, source()))
+    assert not books.stale
+    assert books.books["ETHUSDT"].last_update_id == gapped[-1]["u"]  # reloaded, buffered events replayed
+    assert set(books.metrics()) == {"BTCUSDT", "ETHUSDT"}
+
+
+def test_buffered_events_need_a_snapshot_that_connects() -> None:  # noqa: D103
+    books = OrderBookSet()
+    events = depth_diff_events("ETHUSDT", 5, first_update_id=DEPTH_SNAPSHOT_UPDATE_ID + 10)
+    books.apply(events)
+    assert list(books.buffers["ETHUSDT"]) == events
+
+    assert not books.install(_snapshot("ETHUSDT", DEPTH_SNAPSHOT_UPDATE_ID))  # older than the first event
+    assert "ETHUSDT" in books.stale and len(books.buffers["ETHUSDT"]) == 5
+
+    assert books.install(_snapshot("ETHUSDT", events[1]["u"]))
+    assert books.books["ETHUSDT"].last_update_id == events[-1]["u"]
+    assert not books.stale and "ETHUSDT" not in books.buffers
+
+
+def test_failed_load_is_retried_while_other_books_update(upstream, monkeypatch) -> None:  # noqa: D103
+    books = OrderBookSet(snapshot_limit=50)
+    books.load("BTCUSDT")
+    btc = depth_diff_events("BTCUSDT", 6, levels=50)
+    eth = depth_diff_events("ETHUSDT", 6, levels=50)
+    attempts = []
+
+    def fetch(symbol: str, limit: int) -> OrderBook:
+        attempts.append(symbol)
+        if len(attempts) == 1:
+            raise RuntimeError("Failed to fetch order book from Binance")
+        return _snapshot(symbol, eth[1]["u"])
+
+    monkeypatch.setattr(depth, "fetch_depth_snapshot", fetch)
+
+    async def source():
+        for pair in zip(eth, btc):
+            for event in pair:
+                yield event
+            await asyncio.sleep(0.02)
+
+    asyncio.run(maintain_books(books, source(), symbols=["ethusdt"], reload_backoff=0))
+    assert attempts == ["ETHUSDT", "ETHUSDT"]
+    assert not books.stale
+    assert books.books["ETHUSDT"].last_update_id == eth[-1]["u"]  # no event lost while unloaded
+    assert books.books["BTCUSDT"].last_update_id == btc[-1]["u"]
@@ -0,0 +1,119 @@
+"""Tests of the rule-based fast path of ``/technical-analysis``.
+
+The providers are pointed at :class:`UpstreamSimulator`; the LLM workflow is
+replaced by a stub so each test picks the LLM outcome.
+"""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from crypto_advisor.admission import llm_admission
+from crypto_advisor.harness.upstream import UpstreamSimulator
+
+
+class _StubApp:
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+        self.calls = 0
+
+    def invoke(self, payload: dict) -> dict:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return {"messages": [SimpleNamespace(content="LLM analysis.")]}
+
+
+@pytest.fixture()
+def server(monkeypatch):
+    """The server module with its providers pointed at the simulator."""
+
+    with UpstreamSimulator() as simulator:
+        for key, value in simulator.env().items():
+            monkeypatch.setenv(key, value)
+        monkeypatch.setenv("CRYPTO_ADVISOR_RESPONSE_CACHE", "off")
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        monkeypatch.setenv("SERPER_API_KEY", "test")
+        from crypto_advisor import server
+
+        yield server
+
+
+def _client(server, monkeypatch, app: _StubApp) -> TestClient:
+    monkeypatch.setattr(server, "get_technical_analysis_app", lambda symbol: app)
+    return TestClient(server.app)
+
+
+def _saturate(monkeypatch) -> None:
+    monkeypatch.setattr(llm_admission, "_in_flight", llm_admission.max_in_flight)
+    monkeypatch.setattr(llm_admission, "_waiting", llm_admission.max_queue)
+
+
+def _assert_uncacheable_rules(response) -> None:
+    assert response.status_code == 200
+    assert response.headers["X-Report-Source"] == "rules"
+    assert "ETag" not in response.headers
+    assert response.headers["Cache-Control"] == "no-store"
+    assert response.json()["message"].startswith("SOLUSDT technical summary")
+
+
+def test_llm_answer_is_cacheable(server, monkeypatch) -> None:  # noqa: D103
+    response = _client(server, monkeypatch, _StubApp()).get("/technical-analysis", params={"symbol": "SOLUSDT"})
+
+    assert response.status_code == 200
+    assert response.json()["message"] == "LLM analysis."
+    assert "X-Report-Source" not in response.headers
+    assert response.headers["ETag"].startswith('W/"')
+
+
+def test_fast_mode_has_its_own_etag(server, monkeypatch) -> None:  # noqa: D103
+    stub = _StubApp()
+    client = _client(server, monkeypatch, stub)
+    fast = client.get("/technical-analysis", params={"symbol": "SOLUSDT", "mode": "fast"})
+    llm_etag = server.candle_validators("technical_analysis", {"symbol": "SOLUSDT"}, server.TA_INTERVAL).etag
+
+    assert fast.status_code == 200 and fast.headers["X-Report-Source"] == "rules"
+    assert fast.headers["ETag"] != llm_etag
+    assert "no-store" not in fast.headers.get("Cache-Control", "")
+    revalidated = client.get(
+        "/technical-analysis",
+        params={"symbol": "SOLUSDT", "mode": "fast"},
+        headers={"If-None-Match": fast.headers["ETag"]},
+    )
+    assert revalidated.status_code == 304
+    assert stub.calls == 0
+
+
+def test_llm_error_falls_back_to_the_rules(server, monkeypatch) -> None:  # noqa: D103
+    stub = _StubApp(RuntimeError("model unavailable"))
+    client = _client(server, monkeypatch, stub)
+
+    _assert_uncacheable_rules(client.get("/technical-analysis", params={"symbol": "SOLUSDT"}))
+    assert stub.calls == 1
+
+
+def test_saturated_queue_skips_the_llm(server, monkeypatch) -> None:  # noqa: D103
+    _saturate(monkeypatch)
+    stub = _StubApp()
+    client = _client(server, monkeypatch, stub)
+
+    _assert_uncacheable_rules(client.get("/technical-analysis", params={"symbol": "SOLUSDT"}))
+    assert stub.calls == 0
+
+
+def test_admission_rejection_falls_back_or_is_returned(server, monkeypatch) -> None:  # noqa: D103
+    _saturate(monkeypatch)
+    monkeypatch.setenv("CRYPTO_ADVISOR_FAST_FALLBACK_QUEUE", str(llm_admission.max_queue + 1))
+    stub = _StubApp()
+    client = _client(server, monkeypatch, stub)
+
+    _assert_uncacheable_rules(client.get("/technical-analysis", params={"symbol": "SOLUSDT"}))
+
+    monkeypatch.setenv("CRYPTO_ADVISOR_FAST_FALLBACK", "0")
+    rejected = client.get("/technical-analysis", params={"symbol": "SOLUSDT"})
+    assert rejected.status_code == 429
+    assert "Retry-After" in rejected.headers
+    assert stub.calls == 0
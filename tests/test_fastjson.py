@@ -0,0 +1,35 @@
+"""Unit tests for ``crypto_advisor.utils.fastjson``."""
+
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from crypto_advisor.utils.fastjson import FastJSONResponse, dumps
+
+
+def test_dumps_numpy_scalars_and_nan() -> None:  # noqa: D103
+    payload = {"RSI": np.float64(55.5), "OBV": np.int64(-12), "ADX": np.float64("nan"), "flag": np.bool_(True)}
+
+    assert json.loads(dumps(payload)) == {"RSI": 55.5, "OBV": -12, "ADX": None, "flag": True}
+
+
+def test_dumps_timestamp_values_and_keys() -> None:  # noqa: D103
+    payload = {
+        "time": pd.Timestamp("2024-01-01 04:00"),
+        "detected_patterns": {"doji": {pd.Timestamp("2024-01-01 08:00"): -100.0}},
+    }
+
+    assert json.loads(dumps(payload)) == {
+        "time": "2024-01-01T04:00:00",
+        "detected_patterns": {"doji": {"2024-01-01T08:00:00": -100.0}},
+    }
+
+
+def test_response_renders_with_fast_encoder() -> None:  # noqa: D103
+    response = FastJSONResponse({"volatility_index": np.float64(2.5)})
+
+    assert response.body == b'{"volatility_index":2.5}'
+    assert response.media_type == "application/json"
@@ -0,0 +1,112 @@
+"""Unit tests for the offline performance harness in ``crypto_advisor.harness``.
+
+The providers are pointed at the local upstream simulator, so these tests
+exercise the real request/parsing code without network access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+import requests
+from fastapi import FastAPI
+from langchain_core.messages import HumanMessage
+
+from crypto_advisor.harness.fake_llm import FakeAdvisorChatModel
+from crypto_advisor.harness.loadgen import percentile, run_load, serve_in_thread
+from crypto_advisor.harness.upstream import UpstreamConfig, UpstreamSimulator
+from crypto_advisor.providers.binance import fetch_binance_chart
+from crypto_advisor.providers.coinmarketcap import fetch_altcoin_dominance, fetch_fear_greed_index
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def upstream(monkeypatch):  # noqa: D103
+    with UpstreamSimulator() as simulator:
+        for key, value in simulator.env().items():
+            monkeypatch.setenv(key, value)
+        yield simulator
+
+
+# ---------------------------------------------------------------------------
+# Upstream simulator
+# ---------------------------------------------------------------------------
+
+
+def test_simulated_klines_are_parsed_by_provider(upstream) -> None:  # noqa: D103
+    candles = fetch_binance_chart("ETHUSDT", "4h", 50)
+
+    assert len(candles) == 50
+    assert candles == fetch_binance_chart("ETHUSDT", "4h", 50)  # deterministic per symbol
+    assert all(c["low"] <= min(c["open"], c["close"]) for c in candles)
+
+
+def test_simulated_market_endpoints_are_parsed_by_provider(upstream) -> None:  # noqa: D103
+    dominance = fetch_altcoin_dominance(30)
+    sentiment = fetch_fear_greed_index(30)
+
+    assert len(dominance["historical"]) == 31
+    assert len(sentiment["historical"]) == 30
+    assert upstream.requests_served == 2
+
+
+def test_error_injection() -> None:  # noqa: D103
+    with UpstreamSimulator(UpstreamConfig(error_rate=1.0, error_status=429)) as simulator:
+        response = requests.get(f"{simulator.base_url}/fng/", params={"limit": 1}, timeout=5)
+
+    assert response.status_code == 429
+
+
+# ---------------------------------------------------------------------------
+# Fake LLM
+# ---------------------------------------------------------------------------
+
+
+def test_fake_llm_is_deterministic_and_reports_usage() -> None:  # noqa: D103
+    llm = FakeAdvisorChatModel()
+    prompt = [HumanMessage(content="Analyse ETHUSDT")]
+
+    first = llm.generate([prompt])
+    second = llm.generate([prompt])
+
+    assert first.generations[0][0].text == second.generations[0][0].text
+    assert first.llm_output["token_usage"]["total_tokens"] > 0
+    assert llm.invoke("Analyse BTCUSDT").content != first.generations[0][0].text
+
+
+# ---------------------------------------------------------------------------
+# Load generator
+# ---------------------------------------------------------------------------
+
+
+def test_percentile_nearest_rank() -> None:  # noqa: D103
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([], 95) == 0.0
+
+
+def test_run_load_reports_per_endpoint_stats() -> None:  # noqa: D103
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok() -> dict:
+        return {"ok": True}
+
+    @app.get("/fail")
+    async def fail() -> dict:
+        raise RuntimeError("boom")
+
+    with serve_in_thread(app) as base_url:
+        report = asyncio.run(run_load(base_url, ["/ok", "/fail"], concurrency=4, requests_per_endpoint=10))
+
+    ok_stats, fail_stats = report.summaries()
+    assert (ok_stats["requests"], ok_stats["errors"]) == (10, 0)
+    assert (fail_stats["requests"], fail_stats["errors"]) == (10, 10)
+    assert ok_stats["p50_ms"] <= ok_stats["p99_ms"]
+    assert "elapsed" in report.format_table()
@@ -0,0 +1,44 @@
+"""Unit tests for ``crypto_advisor.utils.http_cache``."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from crypto_advisor.utils.http_cache import candle_bounds, candle_validators, not_modified
+
+
+def _utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_candle_bounds_follow_binance_boundaries() -> None:  # noqa: D103
+    now = _utc(2024, 3, 7, 10, 30)  # a Thursday
+
+    assert candle_bounds("4h", now) == (_utc(2024, 3, 7, 8), _utc(2024, 3, 7, 12))
+    assert candle_bounds("1d", now) == (_utc(2024, 3, 7), _utc(2024, 3, 8))
+    assert candle_bounds("1w", now) == (_utc(2024, 3, 4), _utc(2024, 3, 11))
+    assert candle_bounds("1M", _utc(2024, 12, 31, 23)) == (_utc(2024, 12, 1), _utc(2025, 1, 1))
+
+
+def test_etag_changes_only_when_a_candle_closes() -> None:  # noqa: D103
+    params = {"symbol": "ETHUSDT"}
+    early = candle_validators("technical_analysis", params, "4h", _utc(2024, 3, 7, 8, 1))
+    late = candle_validators("technical_analysis", params, "4h", _utc(2024, 3, 7, 11, 59, 30))
+    next_candle = candle_validators("technical_analysis", params, "4h", _utc(2024, 3, 7, 12, 0, 1))
+    other_symbol = candle_validators("technical_analysis", {"symbol": "BTCUSDT"}, "4h", _utc(2024, 3, 7, 8, 1))
+
+    assert early.etag == late.etag
+    assert next_candle.etag != early.etag
+    assert other_symbol.etag != early.etag
+    assert (early.max_age, late.max_age) == (3 * 3600 + 59 * 60, 30)
+    assert late.headers["Cache-Control"] == "public, max-age=30"
+
+
+def test_not_modified_uses_weak_comparison() -> None:  # noqa: D103
+    etag = 'W/"abc"'
+
+    assert not_modified('"abc"', etag)
+    assert not_modified('W/"xyz", W/"abc"', etag)
+    assert not_modified("*", etag)
+    assert not not_modified('"xyz"', etag)
+    assert not not_modified(None, etag)
@@ -0,0 +1,126 @@
+"""Unit tests for ``crypto_advisor.services.jobs``."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from crypto_advisor.services.jobs import (
+    FAILED,
+    INTERRUPTED,
+    RUNNING,
+    SUCCEEDED,
+    DiskJobStore,
+    InMemoryJobStore,
+    Job,
+    JobManager,
+)
+
+
+def test_identical_submissions_share_one_job() -> None:  # noqa: D103
+    calls: list[dict] = []
+
+    async def runner(workflow: str, params: dict) -> str:
+        calls.append(dict(params))
+        await asyncio.sleep(0.01)
+        return f"{workflow}:{params['symbol']}"
+
+    async def scenario() -> None:
+        manager = JobManager(InMemoryJobStore(), runner)
+        first, created_first = manager.submit("technical_analysis", {"symbol": "ETHUSDT"})
+        second, created_second = manager.submit("technical_analysis", {"symbol": "ETHUSDT"})
+        other, _ = manager.submit("technical_analysis", {"symbol": "BTCUSDT"})
+
+        assert (created_first, created_second) == (True, False)
+        assert second.job_id == first.job_id
+        assert other.job_id != first.job_id
+
+        done = await manager.wait(first.job_id, timeout=1)
+        assert done.status == SUCCEEDED
+        assert done.message == "technical_analysis:ETHUSDT"
+
+        # Once finished, a new submission starts a fresh job.
+        third, created_third = manager.submit("technical_analysis", {"symbol": "ETHUSDT"})
+        assert created_third and third.job_id != first.job_id
+        await manager.wait(third.job_id, timeout=1)
+
+    asyncio.run(scenario())
+    assert len(calls) == 3
+
+
+def test_failures_are_recorded_and_expired_jobs_purged(tmp_path) -> None:  # noqa: D103
+    async def runner(workflow: str, params: dict) -> str:
+        raise RuntimeError("upstream down")
+
+    async def scenario() -> None:
+        manager = JobManager(DiskJobStore(tmp_path), runner, ttl=0)
+        job, _ = manager.submit("market_overview", {"days": 30})
+        finished = await manager.wait(job.job_id, timeout=1)
+        assert finished is None  # ttl=0 expires the job as soon as it finishes
+
+        stored = Job(job_id="0" * 32, workflow="w", params={}, status=FAILED, finished_at=0.0, error="x")
+        manager.store.put(stored)
+        assert manager.purge_expired() == 1
+        assert manager.store.get("0" * 32) is None
+        assert manager.get("not-a-job-id") is None
+
+    asyncio.run(scenario())
+
+
+def test_disk_store_round_trip(tmp_path) -> None:  # noqa: D103
+    store = DiskJobStore(tmp_path)
+    job = Job(job_id="f" * 32, workflow="technical_analysis", params={"symbol": "ETHUSDT"}, status=SUCCEEDED)
+    store.put(job)
+
+    assert store.get(job.job_id) == job
+    assert [j.job_id for j in store.jobs()] == [job.job_id]
+
+
+def test_jobs_left_running_by_a_previous_process_fail(tmp_path) -> None:  # noqa: D103
+    async def runner(workflow: str, params: dict) -> str:
+        return "done"
+
+    store = DiskJobStore(tmp_path)
+    store.put(Job(job_id="a" * 32, workflow="market_overview", params={"days": 30}, status=RUNNING))
+    store.put(Job(job_id="b" * 32, workflow="market_overview", params={"days": 60}, status=SUCCEEDED))
+
+    manager = JobManager(store, runner)
+    interrupted = manager.get("a" * 32)
+    assert (interrupted.status, interrupted.error) == (FAILED, INTERRUPTED)
+    assert interrupted.finished_at is not None
+    assert manager.get("b" * 32).status == SUCCEEDED
+
+    async def scenario() -> None:
+        job, created = manager.submit("market_overview", {"days": 30})
+        assert created and job.job_id != "a" * 32
+        assert (await manager.wait(job.job_id, timeout=1)).status == SUCCEEDED
+
+    asyncio.run(scenario())
+
+
+def test_expired_jobs_are_purged_off_the_event_loop(tmp_path) -> None:  # noqa: D103
+    listings: list[threading.Thread] = []
+
+    class CountingStore(DiskJobStore):
+        def jobs(self):
+            listings.append(threading.current_thread())
+            return super().jobs()
+
+    async def runner(workflow: str, params: dict) -> str:
+        return "done"
+
+    async def scenario() -> None:
+        store = CountingStore(tmp_path)
+        store.put(Job(job_id="0" * 32, workflow="w", params={}, status=FAILED, finished_at=0.0))
+        manager = JobManager(store, runner, ttl=60, purge_interval=3600)
+        listings.clear()  # the start-up recovery
+
+        for days in (1, 2, 3):
+            job, _ = manager.submit("market_overview", {"days": days})
+            await manager.wait(job.job_id, timeout=1)
+        await asyncio.gather(*manager._tasks)
+
+        assert len(listings) == 1 and listings[0] is not threading.main_thread()
+        assert store.get("0" * 32) is None
+
+    asyncio.run(scenario())
@@ -0,0 +1,63 @@
+"""Unit tests for ``crypto_advisor.metrics``."""
+
+from __future__ import annotations
+
+import inspect
+
+import pytest
+
+from crypto_advisor.metrics import NODE_SECONDS, Counter, Gauge, Histogram, Registry, _Metric, timed_node
+
+
+def test_render_prometheus_text_format() -> None:  # noqa: D103
+    registry = Registry()
+    requests = Counter("demo_requests", "Requests served.", ("route",), registry=registry)
+    latency = Histogram("demo_seconds", "Latency.", ("route",), buckets=(0.1, 1), registry=registry)
+    Gauge("demo_ratio", "Ratio.", ("cache",), collect=lambda: {("response",): 0.5}, registry=registry)
+
+    requests.inc(route='/a"b')
+    requests.inc(2, route='/a"b')
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, route="/a")
+
+    assert registry.render().splitlines() == [
+        "# HELP demo_requests Requests served.",
+        "# TYPE demo_requests counter",
+        'demo_requests_total{route="/a\\"b"} 3',
+        "# HELP demo_seconds Latency.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{route="/a",le="0.1"} 2',
+        'demo_seconds_bucket{route="/a",le="1"} 3',
+        'demo_seconds_bucket{route="/a",le="+Inf"} 4',
+        'demo_seconds_sum{route="/a"} 3.65',
+        'demo_seconds_count{route="/a"} 4',
+        "# HELP demo_ratio Ratio.",
+        "# TYPE demo_ratio gauge",
+        'demo_ratio{cache="response"} 0.5',
+    ]
+
+
+def test_labels_must_match_declaration() -> None:  # noqa: D103
+    counter = Counter("demo_errors", "Errors.", ("kind",), registry=None)
+
+    with pytest.raises(ValueError):
+        counter.inc(route="/a")
+
+
+def test_metric_types_must_implement_samples() -> None:  # noqa: D103
+    class Untyped(_Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Untyped("demo_untyped", "Untyped.", registry=None)
+
+
+def test_timed_node_preserves_signature_and_counts() -> None:  # noqa: D103
+    def node(state: dict, config: dict) -> dict:
+        return {"seen": config["x"]}
+
+    wrapped = timed_node("demo", "node", node)
+
+    assert list(inspect.signature(wrapped).parameters) == ["state", "config"]
+    assert wrapped({}, config={"x": 1}) == {"seen": 1}
+    assert NODE_SECONDS.count(workflow="demo", node="node") == 1
@@ -0,0 +1,59 @@
+"""Unit tests for ``crypto_advisor.services.narrative``."""
+
+from __future__ import annotations
+
+from crypto_advisor.services.narrative import BEARISH, BULLISH, NEUTRAL, market_narrative, technical_narrative
+
+CANDLES = {"count": 100, "last_close": 2150.0, "change_pct": 7.5}
+UPTREND = {"EMA_20": 2100.0, "SMA_50": 2000.0, "ADX": 31.0, "RSI": 62.0, "MACD": 12.0, "MACD_Signal": 9.0, "ATR": 40.0}
+VOLATILITY = {"volatility_index": 3.4, "volatility_category": "High"}
+
+
+def _outlook(text: str) -> str:
+    return text.splitlines()[-1].split(".")[0].removeprefix("Outlook: ")
+
+
+def test_uptrend_reads_bullish_and_is_deterministic() -> None:  # noqa: D103
+    patterns = {"engulfing": {"2024-03-01 04:00:00": 100.0}}
+    text = technical_narrative("ETHUSDT", CANDLES, UPTREND, VOLATILITY, patterns)
+
+    assert text == technical_narrative("ETHUSDT", CANDLES, UPTREND, VOLATILITY, patterns)
+    assert text.startswith("ETHUSDT technical summary (4h candles): +7.50% over the last 100 candles.")
+    assert "uptrend: price 2,150.00 is above the 20 EMA (2,100.00) and above the 50 SMA (2,000.00)" in text
+    assert "ADX 31.0 signals a strong trend" in text
+    assert "bullish engulfing" in text and "Volatility is high (index 3.4/5, ATR 40.00)." in text
+    assert _outlook(text) == BULLISH
+    assert text.endswith("size positions smaller while volatility is elevated.")
+
+
+def test_downtrend_weak_adx_and_missing_data() -> None:  # noqa: D103
+    bearish = {"EMA_20": 2200.0, "SMA_50": 2300.0, "ADX": 30.0, "RSI": 38.0, "MACD": -5.0, "MACD_Signal": -2.0}
+    assert _outlook(technical_narrative("ETHUSDT", CANDLES, bearish, {})) == BEARISH
+
+    # Aligned averages without ADX strength are not a trend; RSI overbought is only a caution.
+    weak = {**UPTREND, "ADX": 12.0, "RSI": 75.0, "MACD": 8.0}
+    text = technical_narrative("ETHUSDT", CANDLES, weak, VOLATILITY)
+    assert "RSI 75.0 is overbought" in text and _outlook(text) == NEUTRAL
+
+    sparse = technical_narrative("NEWUSDT", {"last_close": 0.0123}, {"RSI": float("nan")}, {})
+    assert sparse.splitlines()[1:] == [
+        "No selected candlestick patterns formed in the last three candles.",
+        "Outlook: neutral. Wait for a decisive break of the current range before adding exposure.",
+    ]
+
+
+def test_market_narrative() -> None:  # noqa: D103
+    global_data = {"total_market_cap": 2.4e12, "total_volume_24h": 9.1e10, "btc_dominance": 52.0, "eth_dominance": 17.0}
+    dominance = {"analysis": {"btc_dominance_change": -1.25, "period_days": 60}}
+    sentiment = {
+        "current": {"value": 18, "classification": "Extreme Fear"},
+        "analysis": {"sentiment_trend": "worsening"},
+    }
+
+    text = market_narrative(global_data, dominance, sentiment)
+    assert "Total market capitalisation is $2.40T, 24h volume $91.00B" in text
+    assert "Bitcoin dominance fell 1.25 points over 60 days: capital is rotating into altcoins." in text
+    assert "reads 18 (Extreme Fear) and sentiment is worsening." in text
+    assert text.splitlines()[-1].startswith("Takeaway: Extreme fear")
+
+    assert market_narrative(None, None, None).endswith("Not enough data for a directional takeaway.")
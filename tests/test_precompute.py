@@ -0,0 +1,84 @@
+"""Unit tests for ``crypto_advisor.services.precompute``."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from crypto_advisor.services.precompute import (
+    RETRY_SECONDS,
+    TECHNICAL_ANALYSIS,
+    Precomputer,
+    ScheduledReport,
+)
+
+# 5 minutes after the 08:00 UTC close of a 4h candle.
+NOW = datetime(2024, 3, 1, 8, 5, tzinfo=timezone.utc)
+
+
+def _schedule(*symbols: str) -> list[ScheduledReport]:
+    return [ScheduledReport(TECHNICAL_ANALYSIS, {"symbol": symbol}, "4h") for symbol in symbols]
+
+
+def test_reports_are_computed_after_the_close_and_stay_fresh_until_the_next() -> None:  # noqa: D103
+    calls: list[str] = []
+
+    async def runner(workflow: str, params: dict) -> str:
+        calls.append(params["symbol"])
+        return f"analysis of {params['symbol']}"
+
+    precomputer = Precomputer(_schedule("ETHUSDT", "BTCUSDT"), runner, delay=5, jitter=30)
+    assert asyncio.run(precomputer.run_once(NOW)) == 2
+
+    report = precomputer.fresh(TECHNICAL_ANALYSIS, {"symbol": "ETHUSDT"}, "4h")
+    assert report is None  # NOW is in the past: the 08:00 data is stale today
+    report = precomputer.store.fresh(TECHNICAL_ANALYSIS, {"symbol": "ETHUSDT"}, "4h", NOW + timedelta(hours=3))
+    assert report.message == "analysis of ETHUSDT"
+    assert report.data_time == "2024-03-01T08:00:00+00:00"
+    assert precomputer.fresh(TECHNICAL_ANALYSIS, {"symbol": "SOLUSDT"}, "4h") is None
+
+    # Nothing is due again until 5-35 s after the 12:00 close.
+    assert precomputer.due(NOW + timedelta(hours=3, minutes=55)) == []
+    next_run = precomputer.due_at(precomputer.schedule[0], NOW)
+    close = datetime(2024, 3, 1, 12, tzinfo=timezone.utc).timestamp()
+    assert close + 5 <= next_run <= close + 35
+    assert precomputer.due_at(precomputer.schedule[0], NOW) == next_run  # jitter drawn once per close
+    assert len(precomputer.due(NOW + timedelta(hours=4, seconds=35))) == 2
+    assert sorted(calls) == ["BTCUSDT", "ETHUSDT"]
+
+
+def test_concurrency_is_capped() -> None:  # noqa: D103
+    active = peak = 0
+
+    async def runner(workflow: str, params: dict) -> str:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return "ok"
+
+    precomputer = Precomputer(_schedule(*(f"SYM{i}USDT" for i in range(7))), runner, jitter=0, concurrency=3)
+    assert asyncio.run(precomputer.run_once(NOW)) == 7
+    assert peak == 3
+
+
+def test_failed_run_is_retried_later() -> None:  # noqa: D103
+    attempts = 0
+
+    async def runner(workflow: str, params: dict) -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("upstream down")
+        return "ok"
+
+    precomputer = Precomputer(_schedule("ETHUSDT"), runner, jitter=0)
+    asyncio.run(precomputer.run_once(NOW))
+    assert precomputer.status(NOW)[0]["error"] == "upstream down"
+    assert precomputer.due(NOW + timedelta(seconds=RETRY_SECONDS - 1)) == []
+
+    later = NOW + timedelta(seconds=RETRY_SECONDS)
+    assert asyncio.run(precomputer.run_once(later)) == 1
+    status = precomputer.status(later)[0]
+    assert status["fresh"] and status["error"] is None
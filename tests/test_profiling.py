@@ -0,0 +1,114 @@
+"""Unit tests for ``crypto_advisor.profiling``."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import pstats
+import time
+
+import pytest
+
+from crypto_advisor import profiling
+from crypto_advisor.profiling import CPROFILE, SAMPLE, Capture, ProfileSettings, ProfileStore
+
+
+@pytest.fixture()
+def enabled(monkeypatch, tmp_path):
+    """Profiling enabled for the duration of a test."""
+
+    monkeypatch.setenv("CRYPTO_ADVISOR_PROFILE_DIR", str(tmp_path))
+    profiling.settings.cache_clear()
+    yield tmp_path
+    profiling.settings.cache_clear()
+
+
+def _busy(seconds: float) -> int:
+    deadline = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < deadline:
+        total += sum(range(100))
+    return total
+
+
+def test_disabled_profiling_leaves_functions_unwrapped(monkeypatch) -> None:  # noqa: D103
+    monkeypatch.delenv("CRYPTO_ADVISOR_PROFILE_DIR", raising=False)
+    profiling.settings.cache_clear()
+    try:
+        assert profiling.attached(_busy) is _busy
+    finally:
+        profiling.settings.cache_clear()
+
+
+def test_selection_by_header_rate_and_threshold() -> None:  # noqa: D103
+    config = ProfileSettings(token="secret", slow_ms=0)
+
+    assert profiling.select({}, config) is None
+    assert profiling.select({"x-profile-token": "wrong"}, config) is None
+    capture = profiling.select({"x-profile-token": "secret", "x-profile-mode": "cprofile"}, config)
+    assert (capture.mode, capture.trigger) == (CPROFILE if profiling.CPROFILE_PER_THREAD else SAMPLE, "header")
+
+    assert profiling.select({}, ProfileSettings(sample_rate=1.0, mode=CPROFILE)).trigger == "sampled"
+
+    slow = ProfileSettings(slow_ms=100)
+    capture = profiling.select({}, slow)
+    assert (capture.mode, capture.trigger) == (SAMPLE, "slow")
+    assert not profiling.keep(capture, 0.05, slow)
+    assert profiling.keep(capture, 0.2, slow)
+
+
+@pytest.mark.parametrize("mode", [SAMPLE, CPROFILE])
+def test_worker_threads_join_the_capture(enabled, mode) -> None:  # noqa: D103
+    capture = Capture(mode=mode, trigger="header", interval=0.001)
+
+    async def handler() -> None:
+        with profiling.capturing(capture):
+            await asyncio.gather(profiling.to_thread(_busy, 0.2), profiling.to_thread(_busy, 0.2))
+
+    asyncio.run(handler())
+    path = enabled / f"profile.{mode}"
+    samples = capture.write(path)
+
+    if capture.mode == SAMPLE:
+        assert samples and samples >= 3
+        assert any("_busy (test_profiling.py" in line for line in path.read_text().splitlines())
+    else:
+        assert len(capture.profiles) == 2
+        functions = {name for _, _, name in pstats.Stats(str(path)).stats}
+        assert "_busy" in functions
+    assert capture.threads == {}
+
+
+def test_cprofile_falls_back_to_sampling_without_per_thread_profiles(monkeypatch) -> None:  # noqa: D103
+    monkeypatch.setattr(profiling, "CPROFILE_PER_THREAD", False)
+
+    assert Capture(mode=CPROFILE, trigger="header").mode == SAMPLE
+
+
+def test_failing_profiler_does_not_fail_the_work(monkeypatch, tmp_path) -> None:  # noqa: D103
+    class Busy:
+        def enable(self) -> None:
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(profiling, "CPROFILE_PER_THREAD", True)
+    monkeypatch.setattr(profiling.cProfile, "Profile", Busy)
+    capture = Capture(mode=CPROFILE, trigger="header")
+    with capture.attach():
+        assert _busy(0.01)
+
+    assert capture.profiles == [] and capture.threads == {}
+    assert capture.write(tmp_path / "profile.prof") is None
+
+
+def test_store_keeps_only_the_slowest_profiles(tmp_path) -> None:  # noqa: D103
+    store = ProfileStore(tmp_path, keep=2)
+    entries = [
+        store.save(Capture(mode=SAMPLE, trigger="sampled"), "GET", "/x", 200, duration)
+        for duration in (0.3, 0.1, 0.5, 0.05)
+    ]
+
+    assert entries[3] is None  # faster than everything in a full index
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert [item["duration_ms"] for item in index] == [500.0, 300.0]
+    assert sorted(path.name for path in tmp_path.glob("*.folded")) == sorted(item["file"] for item in index)
+    assert [entry.id for entry in ProfileStore(tmp_path, keep=2).entries()] == [entries[2].id, entries[0].id]
@@ -0,0 +1,129 @@
+"""Unit tests for ``crypto_advisor.services.response_cache``.
+
+The tests cover both storage backends, stale-entry invalidation and the data
+fingerprint used to key cached LLM answers.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import pytest
+
+from crypto_advisor.services.response_cache import (
+    DiskBackend,
+    InMemoryLRUBackend,
+    ResponseCache,
+    closed_candles,
+    fingerprint_inputs,
+)
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+NOW = datetime(2024, 1, 1, 13, 0)
+
+
+@pytest.fixture()
+def candles() -> List[Dict[str, float | datetime]]:
+    """Five 4h candles, the last of which is still open at ``NOW``."""
+
+    start = NOW - timedelta(hours=18)
+    return [
+        {"time": start + timedelta(hours=4 * i), "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 10.0}
+        for i in range(5)
+    ]
+
+
+@pytest.fixture(params=["memory", "disk"])
+def cache(request, tmp_path) -> ResponseCache:  # noqa: D103
+    if request.param == "memory":
+        return ResponseCache(InMemoryLRUBackend(max_entries=8))
+    return ResponseCache(DiskBackend(tmp_path))
+
+
+# ---------------------------------------------------------------------------
+# Cache behaviour
+# ---------------------------------------------------------------------------
+
+
+def test_lookup_hits_on_identical_fingerprint(cache: ResponseCache) -> None:  # noqa: D103
+    params = {"symbol": "ETHUSDT"}
+    cache.store("technical_analysis", params, "abc", "cached analysis")
+
+    assert cache.lookup("technical_analysis", params, "abc") == "cached analysis"
+    assert cache.lookup("technical_analysis", {"symbol": "BTCUSDT"}, "abc") is None
+
+
+def test_lookup_invalidates_on_new_data(cache: ResponseCache) -> None:  # noqa: D103
+    params = {"days": 60}
+    cache.store("market_overview", params, "old", "stale analysis")
+
+    assert cache.lookup("market_overview", params, "new") is None
+    # The stale entry is gone even for its original fingerprint.
+    assert cache.lookup("market_overview", params, "old") is None
+
+
+def test_invalidate_by_workflow(cache: ResponseCache) -> None:  # noqa: D103
+    cache.store("technical_analysis", {"symbol": "ETHUSDT"}, "a", "eth")
+    cache.store("technical_analysis", {"symbol": "BTCUSDT"}, "b", "btc")
+    cache.store("market_overview", {"days": 60}, "c", "overview")
+
+    cache.invalidate("technical_analysis")
+
+    assert cache.lookup("technical_analysis", {"symbol": "ETHUSDT"}, "a") is None
+    assert cache.lookup("technical_analysis", {"symbol": "BTCUSDT"}, "b") is None
+    assert cache.lookup("market_overview", {"days": 60}, "c") == "overview"
+
+
+def test_lru_backend_evicts_least_recently_used() -> None:  # noqa: D103
+    cache = ResponseCache(InMemoryLRUBackend(max_entries=2))
+    cache.store("wf", {"n": 1}, "f", "one")
+    cache.store("wf", {"n": 2}, "f", "two")
+    cache.lookup("wf", {"n": 1}, "f")  # touch → most recently used
+    cache.store("wf", {"n": 3}, "f", "three")
+
+    assert cache.lookup("wf", {"n": 1}, "f") == "one"
+    assert cache.lookup("wf", {"n": 2}, "f") is None
+
+
+# ---------------------------------------------------------------------------
+# Fingerprinting
+# ---------------------------------------------------------------------------
+
+
+def test_closed_candles_drops_open_candle(candles) -> None:  # noqa: D103
+    assert len(closed_candles(candles, "4h", now=NOW)) == len(candles) - 1
+    assert len(closed_candles(candles, "4h", now=NOW + timedelta(hours=4))) == len(candles)
+
+
+def test_fingerprint_ignores_ticks_of_open_candle(candles) -> None:  # noqa: D103
+    before = fingerprint_inputs({"candles": candles, "indicators": {"RSI": 40.0}}, interval="4h", now=NOW)
+
+    candles[-1] = {**candles[-1], "close": 9.9}
+    after = fingerprint_inputs({"candles": candles, "indicators": {"RSI": 41.0}}, interval="4h", now=NOW)
+
+    assert before == after
+
+
+def test_fingerprint_changes_when_candle_closes(candles) -> None:  # noqa: D103
+    before = fingerprint_inputs({"candles": candles}, interval="4h", now=NOW)
+    after = fingerprint_inputs({"candles": candles}, interval="4h", now=NOW + timedelta(hours=4))
+
+    assert before != after
+
+
+def test_fingerprint_ignores_volatile_market_fields() -> None:  # noqa: D103
+    state = {
+        "global_data": {"total_market_cap": 1.0, "timestamp": "2024-01-01T00:00:00Z"},
+        "sentiment": {"historical": [{"value": 50, "time_until_update": "100"}]},
+    }
+    later = {
+        "global_data": {"total_market_cap": 1.0, "timestamp": "2024-01-01T00:05:00Z"},
+        "sentiment": {"historical": [{"value": 50, "time_until_update": "40"}]},
+    }
+
+    assert fingerprint_inputs(state) == fingerprint_inputs(later)
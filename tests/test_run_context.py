@@ -0,0 +1,112 @@
+"""Unit tests for ``crypto_advisor.run_context``."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from crypto_advisor.run_context import candle_summary, current_run, run_scope, tool_call_key
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture()
+def state() -> dict:
+    """Graph state with ten 4h candles and precomputed market data."""
+
+    start = datetime(2024, 1, 1)
+    candles = [
+        {"time": start + timedelta(hours=4 * i), "open": 1.0, "high": 2.0, "low": 0.5, "close": 1.0 + i, "volume": 1.0}
+        for i in range(10)
+    ]
+    return {"candles": candles, "indicators": {"RSI": 55.0}, "sentiment": {"current": {"value": 40}}}
+
+
+PARAMS = {"symbol": "ETHUSDT", "interval": "4h", "limit": 10, "days": 30}
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_scope_is_only_active_inside_block(state) -> None:  # noqa: D103
+    assert current_run() is None
+    with run_scope(state, PARAMS) as run:
+        assert current_run() is run
+    assert current_run() is None
+
+
+def test_candles_for_matching_chart(state) -> None:  # noqa: D103
+    with run_scope(state, PARAMS) as run:
+        assert run.candles_for("ethusdt", "4h", 5) == state["candles"][-5:]
+        assert run.candles_for("BTCUSDT", "4h", 5) is None
+        assert run.candles_for("ETHUSDT", "1h", 5) is None
+        assert run.candles_for("ETHUSDT", "4h", 50) is None
+
+
+def test_matches_candles_after_json_round_trip(state) -> None:  # noqa: D103
+    echoed = [{**candle, "time": str(candle["time"])} for candle in state["candles"]]
+
+    with run_scope(state, PARAMS) as run:
+        assert run.matches_candles(echoed)
+        assert not run.matches_candles(echoed[1:])
+        echoed[-1]["close"] += 1
+        assert not run.matches_candles(echoed)
+
+
+def test_for_days_requires_same_window(state) -> None:  # noqa: D103
+    with run_scope(state, PARAMS) as run:
+        assert run.for_days("sentiment", 30) == {"current": {"value": 40}}
+        assert run.for_days("sentiment", 7) is None
+
+
+def test_memoized_deduplicates_identical_calls(state) -> None:  # noqa: D103
+    calls = []
+
+    def compute() -> str:
+        calls.append(1)
+        return "chart"
+
+    with run_scope(state, PARAMS) as run:
+        first = tool_call_key("binance_chart_tool", (), {"request": {"symbol": "ethusdt", "interval": "4h"}})
+        second = tool_call_key("binance_chart_tool", (), {"request": {"symbol": " ETHUSDT", "interval": "4h"}})
+        other = tool_call_key("binance_chart_tool", (), {"request": {"symbol": "ETHUSDT", "interval": "1h"}})
+
+        assert run.memoized(first, compute) == run.memoized(second, compute) == "chart"
+        run.memoized(other, compute)
+
+    assert len(calls) == 2
+    assert (run.tool_calls, run.deduplicated_calls) == (3, 1)
+
+
+def test_memo_is_scoped_to_a_single_run(state) -> None:  # noqa: D103
+    with run_scope(state, PARAMS) as first_run:
+        first_run.memoized("key", lambda: 1)
+    with run_scope(state, PARAMS) as second_run:
+        assert second_run.memoized("key", lambda: 2) == 2
+
+
+def test_datasets_resolve_handles_within_the_run(state) -> None:  # noqa: D103
+    with run_scope(state, PARAMS) as run:
+        assert run.state_dataset() == "ETHUSDT:4h:10"
+        handle = run.register_dataset(" btcusdt", "1h", state["candles"][:3])
+
+        assert handle == "BTCUSDT:1h:3"
+        assert run.dataset(handle) == state["candles"][:3]
+        assert run.dataset("ETHUSDT:4h:10") is state["candles"]
+        assert run.dataset("SOLUSDT:1h:3") is None
+
+    with run_scope(state, PARAMS) as other_run:
+        assert other_run.dataset(handle) is None
+
+
+def test_candle_summary(state) -> None:  # noqa: D103
+    summary = candle_summary(state["candles"])
+
+    assert summary["count"] == 10
+    assert (summary["last_close"], summary["period_high"], summary["period_low"]) == (10.0, 2.0, 0.5)
+    assert summary["change_pct"] == 900.0
@@ -0,0 +1,39 @@
+"""Unit tests for ``crypto_advisor.scan``."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from crypto_advisor.scan import ScanResult, format_table, load_watchlist, rank, score
+
+
+def test_load_watchlist_from_file_and_list(tmp_path: Path) -> None:  # noqa: D103
+    watchlist = tmp_path / "watchlist.txt"
+    watchlist.write_text("# majors\nbtcusdt, ETHUSDT\n\nSOLUSDT  # alt\nETHUSDT\n")
+
+    assert load_watchlist(str(watchlist)) == ["BTCUSDT", "ETHUSDT", "SOLUSDT"]
+    assert load_watchlist("xrpusdt,BNBUSDT") == ["XRPUSDT", "BNBUSDT"]
+
+
+def test_score_combines_volatility_rsi_extremes_and_patterns() -> None:  # noqa: D103
+    calm = ScanResult("AUSDT", rsi=50.0, volatility_index=1.0)
+    oversold = ScanResult("BUSDT", rsi=20.0, volatility_index=1.0, patterns={"hammer": 100.0})
+
+    assert score(calm) == 1.0
+    assert score(oversold) == 1.0 + 3.0 + 1
+
+
+def test_rank_orders_by_score_with_errors_last() -> None:  # noqa: D103
+    results = [
+        ScanResult("AUSDT", score=1.0),
+        ScanResult("BUSDT", error="HTTP 400"),
+        ScanResult("CUSDT", score=4.0),
+        ScanResult("DUSDT", score=4.0),
+    ]
+
+    ranked = rank(results)
+
+    assert [r.symbol for r in ranked] == ["CUSDT", "DUSDT", "AUSDT", "BUSDT"]
+    table = format_table(ranked).splitlines()
+    assert table[2].split()[:2] == ["1", "CUSDT"]
+    assert table[-1].endswith("error: HTTP 400")
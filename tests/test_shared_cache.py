@@ -0,0 +1,67 @@
+"""Unit tests for ``crypto_advisor.services.shared_cache``."""
+
+from __future__ import annotations
+
+import multiprocessing
+import time
+from pathlib import Path
+
+from crypto_advisor.services.response_cache import ResponseCache, SharedBackend
+from crypto_advisor.services.shared_cache import SharedCache, shared_cached
+
+
+def _fill(db_path: str, calls_path: str) -> str:
+    def compute() -> str:
+        with open(calls_path, "a") as handle:
+            handle.write("x")
+        time.sleep(0.3)
+        return "candles"
+
+    return SharedCache(db_path).get_or_fill("klines|ETHUSDT", compute, ttl=60)
+
+
+def test_get_or_fill_computes_once_across_processes(tmp_path: Path) -> None:  # noqa: D103
+    db_path, calls_path = str(tmp_path / "shared.sqlite3"), str(tmp_path / "calls")
+    SharedCache(db_path)  # create the schema before the workers race
+
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        results = pool.starmap(_fill, [(db_path, calls_path)] * 4)
+
+    assert results == ["candles"] * 4
+    assert Path(calls_path).read_text() == "x"
+
+
+def test_ttl_and_bounded_size(tmp_path: Path) -> None:  # noqa: D103
+    cache = SharedCache(tmp_path / "shared.sqlite3", max_entries=3)
+    cache.set("stale", 1, ttl=-1)
+    for i in range(3):
+        cache.set(f"k{i}", {"value": i})
+
+    assert cache.get("stale") is None
+    assert len(cache) == 3
+    assert sorted(cache.keys()) == ["k0", "k1", "k2"]  # the expired entry went first
+
+    cache.set("k3", 3)
+    assert sorted(cache.keys()) == ["k1", "k2", "k3"]
+
+
+def test_shared_cached_keys_on_bound_arguments(tmp_path: Path, monkeypatch) -> None:  # noqa: D103
+    monkeypatch.setenv("CRYPTO_ADVISOR_SHARED_CACHE", str(tmp_path / "shared.sqlite3"))
+    calls: list[tuple] = []
+
+    @shared_cached("demo", ttl=60)
+    def fetch(symbol: str, interval: str = "1h") -> list:
+        calls.append((symbol, interval))
+        return [symbol, interval]
+
+    assert fetch("ETHUSDT") == fetch(symbol="ETHUSDT", interval="1h") == ["ETHUSDT", "1h"]
+    assert calls == [("ETHUSDT", "1h")]
+
+
+def test_response_cache_on_shared_backend(tmp_path: Path) -> None:  # noqa: D103
+    cache = ResponseCache(SharedBackend(SharedCache(tmp_path / "shared.sqlite3")))
+    cache.store("technical_analysis", {"symbol": "ETHUSDT"}, "fp", "Bullish.")
+
+    assert cache.lookup("technical_analysis", {"symbol": "ETHUSDT"}, "fp") == "Bullish."
+    cache.invalidate("technical_analysis")
+    assert cache.lookup("technical_analysis", {"symbol": "ETHUSDT"}, "fp") is None
@@ -0,0 +1,83 @@
+"""Unit tests for ``crypto_advisor.streaming``.
+
+A two-node graph with a fake streaming chat model stands in for the real
+workflows, so the SSE plumbing is exercised without network access.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import List, TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langgraph.graph import END, StateGraph
+
+from crypto_advisor.streaming import format_sse, stream_workflow_events
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+class _State(TypedDict):
+    messages: List[BaseMessage]
+
+
+def _build_app(fail: bool = False):
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="bullish momentum ahead")]))
+
+    def seed(_: _State) -> _State:
+        return {"messages": []}
+
+    def agent(_: _State, config) -> _State:  # type: ignore[no-untyped-def]
+        if fail:
+            raise RuntimeError("upstream down")
+        text = "".join(chunk.content for chunk in llm.stream("analyse", config=config))
+        return {"messages": [AIMessage(content=text)]}
+
+    graph = StateGraph(_State)
+    graph.add_node("seed", seed)
+    graph.add_node("agent", agent)
+    graph.set_entry_point("seed")
+    graph.add_edge("seed", "agent")
+    graph.add_edge("agent", END)
+    return graph.compile()
+
+
+def _collect(app) -> list[tuple[str, dict]]:  # type: ignore[no-untyped-def]
+    async def _run() -> list[str]:
+        return [frame async for frame in stream_workflow_events(app)]
+
+    events = []
+    for frame in asyncio.run(_run()):
+        event_line, data_line = frame.strip().split("\n")
+        events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+    return events
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+
+def test_format_sse_frame() -> None:  # noqa: D103
+    assert format_sse("token", {"token": "hi"}) == 'event: token\ndata: {"token": "hi"}\n\n'
+
+
+def test_stream_emits_progress_tokens_and_final_message() -> None:  # noqa: D103
+    events = _collect(_build_app())
+    names = [name for name, _ in events]
+
+    assert names[0] == "start"
+    assert ("progress", {"node": "seed"}) in events
+    assert names.count("token") > 1
+    assert "".join(data["token"] for name, data in events if name == "token") == "bullish momentum ahead"
+    assert events[-1] == ("message", {"message": "bullish momentum ahead"})
+
+
+def test_stream_reports_errors() -> None:  # noqa: D103
+    events = _collect(_build_app(fail=True))
+
+    assert events[-1] == ("error", {"detail": "upstream down"})
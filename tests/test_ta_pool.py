@@ -0,0 +1,62 @@
+"""Unit tests for ``crypto_advisor.services.ta_pool``."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from crypto_advisor.services import ta_pool, ta_service
+from crypto_advisor.warmup import synthetic_candles
+
+
+@pytest.fixture()
+def process_pool(monkeypatch):
+    """Process executor with a single worker, stopped after the test."""
+
+    monkeypatch.setenv("CRYPTO_ADVISOR_TA_EXECUTOR", "process")
+    monkeypatch.setenv("CRYPTO_ADVISOR_TA_WORKERS", "1")
+    yield
+    ta_pool.shutdown_pool()
+
+
+def test_pack_round_trip_preserves_columns() -> None:  # noqa: D103
+    candles = synthetic_candles(50)
+    block, rows = ta_pool.pack_candles(candles)
+    try:
+        columns = ta_pool.unpack_candles(block, rows)
+    finally:
+        block.close()
+        block.unlink()
+
+    assert rows == 50
+    assert columns["time"][0] == np.datetime64(candles[0]["time"])
+    np.testing.assert_array_equal(columns["close"], [candle["close"] for candle in candles])
+
+
+def test_process_mode_returns_the_same_results(process_pool) -> None:  # noqa: D103
+    candles = synthetic_candles()
+
+    assert ta_pool.start_pool() == 1
+    assert ta_pool.perform_technical_analysis(candles) == ta_service.perform_technical_analysis(candles)
+    assert ta_pool.detect_selected_patterns(candles) == ta_service.detect_selected_patterns(candles)
+    volatility = ta_pool.calculate_volatility_index(candles)
+    assert volatility["volatility_index"] == ta_service.calculate_volatility_index(candles)["volatility_index"]
+
+
+def test_broken_pool_is_rebuilt_and_the_call_retried(process_pool) -> None:  # noqa: D103
+    candles = synthetic_candles()
+    assert ta_pool.start_pool() == 1
+    broken = ta_pool.get_pool()
+    for process in list(broken._processes.values()):
+        process.kill()
+        process.join()
+
+    assert ta_pool.perform_technical_analysis(candles) == ta_service.perform_technical_analysis(candles)
+    assert ta_pool.get_pool() is not broken
+
+
+def test_unknown_mode_is_rejected(monkeypatch) -> None:  # noqa: D103
+    monkeypatch.setenv("CRYPTO_ADVISOR_TA_EXECUTOR", "gpu")
+
+    with pytest.raises(ValueError, match="CRYPTO_ADVISOR_TA_EXECUTOR"):
+        ta_pool.perform_technical_analysis(synthetic_candles())
@@ -0,0 +1,88 @@
+"""Unit tests for ``crypto_advisor.tracing``."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import pytest
+from langchain_core.outputs import LLMResult
+
+from crypto_advisor import tracing
+
+
+def test_span_is_a_noop_outside_a_trace() -> None:  # noqa: D103
+    with tracing.span("http:x", "http", host="h") as attributes:
+        attributes["status"] = "200"
+    assert tracing.current_trace() is None
+
+
+def test_spans_nest_across_worker_threads() -> None:  # noqa: D103
+    def node() -> None:
+        with tracing.span("http:fetch", "http") as attributes:
+            attributes["status"] = "200"
+
+    async def handler() -> tracing.Trace:
+        with tracing.start_trace("GET /x") as trace:
+            with tracing.span("graph", "node"):
+                await asyncio.gather(asyncio.to_thread(node), asyncio.to_thread(node))
+        return trace
+
+    trace = asyncio.run(handler())
+    by_name = {}
+    for item in trace.spans:
+        by_name.setdefault(item.name, []).append(item)
+
+    root, graph = by_name["GET /x"][0], by_name["graph"][0]
+    assert root.parent_id is None and graph.parent_id == root.span_id
+    assert [item.parent_id for item in by_name["http:fetch"]] == [graph.span_id] * 2
+    assert by_name["http:fetch"][0].attributes == {"status": "200"}
+    assert trace.totals()["http"][1] == 2
+
+
+def test_failed_span_is_marked_and_reraised() -> None:  # noqa: D103
+    with tracing.start_trace("GET /x") as trace:
+        with pytest.raises(ValueError):
+            with tracing.span("tool:chart", "tool"):
+                raise ValueError("boom")
+
+    failed = next(item for item in trace.spans if item.kind == "tool")
+    assert failed.status == "error"
+    assert failed.attributes["error"] == "ValueError: boom"
+
+
+def test_llm_handler_records_model_and_tokens() -> None:  # noqa: D103
+    handler = tracing.LLMTracingHandler()
+    run_id = uuid.uuid4()
+    with tracing.start_trace("GET /x") as trace:
+        handler.on_chat_model_start({"name": "ChatOpenAI"}, [], run_id=run_id)
+        output = {"model_name": "o3-mini", "token_usage": {"prompt_tokens": 10, "completion_tokens": 5}}
+        handler.on_llm_end(LLMResult(generations=[], llm_output=output), run_id=run_id)
+
+    llm = next(item for item in trace.spans if item.kind == "llm")
+    assert llm.name == "llm:ChatOpenAI"
+    assert llm.attributes == {"model": "o3-mini", "prompt_tokens": 10, "completion_tokens": 5}
+
+
+def test_export_round_trip_and_server_timing(tmp_path) -> None:  # noqa: D103
+    with tracing.start_trace("GET /x") as trace:
+        with tracing.span("workflow.fetch", "node"):
+            with tracing.span("http:fetch", "http"):
+                pass
+        with tracing.span("workflow.agent", "node"):
+            pass
+
+    path = tmp_path / "traces.jsonl"
+    tracing.export(trace, path)
+    tracing.export(trace, path)
+    loaded = tracing.load_spans(path)
+
+    assert list(loaded) == [trace.trace_id]
+    assert len(loaded[trace.trace_id]) == 8
+    timeline = tracing.format_timeline(loaded[trace.trace_id][:4]).splitlines()
+    labels = [line.split("| ")[-1] for line in timeline]
+    assert labels == ["GET /x", "  workflow.fetch", "    http:fetch", "  workflow.agent"]
+
+    header = tracing.server_timing(trace, 12.0)
+    assert header.startswith("total;dur=12.0, node;dur=")
+    assert 'desc="2 spans"' in header and 'http;dur=' in header
@@ -0,0 +1,61 @@
+"""End-to-end tests of the real workflow graphs and agent tools.
+
+The graphs and the agent are built exactly as the server builds them; the
+providers are pointed at :class:`UpstreamSimulator` and the LLM is replaced by
+:class:`FakeAdvisorChatModel` (``CRYPTO_ADVISOR_FAKE_LLM``).
+"""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+from langchain_core.utils.function_calling import convert_to_openai_function
+
+from crypto_advisor.agent import create_agent
+from crypto_advisor.harness.upstream import UpstreamSimulator
+from crypto_advisor.run_context import run_scope
+from crypto_advisor.tools import get_agent_tools
+from crypto_advisor.workflows import build_market_overview_app, build_technical_analysis_app
+
+
+@pytest.fixture()
+def offline(monkeypatch):  # noqa: D103
+    with UpstreamSimulator() as simulator:
+        for key, value in simulator.env().items():
+            monkeypatch.setenv(key, value)
+        monkeypatch.setenv("CRYPTO_ADVISOR_FAKE_LLM", "1")
+        monkeypatch.setenv("CRYPTO_ADVISOR_RESPONSE_CACHE", "off")
+        monkeypatch.setenv("OPENAI_API_KEY", "test")
+        monkeypatch.setenv("SERPER_API_KEY", "test")
+        yield simulator
+
+
+def test_agent_tools_have_function_schemas(offline) -> None:  # noqa: D103
+    tools = get_agent_tools()
+    functions = {function["name"]: function for function in map(convert_to_openai_function, tools)}
+
+    assert "binance_chart_tool" in functions and "technical_analysis" in functions
+    assert {"symbol", "interval", "limit"} <= set(functions["binance_chart_tool"]["parameters"]["properties"])
+    assert create_agent() is not None
+
+
+def test_chart_dataset_feeds_the_analysis_tools(offline) -> None:  # noqa: D103
+    tools = {tool.name: tool for tool in get_agent_tools()}
+    with run_scope({}, {}):
+        chart = json.loads(tools["binance_chart_tool"].invoke({"symbol": "ETHUSDT", "interval": "4h", "limit": 60}))
+        analysis = json.loads(tools["technical_analysis"].invoke({"dataset": chart["dataset"]}))
+
+    assert chart["count"] == 60
+    assert "RSI" in analysis["latest_indicators"]
+
+
+@pytest.mark.parametrize(
+    "build",
+    [lambda: build_technical_analysis_app("BTCUSDT"), lambda: build_market_overview_app(30)],
+    ids=["technical_analysis", "market_overview"],
+)
+def test_workflow_graphs_build_and_run(offline, build) -> None:  # noqa: D103
+    result = build().invoke({})
+
+    assert result["messages"][-1].content.startswith("Offline analysis")